@@ -14,6 +14,7 @@
 
 """UCP."""
 
+from .checkout_patch_extension import CheckoutPatchExtension
 from .ucp_extension import UcpExtension
 
-__all__ = ["UcpExtension"]
+__all__ = ["CheckoutPatchExtension", "UcpExtension"]
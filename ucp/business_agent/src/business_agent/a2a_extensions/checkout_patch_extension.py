@@ -0,0 +1,61 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""UCP."""
+
+from typing import Any
+from ..constants import (
+    A2A_CHECKOUT_PATCH_EXTENSION_URL,
+    UCP_CHECKOUT_ACK_KEY,
+    UCP_CHECKOUT_PATCH_KEY,
+    UCP_CHECKOUT_VERSION_KEY,
+)
+from .base_extension import A2AExtensionBase
+
+
+class CheckoutPatchExtension(A2AExtensionBase):
+    """Checkout responses as RFC 6902 JSON Patches.
+
+    Clients that activate this extension acknowledge the last checkout they
+    applied by sending `{"id": ..., "version": ...}` under the `ack_key` in
+    a data part. Checkout responses then carry a patch against that version
+    under the `patch_key` instead of the full checkout, or the full checkout
+    when the acknowledged version is unknown. Every response carries the new
+    version under the `version_key`.
+    """
+
+    URI: str = A2A_CHECKOUT_PATCH_EXTENSION_URL
+
+    def __init__(
+        self,
+        description: str = "Checkout responses as JSON Patches",
+        params: dict[str, Any] | None = None,
+    ):
+        """Initialize the checkout patch extension.
+
+        Args:
+            description: A short description of the extension.
+            params: Optional parameters for the extension.
+
+        """
+        super().__init__(
+            description,
+            params
+            or {
+                "ack_key": UCP_CHECKOUT_ACK_KEY,
+                "patch_key": UCP_CHECKOUT_PATCH_KEY,
+                "version_key": UCP_CHECKOUT_VERSION_KEY,
+                "patch_format": "application/json-patch+json",
+            },
+        )
@@ -14,54 +14,71 @@
 
 """UCP."""
 
+import asyncio
+import json
 import logging
-logger = logging.getLogger("business_agent.agent")
-
 from typing import Any
 from a2a.types import TaskState
 from a2a.utils import get_message_text
 from google.adk.agents import Agent
 from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.readonly_context import ReadonlyContext
 from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.base_toolset import BaseToolset
+from google.adk.tools.function_tool import FunctionTool
 from google.adk.tools.tool_context import ToolContext
 from google.genai import types
 from ucp_sdk.models.schemas.shopping.types.buyer import Buyer
 from ucp_sdk.models.schemas.shopping.types.postal_address import PostalAddress
-from .a2a_extensions import UcpExtension
+from .a2a_extensions import CheckoutPatchExtension, UcpExtension
 from .constants import (
+    ADK_CHECKOUT_ACK_STATE,
     ADK_EXTENSIONS_STATE_KEY,
     ADK_LATEST_TOOL_RESULT,
     ADK_PAYMENT_STATE,
     ADK_UCP_METADATA_STATE,
-    ADK_USER_CHECKOUT_ID,
+    FEDERATED_RESULTS_KEY,
     UCP_CHECKOUT_KEY,
+    UCP_CHECKOUT_PATCH_KEY,
+    UCP_CHECKOUT_VERSION_KEY,
     UCP_PAYMENT_DATA_KEY,
     UCP_RISK_SIGNALS_KEY,
     ADK_SELECTED_STORE_ID,
-    ADK_USER_CHECKOUT_IDS,
+    ADK_USER_CHECKOUT_ID_PREFIX,
 )
+from .catalog_columns import SORT_ORDERS, FacetFilters
+from .json_patch import make_patch
 from .payment_processor import MockPaymentProcessor
-from .store import RetailStore
+from .store import SEARCH_PAGE_SIZE, RetailStore
+from .tool_execution import CheckoutLocks, off_loop, serialized
+from .tool_result_store import TOOL_RESULTS
+from .tool_views import checkout_view, model_view
+from .variant_index import VariantSelectionError
 from .discovery import (
     REQUIRED_CHECKOUT_CAPABILITY,
     choose_default_store_id,
+    federated_search,
     get_stores,
     require_checkout_or_explain,
 )
 
+logger = logging.getLogger("business_agent.agent")
+
 stores = get_stores()
 
 DEFAULT_STORE_ID = choose_default_store_id(stores).selected_store_id
 
 mpp = MockPaymentProcessor()
 
-#new
+
 def _get_current_store_id(tool_context: ToolContext) -> str:
     return tool_context.state.get(ADK_SELECTED_STORE_ID, DEFAULT_STORE_ID)
 
 def _get_store(tool_context: ToolContext) -> RetailStore:
     store_id = _get_current_store_id(tool_context)
-    return stores.get(store_id, stores[DEFAULT_STORE_ID])
+    if store_id not in stores:
+        store_id = DEFAULT_STORE_ID
+    return stores[store_id]
 
 def _require_checkout_capability(tool_context: ToolContext) -> dict | None:
     store_id = _get_current_store_id(tool_context)
@@ -79,8 +96,6 @@ def _require_checkout_capability(tool_context: ToolContext) -> dict | None:
         )
 
     # Don't auto-switch here (better for your demo: show that the store is "invisible" to agents).
-    # If you WANT auto-switching, uncomment the next line:
-    # tool_context.state[ADK_SELECTED_STORE_ID] = decision.selected_store_id
 
     return {
         "message": "Cannot complete checkout with the selected merchant.",
@@ -96,14 +111,31 @@ def _require_checkout_capability(tool_context: ToolContext) -> dict | None:
 def _create_error_response(message: str) -> dict:
   return {"message": message, "status": "error"}
 
+def _checkout_response(store: RetailStore, checkout) -> dict:
+    return {
+        UCP_CHECKOUT_KEY: store.checkout_json(checkout),
+        UCP_CHECKOUT_VERSION_KEY: store.checkout_version(checkout.id),
+        "status": "success",
+    }
+
+def _with_resolved_id(
+    response: dict, reference: str, product_id: str | None
+) -> dict:
+    """Show the model the product ID a loose reference was resolved to."""
+    if product_id and product_id != reference:
+        response["resolved_product_id"] = product_id
+    return response
+
 def list_stores(tool_context: ToolContext) -> dict:
     """List available stores and whether they support agent checkout (UCP)."""
     items = []
-    for sid, s in stores.items():
+    for sid in stores:
         items.append(
             {
                 "id": sid,
-                "supports_ucp_checkout": s.supports(REQUIRED_CHECKOUT_CAPABILITY),
+                "supports_ucp_checkout": stores.supports(
+                    sid, REQUIRED_CHECKOUT_CAPABILITY
+                ),
             }
         )
 
@@ -129,7 +161,7 @@ def select_store(tool_context: ToolContext, store_id: str) -> dict:
 
     tool_context.state[ADK_SELECTED_STORE_ID] = store_id
 
-    supports_checkout = stores[store_id].supports(REQUIRED_CHECKOUT_CAPABILITY)
+    supports_checkout = stores.supports(store_id, REQUIRED_CHECKOUT_CAPABILITY)
     note = "" if supports_checkout else " (search-only; checkout not supported)"
 
     logger.info(
@@ -151,26 +183,77 @@ def select_store(tool_context: ToolContext, store_id: str) -> dict:
         ),
     }
 
-def search_shopping_catalog(tool_context: ToolContext, query: str) -> dict:
+def _cents(amount: float | None) -> int | None:
+    return None if amount is None else int(round(amount * 100))
+
+
+def search_shopping_catalog(
+    tool_context: ToolContext,
+    query: str,
+    min_price: float | None = None,
+    max_price: float | None = None,
+    brand: str | None = None,
+    category: str | None = None,
+    availability: str | None = None,
+    min_rating: float | None = None,
+    certification: str | None = None,
+    sort_by: str | None = None,
+    page_token: str | None = None,
+) -> dict:
     """Search the product catalog for products that match the given query.
 
+    Use the optional filters for constraints the user states, instead of
+    putting them in the query. The result hints list the facet values of
+    the matches (brands, categories, availability, certifications, price
+    range) with their counts, to narrow the search further. Results come
+    in pages, best matches first unless sort_by is given; next_page_token
+    is set when there are more.
+
     Args:
         tool_context: The tool context for the current request.
         query: Query for performing product search.
+        min_price: Minimum price, in the store currency (e.g. 5.00).
+        max_price: Maximum price, in the store currency (e.g. 12.00).
+        brand: Brand name, e.g. "AndesBrew".
+        category: Category or part of it, e.g. "ground" or "whole bean".
+        availability: Availability, e.g. "InStock".
+        min_rating: Minimum customer rating, e.g. 4.
+        certification: Certification, e.g. "fair trade" or "organic".
+        sort_by: "price_low" (cheapest first), "price_high" or "rating"
+            (best rated first), when the user asks for that order.
+        page_token: The next_page_token of a previous result, to get more.
 
     Returns:
         dict: Returns the response from the tool with success or error status.
 
     """
+    filters = FacetFilters(
+        min_price_cents=_cents(min_price),
+        max_price_cents=_cents(max_price),
+        brands=(brand,) if brand else None,
+        categories=(category,) if category else None,
+        availability=(availability,) if availability else None,
+        min_rating=min_rating,
+        certifications=(certification,) if certification else None,
+    )
     logger.info(
-        "search store_id=%s query=%r",
+        "search store_id=%s query=%r filters=%s sort_by=%s",
         _get_current_store_id(tool_context),
         query,
+        filters.mask_kwargs(),
+        sort_by,
     )
+    if sort_by is not None and sort_by not in SORT_ORDERS:
+        return _create_error_response(
+            f"Unknown sort_by '{sort_by}'; use one of {', '.join(SORT_ORDERS)}."
+        )
 
     try:
-        product_results = _get_store(tool_context).search_products(query)
-        return {"a2a.product_results": product_results.model_dump(mode="json")}
+        page = max(int(page_token), 0) if page_token else 0
+        product_results = _get_store(tool_context).search_products_payload(
+            query, filters, page, sort_by
+        )
+        return {"a2a.product_results": product_results}
     except Exception:
         logging.exception("There was an error searching the product catalog.")
         return _create_error_response(
@@ -179,30 +262,116 @@ def search_shopping_catalog(tool_context: ToolContext, query: str) -> dict:
         )
 
 
+async def search_all_stores(tool_context: ToolContext, query: str) -> dict:
+    """Search the catalogs of every store at once to compare offers.
+
+    Args:
+        tool_context: The tool context for the current request.
+        query: Query for performing product search.
+
+    Returns:
+        dict: Returns the response from the tool with success or error status.
+
+    """
+    logger.info("federated_search_tool query=%r", query)
+
+    try:
+        results = await federated_search(stores, query)
+    except Exception:
+        logging.exception("There was an error searching the stores.")
+        return _create_error_response(
+            "Sorry, there was an error searching the stores, "
+            "please try again later."
+        )
+
+    response = {
+        FEDERATED_RESULTS_KEY: [
+            {
+                "store_id": hit.store_id,
+                "supports_ucp_checkout": hit.supports_ucp_checkout,
+                "product": hit.product.model_dump(mode="json"),
+            }
+            for hit in results.hits
+        ],
+        "status": "success",
+    }
+    unavailable = results.timed_out + results.failed
+    if unavailable:
+        response["message"] = (
+            "Some stores did not answer in time: " + ", ".join(unavailable)
+        )
+    return response
+
+
+async def compare_offers(tool_context: ToolContext, product: str) -> dict:
+    """Find every store selling a product and the cheapest place to buy it.
+
+    Args:
+        tool_context: The tool context for the current request.
+        product: GTIN or MPN of the product, or its product ID or SKU at
+            the selected store.
+
+    Returns:
+        dict: Returns the response from the tool with success or error status.
+
+    """
+    index = await asyncio.to_thread(stores.offer_index)
+    store_id = _get_current_store_id(tool_context)
+    offers = index.offers(product, store_id)
+    if not offers:
+        return _create_error_response(
+            f"No store sells a product matching '{product}'."
+        )
+
+    def as_dict(offer):
+        if offer is None:
+            return None
+        return {
+            "store_id": offer.store_id,
+            "product_id": offer.product_id,
+            "price": offer.price_cents,
+            "currency": offer.currency,
+            "availability": offer.availability,
+            "supports_ucp_checkout": offer.supports_ucp_checkout,
+        }
+
+    return {
+        "offers": [as_dict(offer) for offer in offers],
+        "cheapest": as_dict(index.best_offer(product, store_id=store_id)),
+        "cheapest_with_checkout": as_dict(
+            index.best_offer(product, require_checkout=True, store_id=store_id)
+        ),
+        "status": "success",
+    }
+
+
 def add_to_checkout(
-    tool_context: ToolContext, product_id: str, quantity: int = 1
+    tool_context: ToolContext,
+    product_id: str,
+    quantity: int = 1,
+    variant: str = "",
 ) -> dict:
     """Add a product to the checkout session.
 
     Args:
         tool_context: The tool context for the current request.
-        product_id: Product ID or SKU.
+        product_id: Product ID; a SKU, GTIN, MPN or exact product name
+            also works. For a product group, its productGroupID.
         quantity: Quantity; defaults to 1 if not specified.
+        variant: For a product group, the option values of the variant
+            from its variantMatrix (e.g. "Dark Roast" or "12 oz, Whole
+            Bean"); leave empty otherwise.
 
     Returns:
-        dict: Returns the response from the tool with success or error status.
+        dict: Returns the response from the tool with success or error status,
+        and the productID added as `resolved_product_id` when `product_id`
+        was another reference.
 
     """
     cap_err = _require_checkout_capability(tool_context)
     if cap_err:
         return cap_err
-    store_id = _get_current_store_id(tool_context)
-    mapping = tool_context.state.get(ADK_USER_CHECKOUT_IDS, {})
-    if not isinstance(mapping, dict):
-        mapping = {}
-
-    
-    checkout_id = mapping.get(store_id)
+    checkout_id = _get_current_checkout_id(tool_context)
 
     ucp_metadata = tool_context.state.get(ADK_UCP_METADATA_STATE)
 
@@ -211,18 +380,19 @@ def add_to_checkout(
             "There was an error creating UCP metadata"
         )
 
+    store = _get_store(tool_context)
     try:
-        checkout = _get_store(tool_context).add_to_checkout(
-            ucp_metadata, product_id, quantity, checkout_id
+        checkout, added_id = store.add_to_checkout(
+            ucp_metadata, product_id, quantity, checkout_id, variant or None
         )
         if not checkout_id:
-            mapping[store_id] = checkout.id
-            tool_context.state[ADK_USER_CHECKOUT_IDS] = mapping
+            tool_context.state[_checkout_id_key(tool_context)] = checkout.id
 
-        return {
-            UCP_CHECKOUT_KEY: checkout.model_dump(mode="json"),
-            "status": "success",
-        }
+        return _with_resolved_id(
+            _checkout_response(store, checkout), product_id, added_id
+        )
+    except VariantSelectionError as e:
+        return _create_error_response(str(e))
     except ValueError:
         logging.exception(
             "There was an error adding item to checkout, please retry later."
@@ -252,15 +422,14 @@ def remove_from_checkout(tool_context: ToolContext, product_id: str) -> dict:
     if not checkout_id:
         return _create_error_response("A Checkout has not yet been created.")
 
+    store = _get_store(tool_context)
     try:
-        return {
-            UCP_CHECKOUT_KEY: (
-                _get_store(tool_context).remove_from_checkout(checkout_id, product_id).model_dump(
-                    mode="json"
-                )
-            ),
-            "status": "success",
-        }
+        checkout, removed_id = store.remove_from_checkout(
+            checkout_id, product_id
+        )
+        return _with_resolved_id(
+            _checkout_response(store, checkout), product_id, removed_id
+        )
     except ValueError:
         logging.exception(
             "There was an error removing item from checkout, "
@@ -294,15 +463,14 @@ def update_checkout(
     if not checkout_id:
         return _create_error_response("A Checkout has not yet been created.")
 
+    store = _get_store(tool_context)
     try:
-        return {
-            UCP_CHECKOUT_KEY: (
-                _get_store(tool_context).update_checkout(
-                    checkout_id, product_id, quantity
-                ).model_dump(mode="json")
-            ),
-            "status": "success",
-        }
+        checkout, updated_id = store.update_checkout(
+            checkout_id, product_id, quantity
+        )
+        return _with_resolved_id(
+            _checkout_response(store, checkout), product_id, updated_id
+        )
     except ValueError:
         logging.exception(
             "There was an error updating item in the cart, please retry later."
@@ -331,14 +499,12 @@ def get_checkout(tool_context: ToolContext) -> dict:
     if not checkout_id:
         return _create_error_response("A Checkout has not yet been created.")
 
-    checkout = _get_store(tool_context).get_checkout(checkout_id)
+    store = _get_store(tool_context)
+    checkout = store.get_checkout(checkout_id)
     if checkout is None:
         return _create_error_response("Checkout not found with the given ID.")
 
-    return {
-        UCP_CHECKOUT_KEY: checkout.model_dump(mode="json"),
-        "status": "success",
-    }
+    return _checkout_response(store, checkout)
 
 
 def update_customer_details(
@@ -395,10 +561,11 @@ def update_customer_details(
         last_name=last_name,
     )
 
-    checkout = _get_store(tool_context).add_delivery_address(checkout_id, address)
+    store = _get_store(tool_context)
+    store.add_delivery_address(checkout_id, address)
 
     if email:
-        checkout.buyer = Buyer(email=email)
+        store.update_buyer(checkout_id, Buyer(email=email))
 
     # invoke start payment tool once the user details are added
     return start_payment(tool_context)
@@ -459,13 +626,10 @@ async def complete_checkout(tool_context: ToolContext) -> dict:
                 payment_instrument.root.id
             )
             checkout.payment.instruments = [payment_instrument]
+            _get_store(tool_context).touch_checkout(checkout_id)
 
             response = _get_store(tool_context).place_order(checkout_id)
-            store_id = _get_current_store_id(tool_context)
-            mapping = tool_context.state.get(ADK_USER_CHECKOUT_IDS, {})
-            if isinstance(mapping, dict):
-                mapping[store_id] = None
-                tool_context.state[ADK_USER_CHECKOUT_IDS] = mapping
+            tool_context.state[_checkout_id_key(tool_context)] = None
 
             return {
                 UCP_CHECKOUT_KEY: response.model_dump(mode="json"),
@@ -502,15 +666,13 @@ def start_payment(tool_context: ToolContext) -> dict:
     if not checkout_id:
         return _create_error_response("A Checkout has not yet been created.")
 
-    result = _get_store(tool_context).start_payment(checkout_id)
+    store = _get_store(tool_context)
+    result = store.start_payment(checkout_id)
     if isinstance(result, str):
         return {"message": result, "status": "requires_more_info"}
     else:
         tool_context.actions.skip_summarization = True
-        return {
-            UCP_CHECKOUT_KEY: result.model_dump(mode="json"),
-            "status": "success",
-        }
+        return _checkout_response(store, result)
 
 
 def _get_current_checkout_id(tool_context: ToolContext) -> str | None:
@@ -523,12 +685,61 @@ def _get_current_checkout_id(tool_context: ToolContext) -> str | None:
         str | None: The checkout ID if present, else None.
 
     """
-    #return tool_context.state.get(ADK_USER_CHECKOUT_ID)
-    store_id = _get_current_store_id(tool_context)
-    mapping = tool_context.state.get(ADK_USER_CHECKOUT_IDS, {})
-    if isinstance(mapping, dict):
-        return mapping.get(store_id)
-    return None
+    return tool_context.state.get(_checkout_id_key(tool_context))
+
+
+def _checkout_id_key(tool_context: ToolContext) -> str:
+    """Return the state key of the checkout ID of the selected store."""
+    return ADK_USER_CHECKOUT_ID_PREFIX + _get_current_store_id(tool_context)
+
+
+def session_summary(callback_context: CallbackContext) -> str:
+    """Describe the selected store and cart, for history compaction.
+
+    Args:
+        callback_context: The callback context for the agent run.
+
+    Returns:
+        str: The current session state, as text for the model.
+
+    """
+    store_id = _get_current_store_id(callback_context)
+    lines = [f"Selected store: {store_id}."]
+    checkout_id = _get_current_checkout_id(callback_context)
+    checkout = (
+        _get_store(callback_context).get_checkout(checkout_id)
+        if checkout_id
+        else None
+    )
+    if checkout is None:
+        lines.append("No open checkout at this store.")
+    else:
+        store = _get_store(callback_context)
+        view = checkout_view(store.checkout_json(checkout))
+        lines.append(f"Current checkout: {json.dumps(view)}")
+    return "\n".join(lines)
+
+
+def session_marker(tool_context: ToolContext) -> list:
+    """Return the selected store and checkout version, for the turn budget.
+
+    A tool call repeated after the checkout changed is not counted as a
+    repeat (see `turn_budget.TurnBudget`).
+
+    Args:
+        tool_context: The tool context for the current request.
+
+    Returns:
+        list: The store ID and the version of its current checkout.
+
+    """
+    checkout_id = _get_current_checkout_id(tool_context)
+    version = (
+        _get_store(tool_context).checkout_version(checkout_id)
+        if checkout_id
+        else 0
+    )
+    return [_get_current_store_id(tool_context), version]
 
 
 def after_tool_modifier(
@@ -539,6 +750,10 @@ def after_tool_modifier(
 ) -> dict | None:
     """Modify the tool response before returning to the agent.
 
+    The full response is kept for the client (see
+    `modify_output_after_agent`); the model gets a compact view of it under
+    the `MODEL_TOOL_RESULT_TOKENS` budget.
+
     Args:
         tool: The tool that was executed.
         args: The arguments passed to the tool.
@@ -551,19 +766,72 @@ def after_tool_modifier(
     """
     extensions = tool_context.state.get(ADK_EXTENSIONS_STATE_KEY, [])
     # add typed data responses to the state
-    ucp_response_keys = [UCP_CHECKOUT_KEY, "a2a.product_results"]
+    ucp_response_keys = [
+        UCP_CHECKOUT_KEY,
+        "a2a.product_results",
+        FEDERATED_RESULTS_KEY,
+    ]
 
     should_capture = any(key in tool_response for key in ucp_response_keys)
     should_capture = should_capture or ("explanation" in tool_response)
     if UcpExtension.URI in extensions and should_capture:
-        tool_context.state[ADK_LATEST_TOOL_RESULT] = tool_response
+        # state only keeps the turn; the payload is kept out of the session
+        turn = tool_context.invocation_id
+        TOOL_RESULTS.put(tool_context.session.id, turn, tool_response)
+        if tool_context.state.get(ADK_LATEST_TOOL_RESULT) != turn:
+            tool_context.state[ADK_LATEST_TOOL_RESULT] = turn
 
-    if UcpExtension.URI in extensions and any(
-        key in tool_response for key in ucp_response_keys
-    ):
-        tool_context.state[ADK_LATEST_TOOL_RESULT] = tool_response
+    view = model_view(tool_response)
+    return None if view == tool_response else view
 
-    return None
+
+def _as_checkout_patch(
+    callback_context: CallbackContext, result: dict
+) -> dict:
+    """Replace the checkout of a tool result by a JSON Patch, if possible.
+
+    The patch is made against the checkout version the client acknowledged
+    (see `CheckoutPatchExtension`). The full checkout is kept when there is
+    no acknowledgement, when it is for another checkout or a version that
+    is no longer kept, or when the patch would not be smaller.
+
+    Args:
+        callback_context: The callback context for the agent run.
+        result: The tool result sent to the client.
+
+    Returns:
+        dict: The result to send, never the `result` object modified.
+
+    """
+    checkout = result.get(UCP_CHECKOUT_KEY)
+    ack = callback_context.state.get(ADK_CHECKOUT_ACK_STATE)
+    if not isinstance(checkout, dict) or not isinstance(ack, dict):
+        return result
+    version = ack.get("version")
+    if ack.get("id") != checkout.get("id") or not isinstance(version, int):
+        return result
+
+    base = _get_store(callback_context).checkout_json_at(
+        checkout["id"], version
+    )
+    if base is None:
+        logger.info(
+            "checkout_patch_fallback checkout_id=%s ack_version=%d",
+            checkout["id"],
+            version,
+        )
+        return result
+
+    patch = make_patch(base, checkout)
+    if len(json.dumps(patch)) >= len(json.dumps(checkout)):
+        return result
+    patched = {k: v for k, v in result.items() if k != UCP_CHECKOUT_KEY}
+    patched[UCP_CHECKOUT_PATCH_KEY] = {
+        "id": checkout["id"],
+        "base_version": version,
+        "operations": patch,
+    }
+    return patched
 
 
 def modify_output_after_agent(
@@ -579,10 +847,17 @@ def modify_output_after_agent(
 
     """
     # add the UCP tool responses as agent output
-    latest_result = callback_context.state.get(ADK_LATEST_TOOL_RESULT)
+    turn = callback_context.state.get(ADK_LATEST_TOOL_RESULT)
+    latest_result = (
+        TOOL_RESULTS.take(callback_context.session.id, turn) if turn else None
+    )
 
     if not latest_result:
         return None
+
+    extensions = callback_context.state.get(ADK_EXTENSIONS_STATE_KEY, [])
+    if CheckoutPatchExtension.URI in extensions:
+        latest_result = _as_checkout_patch(callback_context, latest_result)
     
     explanation = None
     recommended_store = None
@@ -611,79 +886,222 @@ def modify_output_after_agent(
     )
 
     return types.Content(parts=text_parts, role="model")
-    # if latest_result:
-    #     return types.Content(
-    #         parts=[
-    #             types.Part(
-    #                 function_response=types.FunctionResponse(
-    #                     response={"result": latest_result}
-    #                 )
-    #             )
-    #         ],
-    #         role="model",
-    #     )
 
-    # return None
+
+def _checkout_lock_key(tool_context: ToolContext) -> str:
+    """Return the lock key of the checkout of a session at a store.
+
+    The key names the state slot of the checkout ID, not the ID itself, so
+    it exists before the checkout does: parallel `add_to_checkout` calls of
+    a session without a checkout queue up, and only the first creates one.
+    """
+    return f"{tool_context.session.id}/{_checkout_id_key(tool_context)}"
+
+
+_checkout_locks = CheckoutLocks()
+_one_per_checkout = serialized(_checkout_lock_key, _checkout_locks)
+
+# synchronous tools run on the tool thread pool; calls touching the same
+# checkout run one at a time
+CATALOG_TOOLS = [
+    off_loop(search_shopping_catalog),
+    search_all_stores,
+    compare_offers,
+    off_loop(list_stores),
+    off_loop(select_store),
+]
+CHECKOUT_TOOLS = [
+    _one_per_checkout(off_loop(add_to_checkout)),
+    _one_per_checkout(off_loop(remove_from_checkout)),
+    _one_per_checkout(off_loop(update_checkout)),
+    _one_per_checkout(off_loop(get_checkout)),
+    _one_per_checkout(off_loop(start_payment)),
+    _one_per_checkout(off_loop(update_customer_details)),
+    _one_per_checkout(complete_checkout),
+]
+
+_CHECKOUT_INTRO = (
+    "You are a helpful shopping agent. You can search products, manage a "
+    "checkout session (add/remove/update items), collect delivery and buyer "
+    "details, start payment, and complete checkout.\n\n"
+)
+
+_SEARCH_ONLY_INTRO = (
+    "You are a helpful shopping agent. The selected store '{store_id}' is "
+    "search-only: you can search its products and compare prices, but it "
+    "does not support checkout. If the user wants to buy, select a store "
+    "that supports checkout (see list_stores or search_all_stores) and "
+    "continue there; the checkout tools are available once it is "
+    "selected.\n\n"
+)
+
+_SEARCH_INSTRUCTION = (
+    "Important: There are multiple stores. Use the select_store tool when "
+    "needed. Some stores may be search-only and may not support checkout. "
+    "If a user asks to buy/checkout and the current store does not support "
+    "checkout, switch to a store that supports checkout (prefer the default "
+    "auto selection) and continue.\n\n"
+
+    "To compare prices or find where a product is available, use "
+    "search_all_stores: it searches every store at once and tells you "
+    "which results can be checked out by an agent. Select that store "
+    "before adding items to checkout. To know where a specific product "
+    "is cheapest and whether it can be checked out there, use "
+    "compare_offers with its product ID, SKU, GTIN or MPN (prices are "
+    "in minor units, e.g. cents).\n\n"
+
+    "Search results for products sold in several variants (sizes, "
+    "grinds, ...) are ProductGroups with a variantMatrix.\n\n"
+
+    f"search_shopping_catalog returns the {SEARCH_PAGE_SIZE} best matches "
+    "per call. When the result has a next_page_token, more products match: "
+    "narrow the search with filters, or pass the token as page_token to "
+    "see the next page if the user wants more. When the user asks for the "
+    "cheapest or best rated products, pass sort_by instead of paging "
+    "through every match.\n\n"
+)
+
+_CHECKOUT_INSTRUCTION = (
+    "To add a ProductGroup to checkout, pass its productGroupID and the "
+    "chosen option values as variant to add_to_checkout.\n\n"
+
+    "Tool usage rules:\n"
+    "- If the user asks to add items, first search the catalog, then add the "
+    "best matching product(s) to checkout.\n"
+    "- If multiple products match, ask the user which one to choose unless "
+    "the user clearly specified the exact product.\n"
+    "- If the user asks to replace products, remove then add.\n"
+    "- If the user asks to view the cart, use get_checkout.\n\n"
+
+    "Checkout flow:\n"
+    "- To proceed to payment, ensure buyer email exists and (if required) a "
+    "fulfillment/delivery address is provided. Use update_customer_details "
+    "to add address and buyer email, then use start_payment.\n"
+    "- Only call complete_checkout after payment data is available.\n\n"
+)
+
+
+def _supports_checkout(context: ReadonlyContext) -> bool:
+    return stores.supports(
+        _get_current_store_id(context), REQUIRED_CHECKOUT_CAPABILITY
+    )
+
+
+def shopping_instruction(context: ReadonlyContext) -> str:
+    """Build the agent instruction for the selected store.
+
+    Checkout guidance is only included for stores that support checkout.
+
+    Args:
+        context: The context of the current agent run.
+
+    Returns:
+        str: The instruction.
+
+    """
+    if _supports_checkout(context):
+        parts = [_CHECKOUT_INTRO, _SEARCH_INSTRUCTION, _CHECKOUT_INSTRUCTION]
+    else:
+        intro = _SEARCH_ONLY_INTRO.format(store_id=_get_current_store_id(context))
+        parts = [intro, _SEARCH_INSTRUCTION]
+    parts.append(
+        "Always ensure you complete all aspects of the user's request."
+    )
+    return "".join(parts)
+
+
+CHECKOUT_TOOL_NAMES = frozenset(f.__name__ for f in CHECKOUT_TOOLS)
+# description of the placeholder ADK passes for calls to tools not offered
+TOOL_NOT_FOUND = "Tool not found"
+
+
+class StoreToolset(BaseToolset):
+    """The tools of the selected store.
+
+    Search-only stores only get the catalog tools, so that the model is
+    neither prompted with checkout tools nor calls them to get a capability
+    error. The tool list is rebuilt for every model call, so tools follow
+    `select_store` within a turn.
+    """
+
+    def __init__(self):
+        """Wrap the catalog and checkout tools."""
+        super().__init__()
+        self._catalog_tools = [FunctionTool(f) for f in CATALOG_TOOLS]
+        self._checkout_tools = [FunctionTool(f) for f in CHECKOUT_TOOLS]
+
+    async def get_tools(
+        self, readonly_context: ReadonlyContext | None = None
+    ) -> list[BaseTool]:
+        """Return the tools available at the selected store.
+
+        Args:
+            readonly_context: The context of the current agent run; all
+                tools are returned without it.
+
+        Returns:
+            list[BaseTool]: The catalog tools, and the checkout tools if the
+            store supports checkout.
+
+        """
+        if readonly_context is None or _supports_checkout(readonly_context):
+            return self._catalog_tools + self._checkout_tools
+        return list(self._catalog_tools)
+
+    async def close(self) -> None:
+        """Release resources; the function tools hold none."""
+
+
+def on_tool_error_modifier(
+    tool: BaseTool,
+    args: dict[str, Any],
+    tool_context: ToolContext,
+    error: Exception,
+) -> dict | None:
+    """Answer tool calls that failed instead of failing the turn.
+
+    Calls to tools not offered at the selected store (e.g. checkout tools
+    called from an earlier turn at another store) get an explanation; any
+    other error is logged and answered with a generic error.
+
+    Args:
+        tool: The tool that failed, or ADK's placeholder if it is not
+            offered.
+        args: The arguments passed to the tool.
+        tool_context: The tool context for the current request.
+        error: The error raised.
+
+    Returns:
+        dict: The response to the model.
+
+    """
+    if tool.description == TOOL_NOT_FOUND:
+        explanation = None
+        if tool.name in CHECKOUT_TOOL_NAMES:
+            explanation = _require_checkout_capability(tool_context)
+        return explanation or _create_error_response(
+            f"{tool.name} is not available at the selected store."
+        )
+
+    logger.error(
+        "tool_failed tool=%s store_id=%s error=%r",
+        tool.name,
+        _get_current_store_id(tool_context),
+        error,
+        exc_info=error,
+    )
+    return _create_error_response(
+        f"{tool.name} failed unexpectedly. Try again or use another tool."
+    )
 
 
 root_agent = Agent(
     name="shopper_agent",
     model="gemini-3-flash-preview",
-    # description="Agent to help with shopping",
-    # instruction=(
-    #     "You are a helpful agent who can help user with shopping actions such"
-    #     " as searching the catalog, add to checkout session, complete checkout"
-    #     " and handle order placed event.Given the user ask, plan ahead and"
-    #     " invoke the tools available to complete the user's ask. Always make"
-    #     " sure you have completed all aspects of the user's ask. If the user"
-    #     " says add to my list or remove from the list, add or remove from the"
-    #     " cart, add the product or remove the product from the checkout"
-    #     " session. If the user asks to add any items to the checkout session,"
-    #     " search for the products and then add the matching products to"
-    #     " checkout session.If the user asks to replace products,"
-    #     " use remove_from_checkout and add_to_checkout tools to replace the"
-    #     " products to match the user request"
-    # ),
     description="Agent to help with shopping (search, cart/checkout, payment, order)",
-    instruction=(
-        "You are a helpful shopping agent. You can search products, manage a "
-        "checkout session (add/remove/update items), collect delivery and buyer "
-        "details, start payment, and complete checkout.\n\n"
-
-        "Important: There are multiple stores. Use the select_store tool when "
-        "needed. Some stores may be search-only and may not support checkout. "
-        "If a user asks to buy/checkout and the current store does not support "
-        "checkout, switch to a store that supports checkout (prefer the default "
-        "auto selection) and continue.\n\n"
-
-        "Tool usage rules:\n"
-        "- If the user asks to add items, first search the catalog, then add the "
-        "best matching product(s) to checkout.\n"
-        "- If multiple products match, ask the user which one to choose unless "
-        "the user clearly specified the exact product.\n"
-        "- If the user asks to replace products, remove then add.\n"
-        "- If the user asks to view the cart, use get_checkout.\n\n"
-
-        "Checkout flow:\n"
-        "- To proceed to payment, ensure buyer email exists and (if required) a "
-        "fulfillment/delivery address is provided. Use update_customer_details "
-        "to add address and buyer email, then use start_payment.\n"
-        "- Only call complete_checkout after payment data is available.\n\n"
-
-        "Always ensure you complete all aspects of the user's request."
-    ),
-    tools=[
-        search_shopping_catalog,
-        add_to_checkout,
-        remove_from_checkout,
-        update_checkout,
-        get_checkout,
-        start_payment,
-        update_customer_details,
-        complete_checkout,
-        list_stores,
-        select_store,
-    ],
+    instruction=shopping_instruction,
+    tools=[StoreToolset()],
     after_tool_callback=after_tool_modifier,
+    on_tool_error_callback=on_tool_error_modifier,
     after_agent_callback=modify_output_after_agent,
 )
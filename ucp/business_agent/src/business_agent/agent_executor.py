@@ -16,7 +16,7 @@
 
 import json
 import re
-from typing import Any
+from typing import Any, Callable
 from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.events import EventQueue
 from a2a.types import AgentExtension, DataPart, Part, TextPart
@@ -25,6 +25,7 @@ from a2a.utils import (
     new_agent_parts_message,
     new_agent_text_message,
 )
+from google.adk.agents.callback_context import CallbackContext
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.genai import types
@@ -34,14 +35,18 @@ from ucp_sdk.models.schemas.shopping.types.payment_instrument import (
 from ucp_sdk.models.schemas.ucp import ResponseCheckout as UcpMetadata
 from .constants import (
     A2A_UCP_EXTENSION_URL,
+    ADK_CHECKOUT_ACK_STATE,
     ADK_EXTENSIONS_STATE_KEY,
     ADK_LATEST_TOOL_RESULT,
     ADK_PAYMENT_STATE,
     ADK_UCP_METADATA_STATE,
     UCP_AGENT_HEADER,
+    UCP_CHECKOUT_ACK_KEY,
     UCP_PAYMENT_DATA_KEY,
     UCP_RISK_SIGNALS_KEY,
 )
+from .history import DEFAULT_HISTORY_TURNS, HistoryCompactor
+from .turn_budget import TurnBudget
 from .ucp_profile_resolver import ProfileResolver
 
 
@@ -98,17 +103,54 @@ class UcpRequestProcessor:
         return self.profile_resolver.get_ucp_metadata(client_profile_metadata)
 
 
+def _with_callbacks(agent, **callbacks: list[Callable]):
+    """Return a copy of an agent with callbacks appended to its own.
+
+    The agent itself is left unchanged, so executors sharing it do not add
+    their callbacks to each other's.
+    """
+    update = {}
+    for name, added in callbacks.items():
+        existing = getattr(agent, name) or []
+        if not isinstance(existing, list):
+            existing = [existing]
+        update[name] = [*existing, *added]
+    return agent.model_copy(update=update)
+
+
 class ADKAgentExecutor(AgentExecutor):
     """ADK agent executor implementation."""
 
-    def __init__(self, agent, extensions: list[AgentExtension]):
+    def __init__(
+        self,
+        agent,
+        extensions: list[AgentExtension],
+        history_turns: int = DEFAULT_HISTORY_TURNS,
+        history_summary: Callable[[CallbackContext], str | None] | None = None,
+        turn_budget: TurnBudget | None = None,
+    ):
         """Initialize a generic ADK agent executor.
 
         Args:
-            agent: The ADK agent instance.
+            agent: The ADK agent instance; callbacks are added to a copy.
             extensions: List of agent extensions to be used.
+            history_turns: Number of most recent turns sent to the model
+                verbatim; older turns are summarized (0 keeps them all).
+            history_summary: Describes the current session state in the
+                summary of older turns (see `history.HistoryCompactor`).
+            turn_budget: Limits on the tool calls and time of each turn;
+                defaults to the limits configured by the environment.
 
         """
+        budget = self.turn_budget = turn_budget or TurnBudget()
+        before_model = [budget.before_model]
+        if history_turns > 0:
+            before_model.append(HistoryCompactor(history_turns, history_summary))
+        agent = _with_callbacks(
+            agent,
+            before_model_callback=before_model,
+            before_tool_callback=[budget.before_tool],
+        )
         self.agent = agent
         self.runner = Runner(
             app_name=agent.name,
@@ -180,14 +222,20 @@ class ADKAgentExecutor(AgentExecutor):
         self._activate_extensions(context)
         ucp_metadata = self.ucp_processor.prepare_ucp_metadata(context)
 
-        query, payment_data = self._prepare_input(context)
+        query, payment_data, checkout_ack = self._prepare_input(context)
 
         user_id: str = context.context_id  # random guest id for the session
 
         try:
             session = await self._get_or_create_session(context, user_id)
             result_parts = await self._run_agent_and_process_response(
-                user_id, session.id, query, context, ucp_metadata, payment_data
+                user_id,
+                session.id,
+                query,
+                context,
+                ucp_metadata,
+                payment_data,
+                checkout_ack,
             )
             await event_queue.enqueue_event(
                 new_agent_parts_message(result_parts, context.context_id, None)
@@ -215,20 +263,22 @@ class ADKAgentExecutor(AgentExecutor):
     def _prepare_input(
         self,
         context: RequestContext,
-    ) -> tuple[str, dict | None]:
+    ) -> tuple[str, dict | None, dict | None]:
         """Prepare user query and payment mandate from the request context.
 
         Args:
             context: The request context.
 
         Returns:
-            tuple[str, dict | None]: The query and payment data.
+            tuple[str, dict | None, dict | None]: The query, payment data and
+            the checkout version acknowledged by the client.
 
         """
         query = context.get_user_input()
         data_list = get_data_parts(context.message.parts)  # type: ignore
         payment_payload: dict[str, Any] = {}
         payment_keys = [UCP_PAYMENT_DATA_KEY, UCP_RISK_SIGNALS_KEY]
+        checkout_ack = None
 
         # extract payment data related structured inputs
         # for processing by tools from the state
@@ -243,16 +293,22 @@ class ADKAgentExecutor(AgentExecutor):
                     else:
                         payment_payload[key] = value
 
+            # transport metadata of the checkout patch extension
+            ack = data_part.pop(UCP_CHECKOUT_ACK_KEY, None)
+            if isinstance(ack, dict):
+                checkout_ack = ack
+
             if data_part:
                 query += "\n" + json.dumps(data_part)
 
-        return query, payment_payload or None
+        return query, payment_payload or None, checkout_ack
 
     def _build_initial_state_delta(
         self,
         context: RequestContext,
         ucp_metadata: UcpMetadata,
         payment_data: dict | None,
+        checkout_ack: dict | None = None,
     ) -> dict:
         """Build the initial state delta for the agent run.
 
@@ -260,6 +316,7 @@ class ADKAgentExecutor(AgentExecutor):
             context: The request context.
             ucp_metadata: The UCP metadata.
             payment_data: The payment data.
+            checkout_ack: The checkout version acknowledged by the client.
 
         Returns:
             dict: The initial state delta.
@@ -269,6 +326,7 @@ class ADKAgentExecutor(AgentExecutor):
             ADK_UCP_METADATA_STATE: ucp_metadata,
             ADK_EXTENSIONS_STATE_KEY: context.requested_extensions,
             ADK_PAYMENT_STATE: payment_data,
+            ADK_CHECKOUT_ACK_STATE: checkout_ack,
             ADK_LATEST_TOOL_RESULT: None,
         }
 
@@ -280,6 +338,7 @@ class ADKAgentExecutor(AgentExecutor):
         context: RequestContext,
         ucp_metadata: UcpMetadata,
         payment_data: dict | None,
+        checkout_ack: dict | None = None,
     ) -> list[Part]:
         """Run the ADK agent and processes the response.
 
@@ -290,6 +349,7 @@ class ADKAgentExecutor(AgentExecutor):
             context: The request context.
             ucp_metadata: The UCP metadata.
             payment_data: The payment data.
+            checkout_ack: The checkout version acknowledged by the client.
 
         Returns:
             list[Part]: The response parts.
@@ -300,20 +360,26 @@ class ADKAgentExecutor(AgentExecutor):
         )
 
         state_delta = self._build_initial_state_delta(
-            context, ucp_metadata, payment_data
+            context, ucp_metadata, payment_data, checkout_ack
         )
         result_parts: list[Part] = []
 
         final_events: list = []
 
-        async for event in self.runner.run_async(
-            user_id=user_id,
-            session_id=session_id,
-            new_message=content,
-            state_delta=state_delta,
-        ):
-            if event.is_final_response() or len(final_events) > 0:
-                final_events.append(event)
+        invocation_ids = set()
+        try:
+            async for event in self.runner.run_async(
+                user_id=user_id,
+                session_id=session_id,
+                new_message=content,
+                state_delta=state_delta,
+            ):
+                invocation_ids.add(event.invocation_id)
+                if event.is_final_response() or len(final_events) > 0:
+                    final_events.append(event)
+        finally:
+            for invocation_id in invocation_ids:
+                self.turn_budget.finish(invocation_id)
 
         for final_event in final_events:
             response_text = ""
@@ -0,0 +1,197 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Prefix autocomplete over product names and brands.
+
+Completion keys are kept in one sorted array and a prefix is resolved with
+two binary searches. Product names are also keyed from each of their words,
+so "bean" completes "Ethiopian Whole Bean Coffee". The most popular
+completions of the prefix range are then taken from a sparse table of range
+maxima over the keys' popularity ranks, so a lookup costs O(k log k)
+whatever the width of the range.
+"""
+
+import heapq
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Any, Iterable
+import numpy as np
+from .catalog import CatalogEntry
+
+DEFAULT_COMPLETIONS = 10
+
+
+@dataclass(frozen=True)
+class Suggestion:
+    """A completion: a product name or a brand."""
+
+    text: str
+    kind: str
+    popularity: int
+    product_id: str | None = None
+
+
+class SuggestionsBuilder:
+    """Collects product name and brand suggestions from catalog records.
+
+    The popularity of a product is its rating count; the popularity of a
+    brand is the sum over its products. Variants sharing a name are merged.
+    """
+
+    def __init__(self):
+        self._names: dict[str, list] = {}
+        self._brands: dict[str, list] = {}
+
+    def add(self, entry: CatalogEntry, record: dict[str, Any]) -> None:
+        """Count the name and brand of a catalog record."""
+        rating = record.get("aggregateRating")
+        popularity = 0
+        if isinstance(rating, dict):
+            count = rating.get("ratingCount") or rating.get("reviewCount")
+            popularity = count if isinstance(count, int) else 0
+
+        name = record.get("name")
+        if isinstance(name, str) and name:
+            merged = self._names.setdefault(
+                name.lower(), [name, 0, entry.product_id]
+            )
+            merged[1] += popularity
+        brand = record.get("brand")
+        brand = brand.get("name") if isinstance(brand, dict) else None
+        if isinstance(brand, str) and brand:
+            self._brands.setdefault(brand.lower(), [brand, 0])[1] += popularity
+
+    def build(self) -> list[Suggestion]:
+        """Return one suggestion per distinct name and brand."""
+        return [
+            Suggestion(text, "product", popularity, product_id)
+            for text, popularity, product_id in self._names.values()
+        ] + [
+            Suggestion(text, "brand", popularity)
+            for text, popularity in self._brands.values()
+        ]
+
+
+def catalog_suggestions(
+    records: Iterable[tuple[CatalogEntry, dict[str, Any]]],
+) -> list[Suggestion]:
+    """Collect product name and brand suggestions from catalog records.
+
+    Args:
+        records: (catalog entry, schema.org record) pairs, as yielded by
+            `ProductCatalog.iter_records`.
+
+    Returns:
+        list[Suggestion]: One suggestion per distinct name and brand.
+
+    """
+    builder = SuggestionsBuilder()
+    for entry, record in records:
+        builder.add(entry, record)
+    return builder.build()
+
+
+class PrefixIndex:
+    """Sorted-array prefix index returning the most popular completions."""
+
+    def __init__(self, suggestions: Iterable[Suggestion]):
+        """Index suggestions by every word-start of their text.
+
+        Args:
+            suggestions: Completions to index.
+
+        """
+        self.suggestions = list(suggestions)
+
+        keyed = []
+        for target, suggestion in enumerate(self.suggestions):
+            words = suggestion.text.lower().split()
+            for start in range(len(words)):
+                keyed.append((" ".join(words[start:]), target))
+        keyed.sort()
+        self._keys = [key for key, _ in keyed]
+        self._targets = np.array([t for _, t in keyed], dtype=np.int32)
+
+        # rank of each suggestion: most popular, then first, ranks highest
+        order = sorted(
+            range(len(self.suggestions)),
+            key=lambda t: (self.suggestions[t].popularity, -t),
+        )
+        rank = np.empty(len(order), dtype=np.int32)
+        rank[order] = np.arange(len(order), dtype=np.int32)
+        self._ranks = rank[self._targets]
+
+        # _best[j][i]: key position of the highest rank in [i, i + 2**j)
+        size = len(self._keys)
+        self._best = [np.arange(size, dtype=np.int32)]
+        span = 1
+        while 2 * span <= size:
+            previous = self._best[-1]
+            left = previous[: size - 2 * span + 1]
+            right = previous[span : size - span + 1]
+            self._best.append(
+                np.where(self._ranks[left] >= self._ranks[right], left, right)
+            )
+            span *= 2
+
+    def _argmax(self, lo: int, hi: int) -> int:
+        """Return the key position of the highest rank in [lo, hi)."""
+        level = (hi - lo).bit_length() - 1
+        best = self._best[level]
+        left, right = best[lo], best[hi - (1 << level)]
+        return int(left if self._ranks[left] >= self._ranks[right] else right)
+
+    def _top(self, lo: int, hi: int, k: int) -> list[int]:
+        """Return the k highest-ranked distinct suggestions in [lo, hi)."""
+        top: list[int] = []
+        seen = set()
+        ranges = []
+        if lo < hi:
+            best = self._argmax(lo, hi)
+            ranges.append((-self._ranks[best], best, lo, hi))
+        # best-first split of the range around each maximum
+        while ranges and len(top) < k:
+            _, best, lo, hi = heapq.heappop(ranges)
+            target = int(self._targets[best])
+            if target not in seen:
+                seen.add(target)
+                top.append(target)
+            for start, end in ((lo, best), (best + 1, hi)):
+                if start < end:
+                    position = self._argmax(start, end)
+                    heapq.heappush(
+                        ranges, (-self._ranks[position], position, start, end)
+                    )
+        return top
+
+    def complete(
+        self, prefix: str, k: int = DEFAULT_COMPLETIONS
+    ) -> list[Suggestion]:
+        """Return the most popular completions of a prefix.
+
+        Args:
+            prefix: Typed text; matched case-insensitively from the start of
+                any word of a suggestion.
+            k: Maximum number of completions.
+
+        Returns:
+            list[Suggestion]: Completions, most popular first.
+
+        """
+        prefix = " ".join(prefix.lower().split())
+        if not prefix or k <= 0:
+            return []
+        lo = bisect_left(self._keys, prefix)
+        hi = bisect_left(self._keys, prefix + "\U0010ffff", lo)
+        return [self.suggestions[t] for t in self._top(lo, hi, k)]
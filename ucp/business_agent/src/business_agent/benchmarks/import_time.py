@@ -0,0 +1,143 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Import-time budget check.
+
+Profiles `import <module>` in a fresh interpreter with `-X importtime` and
+fails when the cumulative import time exceeds the budget, or when a module
+that must stay lazy (ADK, genai, the A2A server) is imported.
+
+Run:
+  uv run python -m business_agent.benchmarks.import_time --budget-ms 300
+"""
+
+from __future__ import annotations
+
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+
+import click
+
+DEFAULT_MODULE = "business_agent.main"
+DEFAULT_BUDGET_MS = 300.0
+DEFAULT_FORBIDDEN = ("google.adk", "google.genai", "a2a.server")
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+@dataclass(frozen=True)
+class ImportRecord:
+    """One line of `-X importtime` output (times in microseconds)."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def profile_import(module: str) -> list[ImportRecord]:
+    """Import a module in a fresh interpreter and parse `-X importtime`.
+
+    Args:
+        module: Dotted name of the module to import.
+
+    Returns:
+        list[ImportRecord]: Every module imported, in completion order.
+
+    Raises:
+        RuntimeError: If the import fails.
+
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr}")
+
+    records = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            records.append(
+                ImportRecord(
+                    module=match.group(4),
+                    self_us=int(match.group(1)),
+                    cumulative_us=int(match.group(2)),
+                    depth=len(match.group(3)) // 2,
+                )
+            )
+    return records
+
+
+def total_import_ms(records: list[ImportRecord], module: str) -> float:
+    """Return the cumulative import time of `module` in milliseconds."""
+    for record in reversed(records):
+        if record.module == module:
+            return record.cumulative_us / 1000
+    return 0.0
+
+
+@click.command()
+@click.option("--module", default=DEFAULT_MODULE, show_default=True)
+@click.option("--budget-ms", default=DEFAULT_BUDGET_MS, show_default=True)
+@click.option(
+    "--runs", default=3, show_default=True,
+    help="Best of N runs, to filter out cold disk caches.",
+)
+@click.option("--top", default=10, show_default=True)
+@click.option(
+    "--forbid", multiple=True, default=DEFAULT_FORBIDDEN, show_default=True,
+    help="Module prefixes that must not be imported.",
+)
+def main(module: str, budget_ms: float, runs: int, top: int, forbid: tuple[str, ...]):
+    """Check the import time of a module against a budget."""
+    best: list[ImportRecord] = []
+    best_ms = float("inf")
+    for _ in range(runs):
+        records = profile_import(module)
+        elapsed_ms = total_import_ms(records, module)
+        if elapsed_ms < best_ms:
+            best, best_ms = records, elapsed_ms
+
+    click.echo(f"import {module}: {best_ms:.1f} ms (budget {budget_ms:.1f} ms)")
+    click.echo("slowest modules (self time):")
+    for record in sorted(best, key=lambda r: r.self_us, reverse=True)[:top]:
+        click.echo(f"  {record.self_us / 1000:8.1f} ms  {record.module}")
+
+    failures = []
+    if best_ms > budget_ms:
+        failures.append(f"import time {best_ms:.1f} ms exceeds {budget_ms:.1f} ms")
+    for prefix in forbid:
+        leaked = sorted(
+            {
+                r.module
+                for r in best
+                if r.module == prefix or r.module.startswith(prefix + ".")
+            }
+        )
+        if leaked:
+            failures.append(f"'{prefix}' imported eagerly ({leaked[0]}, ...)")
+
+    for failure in failures:
+        click.echo(f"FAIL: {failure}", err=True)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""UCP."""
+
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator
+from .models.product_types import Product
+
+
+DEFAULT_PRODUCT_CACHE_SIZE = 1024
+
+
+def rewrite_image_urls(record: dict[str, Any], base_url: str) -> None:
+    """Prefix relative image paths of a raw product record with base_url.
+
+    Args:
+        record: schema.org `Product` record, modified in place.
+        base_url: Base URL the images are served from.
+
+    """
+    # Dynamic Image URL handling:
+    # If images are relative paths (starting with /), prepend the base_url.
+    if base_url and isinstance(record.get("image"), list):
+        record["image"] = [
+            f"{base_url}{img}"
+            if isinstance(img, str) and img.startswith("/")
+            else img
+            for img in record["image"]
+        ]
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogEntry:
+    """Compact search projection of a catalog record.
+
+    Text fields are stored lower-cased so that search does not need to touch
+    the validated `Product` model.
+    """
+
+    product_id: str
+    name: str
+    category: str
+
+
+class _LruCache:
+    """Thread-safe bounded mapping with least-recently-used eviction."""
+
+    def __init__(self, max_size: int):
+        self._max_size = max_size
+        self._items: OrderedDict[str, Product] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Product | None:
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: Product) -> None:
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self._max_size:
+                self._items.popitem(last=False)
+
+    def pop(self, key: str) -> None:
+        with self._lock:
+            self._items.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class ProductCatalog:
+    """Product catalog of a store.
+
+    In eager mode every record is validated into a `Product` when it is
+    added. In lazy mode only the raw record (as compact JSON) and its
+    `CatalogEntry` projection are kept; the `Product` is validated on first
+    access and memoized in a bounded LRU cache. A record failing validation
+    then is marked invalid and treated as absent from then on. Raw records
+    are kept exactly as read, relative image paths are resolved against
+    `base_url` only when a `Product` is built.
+    """
+
+    def __init__(
+        self,
+        lazy: bool = False,
+        cache_size: int = DEFAULT_PRODUCT_CACHE_SIZE,
+        base_url: str = "",
+    ):
+        """Initialize an empty catalog.
+
+        Args:
+            lazy: Defer `Product` validation until a product is accessed.
+            cache_size: Maximum number of validated products kept in lazy mode.
+            base_url: Base URL prepended to relative image paths.
+
+        """
+        self.lazy = lazy
+        self.base_url = base_url
+        # set by the owning store; bumped on every reload
+        self.version = 0
+        # search side tables (`catalog_columns.CatalogColumns`,
+        # `text_index.TrigramIndex`, `semantic_index.SemanticIndex`,
+        # `autocomplete.PrefixIndex`, `product_resolver.ProductResolver`,
+        # `variant_index.VariantIndex`), attached by the owning store
+        self.columns = None
+        self.text_index = None
+        self.semantic_index = None
+        self.autocomplete = None
+        self.resolver = None
+        self.variants = None
+        # called with (position, error, record) when a lazy record fails
+        # validation on first access
+        self.on_invalid: Callable[[int, str, dict[str, Any]], None] | None = (
+            None
+        )
+        self._invalid: dict[int, str] = {}
+        self._entries: list[CatalogEntry] = []
+        self._positions: dict[str, int] = {}
+        self._records: list[bytes] = []
+        self._validated: dict[str, Product] | _LruCache = (
+            _LruCache(cache_size) if lazy else {}
+        )
+
+    def add(self, record: dict[str, Any]) -> CatalogEntry:
+        """Add a raw product record to the catalog.
+
+        Args:
+            record: schema.org `Product` record.
+
+        Returns:
+            CatalogEntry: The search projection of the record.
+
+        Raises:
+            ValueError: If the record is not a valid product.
+
+        """
+        if self.lazy:
+            product_id = record.get("productID")
+            name = record.get("name")
+            if not isinstance(product_id, str) or not isinstance(name, str):
+                raise ValueError(
+                    "Product records require string 'productID' and 'name'"
+                )
+            category = record.get("category")
+            raw = json.dumps(record, separators=(",", ":")).encode()
+        else:
+            product = self._validate(record)
+            product_id, name = product.product_id, product.name
+            category = getattr(product, "category", None)
+            raw = b""
+            self._validated[product_id] = product
+
+        entry = CatalogEntry(
+            product_id=product_id,
+            name=name.lower(),
+            category=category.lower() if isinstance(category, str) else "",
+        )
+
+        position = self._positions.get(product_id)
+        if position is None:
+            self._positions[product_id] = len(self._entries)
+            self._entries.append(entry)
+            self._records.append(raw)
+        else:
+            self._entries[position] = entry
+            self._records[position] = raw
+            if self.lazy:
+                self._validated.pop(product_id)
+        return entry
+
+    def _validate(self, record: dict[str, Any]) -> Product:
+        record = dict(record)
+        rewrite_image_urls(record, self.base_url)
+        return Product.model_validate(record)
+
+    def records(self) -> list[tuple[CatalogEntry, bytes]]:
+        """Return the projections and raw JSON records of a lazy catalog."""
+        if not self.lazy:
+            raise ValueError("Raw records are only kept by lazy catalogs")
+        return list(zip(self.entries, self._records))
+
+    def iter_records(self) -> Iterator[tuple[CatalogEntry, dict[str, Any]]]:
+        """Yield each projection with its record as a schema.org dict.
+
+        Lazy catalogs decode the raw JSON without validating it; eager
+        catalogs dump the validated `Product`.
+        """
+        if self.lazy:
+            for entry, raw in zip(self.entries, self._records):
+                yield entry, json.loads(raw)
+        else:
+            for entry in self.entries:
+                yield entry, self._validated[entry.product_id].model_dump(
+                    mode="json", by_alias=True, exclude_none=True
+                )
+
+    @property
+    def entries(self) -> list[CatalogEntry]:
+        """Search projections of all products, in catalog order."""
+        return self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, product_id: str) -> bool:
+        return product_id in self._positions
+
+    def position(self, product_id: str) -> int | None:
+        """Return the catalog position of a product, if present."""
+        return self._positions.get(product_id)
+
+    @property
+    def invalid_positions(self) -> list[int]:
+        """Positions of the lazy records found invalid so far."""
+        return list(self._invalid)
+
+    def get(self, product_id: str) -> Product | None:
+        """Return the validated product with the given ID.
+
+        Args:
+            product_id: Product ID.
+
+        Returns:
+            Product | None: Product object if found and valid, None
+            otherwise.
+
+        """
+        product = self._validated.get(product_id)
+        if product is not None:
+            return product
+
+        position = self._positions.get(product_id)
+        if position is None or position in self._invalid:
+            return None
+
+        record = json.loads(self._records[position])
+        try:
+            product = self._validate(record)
+        except ValueError as exc:
+            error = str(exc)
+            # reported once, even if threads validate the record together
+            first = self._invalid.setdefault(position, error) is error
+            if first and self.on_invalid is not None:
+                self.on_invalid(position, error, record)
+            return None
+        self._validated.put(product_id, product)
+        return product
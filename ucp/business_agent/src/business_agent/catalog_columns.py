@@ -0,0 +1,451 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Columnar side table of a product catalog.
+
+The fields that shopping filters and sorts touch (price, currency,
+availability, rating, brand, category) are extracted once per catalog into
+NumPy arrays, one row per catalog position. Filters like "under $10, in
+stock, sorted by rating" then run as vectorized masks and argsorts instead
+of Python loops over nested pydantic models.
+"""
+
+import math
+from array import array
+from dataclasses import dataclass
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import Any, Iterable
+import numpy as np
+from .catalog import ProductCatalog
+from .models.product_types import ItemAvailability
+
+NO_PRICE = -1
+NO_CODE = -1
+
+# availability code -> schema.org URL; code 0 means unknown
+AVAILABILITY_VALUES: list[str | None] = [
+    None,
+    *(a.value for a in ItemAvailability),
+]
+AVAILABILITY_CODES = {
+    value: code for code, value in enumerate(AVAILABILITY_VALUES)
+}
+PURCHASABLE_CODES = frozenset(
+    AVAILABILITY_CODES[a.value]
+    for a in (
+        ItemAvailability.IN_STOCK,
+        ItemAvailability.LIMITED_AVAILABILITY,
+        ItemAvailability.ONLINE_ONLY,
+        ItemAvailability.PREORDER,
+        ItemAvailability.PRE_SALE,
+        ItemAvailability.BACKORDER,
+    )
+)
+
+# search orders: column and whether highest values come first
+SORT_ORDERS = {
+    "price_low": ("price", False),
+    "price_high": ("price", True),
+    "rating": ("rating", True),
+}
+FACET_NAMES = ("brand", "category", "availability", "certification")
+
+
+def price_to_cents(price: Any) -> int:
+    """Convert a schema.org price ("12.99") to integer cents.
+
+    Fractions of a cent are rounded half up, so "1.005" is 101 cents.
+
+    Returns:
+        int: The price in cents, or `NO_PRICE` if it is missing or invalid.
+
+    """
+    if price is None or price == "":
+        return NO_PRICE
+    try:
+        cents = Decimal(str(price)) * 100
+        return int(cents.quantize(Decimal(1), rounding=ROUND_HALF_UP))
+    except (InvalidOperation, ValueError):
+        return NO_PRICE
+
+
+@dataclass(frozen=True)
+class FacetFilters:
+    """Structured search filters; hashable so they can key caches."""
+
+    min_price_cents: int | None = None
+    max_price_cents: int | None = None
+    brands: tuple[str, ...] | None = None
+    categories: tuple[str, ...] | None = None
+    availability: tuple[str, ...] | None = None
+    min_rating: float | None = None
+    certifications: tuple[str, ...] | None = None
+
+    def __bool__(self) -> bool:
+        return any(value is not None for value in vars(self).values())
+
+    def mask_kwargs(self) -> dict[str, Any]:
+        """Return the filters as keyword arguments of `CatalogColumns.mask`."""
+        return {k: v for k, v in vars(self).items() if v is not None}
+
+
+class _Codes:
+    """Dictionary encoding of a string column; lookups are case-insensitive."""
+
+    def __init__(self):
+        self.values: list[str] = []
+        self._codes: dict[str, int] = {}
+
+    def encode(self, value: Any) -> int:
+        if not isinstance(value, str) or not value:
+            return NO_CODE
+        key = value.lower()
+        code = self._codes.get(key)
+        if code is None:
+            code = self._codes[key] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def lookup(self, values: Iterable[str]) -> list[int]:
+        codes = (self._codes.get(v.lower()) for v in values)
+        return [code for code in codes if code is not None]
+
+    def matching(self, texts: Iterable[str]) -> list[int]:
+        """Return the codes of values containing any of the texts."""
+        texts = [t.lower() for t in texts if t]
+        return [
+            code
+            for key, code in self._codes.items()
+            if any(text in key for text in texts)
+        ]
+
+
+def availability_code(value: str) -> int:
+    """Return the code of an availability given as URL or name ("InStock").
+
+    Returns:
+        int: The availability code, or 0 if the value is unknown.
+
+    """
+    code = AVAILABILITY_CODES.get(value)
+    if code is not None:
+        return code
+    wanted = "".join(ch for ch in value.lower() if ch.isalnum())
+    for code, url in enumerate(AVAILABILITY_VALUES):
+        if url is not None and url.rsplit("/", 1)[-1].lower() == wanted:
+            return code
+    return 0
+
+
+class CatalogColumns:
+    """NumPy columns of a catalog, aligned with its positions.
+
+    Attributes:
+        price_cents: int64 prices in cents, `NO_PRICE` when missing.
+        currency: int16 codes into `currencies`.
+        availability: uint8 codes into `AVAILABILITY_VALUES`.
+        rating: float32 rating values, NaN when unrated.
+        brand: int32 codes into `brands`.
+        category: int32 codes into `categories`.
+
+    Certifications are multi-valued and kept as an inverted index of row
+    numbers per certification name.
+    """
+
+    def __init__(
+        self,
+        catalog: ProductCatalog,
+        builder: "ColumnsBuilder | None" = None,
+    ):
+        """Freeze the columns of a catalog.
+
+        Args:
+            catalog: The catalog; lazy catalogs are read without validation.
+            builder: The columns of the catalog records, if already
+                collected; otherwise the catalog records are streamed.
+
+        """
+        if builder is None:
+            builder = ColumnsBuilder()
+            for _, record in catalog.iter_records():
+                builder.add(record)
+        self.catalog = catalog
+        self.price_cents = np.array(builder.price_cents, dtype=np.int64)
+        self.currency = np.array(builder.currency, dtype=np.int16)
+        self.availability = np.array(builder.availability, dtype=np.uint8)
+        self.rating = np.array(builder.rating, dtype=np.float32)
+        self.brand = np.array(builder.brand, dtype=np.int32)
+        self.category = np.array(builder.category, dtype=np.int32)
+        self._currencies = builder.currencies
+        self._brands = builder.brands
+        self._categories = builder.categories
+        self._certifications = builder.certifications
+        self._certified_rows = [
+            np.array(rows, dtype=np.int64) for rows in builder.certified_rows
+        ]
+
+    def __getstate__(self) -> dict[str, Any]:
+        # persisted in snapshots without the catalog, which is reattached
+        return {k: v for k, v in self.__dict__.items() if k != "catalog"}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.catalog = None
+
+    @property
+    def currencies(self) -> list[str]:
+        return self._currencies.values
+
+    @property
+    def brands(self) -> list[str]:
+        return self._brands.values
+
+    @property
+    def categories(self) -> list[str]:
+        return self._categories.values
+
+    @property
+    def certifications(self) -> list[str]:
+        return self._certifications.values
+
+    def __len__(self) -> int:
+        return len(self.price_cents)
+
+    def row(self, product_id: str) -> int | None:
+        """Return the row of a product, if it is in the catalog."""
+        return self.catalog.position(product_id)
+
+    def price_cents_of(self, product_id: str) -> int | None:
+        """Return the price of a product in cents, if it has one."""
+        row = self.row(product_id)
+        if row is None or self.price_cents[row] == NO_PRICE:
+            return None
+        return int(self.price_cents[row])
+
+    def mask(
+        self,
+        min_price_cents: int | None = None,
+        max_price_cents: int | None = None,
+        currency: str | None = None,
+        purchasable: bool = False,
+        availability: Iterable[str] | None = None,
+        min_rating: float | None = None,
+        brands: Iterable[str] | None = None,
+        categories: Iterable[str] | None = None,
+        certifications: Iterable[str] | None = None,
+    ) -> np.ndarray:
+        """Return a boolean row mask for the given filters.
+
+        Args:
+            min_price_cents: Minimum price, inclusive.
+            max_price_cents: Maximum price, inclusive.
+            currency: ISO currency code prices must be in.
+            purchasable: Only keep offers that can currently be ordered.
+            availability: Availabilities to keep, as schema.org URLs or
+                names such as "InStock".
+            min_rating: Minimum rating value; unrated products are dropped.
+            brands: Brand names to keep.
+            categories: Category path fragments to keep ("ground").
+            certifications: Certification names to keep ("fair trade").
+
+        Brands, categories and certifications match any of the given texts,
+        case-insensitively and as substrings.
+
+        Returns:
+            np.ndarray: Boolean mask over the catalog rows.
+
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if min_price_cents is not None or max_price_cents is not None:
+            mask &= self.price_cents != NO_PRICE
+        if min_price_cents is not None:
+            mask &= self.price_cents >= min_price_cents
+        if max_price_cents is not None:
+            mask &= self.price_cents <= max_price_cents
+        if currency is not None:
+            mask &= np.isin(self.currency, self._currencies.lookup([currency]))
+        if purchasable:
+            mask &= np.isin(self.availability, list(PURCHASABLE_CODES))
+        if availability is not None:
+            mask &= np.isin(
+                self.availability, [availability_code(a) for a in availability]
+            )
+        if min_rating is not None:
+            # NaN compares False, so unrated rows drop out
+            mask &= self.rating >= min_rating
+        if brands is not None:
+            mask &= np.isin(self.brand, self._brands.matching(brands))
+        if categories is not None:
+            mask &= np.isin(
+                self.category, self._categories.matching(categories)
+            )
+        if certifications is not None:
+            certified = np.zeros(len(self), dtype=bool)
+            for code in self._certifications.matching(certifications):
+                certified[self._certified_rows[code]] = True
+            mask &= certified
+        return mask
+
+    def facet_counts(
+        self, rows: np.ndarray, top: int = 5
+    ) -> dict[str, list[tuple[str, int]]]:
+        """Count the values of each facet over a set of rows.
+
+        Args:
+            rows: Row numbers, e.g. the hits of a search.
+            top: Maximum number of values reported per facet.
+
+        Returns:
+            dict[str, list[tuple[str, int]]]: Facet name (see `FACET_NAMES`)
+            -> (value, count) pairs, most frequent first.
+
+        """
+        counts = {}
+        for name, column, values in (
+            ("brand", self.brand, self.brands),
+            ("category", self.category, self.categories),
+        ):
+            codes = column[rows]
+            tally = np.bincount(codes[codes >= 0], minlength=len(values))
+            counts[name] = _top(tally, values, top)
+
+        tally = np.bincount(
+            self.availability[rows], minlength=len(AVAILABILITY_VALUES)
+        )
+        tally[0] = 0  # unknown
+        names = [
+            url.rsplit("/", 1)[-1] if url else "" for url in AVAILABILITY_VALUES
+        ]
+        counts["availability"] = _top(tally, names, top)
+
+        selected = np.zeros(len(self), dtype=bool)
+        selected[rows] = True
+        tally = np.array(
+            [np.count_nonzero(selected[r]) for r in self._certified_rows],
+            dtype=np.int64,
+        )
+        counts["certification"] = _top(tally, self.certifications, top)
+        return counts
+
+    def price_range(self, rows: np.ndarray) -> tuple[int, int] | None:
+        """Return the (min, max) price in cents over a set of rows."""
+        prices = self.price_cents[rows]
+        prices = prices[prices != NO_PRICE]
+        if not len(prices):
+            return None
+        return int(prices.min()), int(prices.max())
+
+    def sort(self, rows: np.ndarray, order: str) -> np.ndarray:
+        """Order rows by a column; rows missing the value go last.
+
+        Args:
+            rows: Row numbers to order.
+            order: One of `SORT_ORDERS`.
+
+        Returns:
+            np.ndarray: The rows, reordered; ties keep their order.
+
+        Raises:
+            ValueError: If `order` is not a sort order.
+
+        """
+        if order not in SORT_ORDERS:
+            raise ValueError(
+                f"Unknown sort order '{order}'; use one of {list(SORT_ORDERS)}"
+            )
+        by, descending = SORT_ORDERS[order]
+        if by == "price":
+            values = self.price_cents[rows].astype(np.float64)
+            values[values == NO_PRICE] = np.nan
+        else:
+            values = self.rating[rows].astype(np.float64)
+
+        missing = np.isnan(values)
+        keys = np.where(missing, 0.0, -values if descending else values)
+        # lexsort sorts by the last key first
+        return rows[np.lexsort((keys, missing))]
+
+
+class ColumnsBuilder:
+    """Collects the columns of catalog records, one record at a time."""
+
+    def __init__(self):
+        self.price_cents = array("q")
+        self.currency = array("h")
+        self.availability = array("B")
+        self.rating = array("f")
+        self.brand = array("i")
+        self.category = array("i")
+        self.currencies = _Codes()
+        self.brands = _Codes()
+        self.categories = _Codes()
+        self.certifications = _Codes()
+        self.certified_rows: list[list[int]] = []
+
+    def add(self, record: dict[str, Any]) -> None:
+        """Append the columns of the record at the next catalog position."""
+        row = len(self.price_cents)
+        price, currency, availability = NO_PRICE, NO_CODE, 0
+        offers = record.get("offers")
+        if isinstance(offers, dict):
+            price = price_to_cents(offers.get("price"))
+            currency = self.currencies.encode(offers.get("priceCurrency"))
+            availability = AVAILABILITY_CODES.get(offers.get("availability"), 0)
+        rating = math.nan
+        rating_value = record.get("aggregateRating")
+        if isinstance(rating_value, dict):
+            try:
+                rating = float(rating_value.get("ratingValue"))
+            except (TypeError, ValueError):
+                pass
+        brand = record.get("brand")
+        self.price_cents.append(price)
+        self.currency.append(currency)
+        self.availability.append(availability)
+        self.rating.append(rating)
+        self.brand.append(
+            self.brands.encode(brand.get("name"))
+            if isinstance(brand, dict)
+            else NO_CODE
+        )
+        self.category.append(self.categories.encode(record.get("category")))
+        for code in _certification_codes(record, self.certifications):
+            while len(self.certified_rows) <= code:
+                self.certified_rows.append([])
+            self.certified_rows[code].append(row)
+
+    def build(self, catalog: ProductCatalog) -> CatalogColumns:
+        """Return the columns collected so far as NumPy arrays."""
+        return CatalogColumns(catalog, self)
+
+
+def _certification_codes(record: dict[str, Any], codes: _Codes) -> set[int]:
+    certifications = record.get("hasCertification")
+    if isinstance(certifications, dict):
+        certifications = [certifications]
+    if not isinstance(certifications, list):
+        return set()
+    return {
+        code
+        for c in certifications
+        if isinstance(c, dict)
+        and (code := codes.encode(c.get("name"))) != NO_CODE
+    }
+
+
+def _top(
+    tally: np.ndarray, values: list[str], top: int
+) -> list[tuple[str, int]]:
+    order = np.argsort(-tally, kind="stable")[:top]
+    return [(values[i], int(tally[i])) for i in order if tally[i] > 0]
@@ -0,0 +1,527 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Synthetic schema.org catalog generator.
+
+Produces `Product`, `ProductGroup` and `ProductCollection` records that
+conform to `models/product_types.py`, so scaling work can be exercised
+against production-like catalog sizes without real merchant data.
+
+Run:
+  uv run python -m business_agent.catalog_generator --groups 50000 \
+      --output /tmp/large_products.json
+
+The default output (flat `Product` records, variants linked through
+`inProductGroupWithID`) plugs straight into
+`RetailStore(products_filename="/tmp/large_products.json")`.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Sequence
+
+import click
+
+# Vocabularies are ordered from most to least common; the Zipf skew in
+# `CatalogSpec.vocabulary_skew` makes the head terms dominate, like real feeds.
+ORIGINS = [
+    "Colombian", "Brazilian", "Ethiopian", "Guatemalan", "Kenyan",
+    "Peruvian", "Sumatran", "Costa Rican", "Honduran", "Mexican",
+    "Rwandan", "Nicaraguan", "Yemeni", "Panamanian", "Bolivian",
+    "Burundian", "Tanzanian", "Ugandan", "Jamaican", "Hawaiian",
+]
+ROASTS = [
+    "Medium Roast", "Dark Roast", "Light Roast", "Espresso Roast",
+    "French Roast", "City Roast", "Vienna Roast", "Italian Roast",
+]
+FORMS = [
+    ("Ground Coffee", "Coffee & Tea > Coffee > Ground"),
+    ("Whole Bean Coffee", "Coffee & Tea > Coffee > Whole Bean"),
+    ("Espresso Blend", "Coffee & Tea > Coffee > Espresso"),
+    ("Instant Coffee", "Coffee & Tea > Coffee > Instant"),
+    ("Decaf Coffee", "Coffee & Tea > Coffee > Decaf"),
+    ("Cold Brew Blend", "Coffee & Tea > Coffee > Cold Brew"),
+    ("Coffee Pods", "Coffee & Tea > Coffee > Pods"),
+    ("Green Tea", "Coffee & Tea > Tea > Green"),
+    ("Black Tea", "Coffee & Tea > Tea > Black"),
+    ("Herbal Tea", "Coffee & Tea > Tea > Herbal"),
+]
+FLAVOR_NOTES = [
+    "chocolate", "caramel", "nutty", "citrus", "berry", "floral",
+    "smoky", "honey", "vanilla", "cocoa", "stone fruit", "spice",
+    "toffee", "molasses", "jasmine", "bergamot", "cherry", "almond",
+    "brown sugar", "tropical fruit", "earthy", "winey", "malty", "apricot",
+]
+DESCRIPTORS = [
+    "Smooth", "Bold", "Bright", "Rich", "Balanced", "Velvety", "Complex",
+    "Mellow", "Crisp", "Juicy", "Sweet", "Full-bodied", "Delicate",
+]
+BRANDS = [
+    "AndesBrew", "OriginRoast", "Cafe Alma", "Tierra Roasters",
+    "Highland Beans", "Morning Ritual", "Blue Summit", "Volcano Estate",
+    "Copper Kettle", "Golden Cup", "Sierra Verde", "Harbor Roastworks",
+    "Rainforest Select", "Nomad Coffee Co", "Little Owl", "Daybreak",
+]
+SIZES = [
+    ("250g", "1.00"),
+    ("500g", "1.85"),
+    ("1kg", "3.40"),
+    ("12oz", "1.30"),
+    ("2lb", "3.00"),
+    ("5lb", "6.75"),
+]
+GRINDS = [
+    "Whole Bean", "Drip Grind", "Espresso Grind", "French Press Grind",
+    "Pour Over Grind", "Turkish Grind",
+]
+CERTIFICATIONS = [
+    ("Fair Trade Certified", "Fair Trade USA"),
+    ("USDA Organic", "United States Department of Agriculture"),
+    ("Rainforest Alliance Certified", "Rainforest Alliance"),
+    ("Bird Friendly", "Smithsonian Migratory Bird Center"),
+    ("Direct Trade", "Specialty Coffee Association"),
+]
+AVAILABILITIES = [
+    ("https://schema.org/InStock", 0.82),
+    ("https://schema.org/OutOfStock", 0.08),
+    ("https://schema.org/LimitedAvailability", 0.05),
+    ("https://schema.org/PreOrder", 0.03),
+    ("https://schema.org/BackOrder", 0.02),
+]
+IMAGES = [
+    "/images/alma_cafe/espresso_beans.jpg",
+    "/images/alma_cafe/ethiopian_beans.jpg",
+    "/images/alma_cafe/ground_colombian.jpg",
+    "/images/alma_cafe/ground_colombian_dark.jpg",
+    "/images/alma_cafe/instant_coffee.jpg",
+    "/images/alma_cafe/instant_coffee_gold.jpg",
+    "/images/alma_cafe/medium_roasted_beans.jpg",
+    "/images/alma_cafe/roasted_dark.jpg",
+    "/images/tierra_cafe/espresso_beans.png",
+    "/images/tierra_cafe/ethiopian_beans.png",
+    "/images/tierra_cafe/ground_colombian.png",
+    "/images/tierra_cafe/instant_coffee.png",
+]
+SHIPPING_OPTIONS = [
+    ("Standard Shipping", "4.99", 1, 2, 3, 5),
+    ("Express Shipping", "9.99", 0, 1, 1, 2),
+    ("Free Shipping", "0.00", 1, 3, 5, 8),
+]
+
+
+@dataclass(frozen=True)
+class CatalogSpec:
+    """Knobs controlling the shape of a generated catalog.
+
+    Attributes:
+        num_groups: Number of product groups (distinct items before variants).
+        min_variants: Minimum number of variants per group.
+        max_variants: Maximum number of variants per group.
+        min_images: Minimum number of images per product.
+        max_images: Maximum number of images per product.
+        vocabulary_skew: Zipf exponent applied to every vocabulary; 0 gives
+            uniform picks, larger values concentrate on the head terms.
+        certification_rate: Probability that a group carries certifications.
+        rating_rate: Probability that a product carries an aggregate rating.
+        shipping_options: Number of `OfferShippingDetails` per offer.
+        currency: ISO 4217 code used for every price.
+        id_prefix: Prefix of every generated identifier.
+        seed: Seed of the random generator; equal specs give equal catalogs.
+
+    """
+
+    num_groups: int = 1000
+    min_variants: int = 1
+    max_variants: int = 4
+    min_images: int = 1
+    max_images: int = 3
+    vocabulary_skew: float = 1.1
+    certification_rate: float = 0.3
+    rating_rate: float = 0.7
+    shipping_options: int = 2
+    currency: str = "USD"
+    id_prefix: str = "GEN"
+    seed: int = 0
+
+
+class _SkewedVocabulary:
+    """Weighted picker with Zipf-distributed weights over a vocabulary."""
+
+    def __init__(self, terms: Sequence[Any], skew: float):
+        self.terms = list(terms)
+        weights = [1.0 / (rank**skew) for rank in range(1, len(terms) + 1)]
+        self.cum_weights = list(itertools.accumulate(weights))
+
+    def pick(self, rng: random.Random) -> Any:
+        return rng.choices(self.terms, cum_weights=self.cum_weights)[0]
+
+    def sample(self, rng: random.Random, k: int) -> list[Any]:
+        picked: list[Any] = []
+        while len(picked) < min(k, len(self.terms)):
+            term = self.pick(rng)
+            if term not in picked:
+                picked.append(term)
+        return picked
+
+
+def _gtin13(number: int) -> str:
+    """Return a GTIN-13 with a valid check digit for the given body."""
+    body = f"{number % 10**12:012d}"
+    total = sum(
+        int(digit) * (3 if index % 2 else 1) for index, digit in enumerate(body)
+    )
+    return body + str((10 - total % 10) % 10)
+
+
+def _shipping_details(
+    spec: CatalogSpec, rng: random.Random
+) -> list[dict[str, Any]]:
+    details = []
+    for name, rate, handling_min, handling_max, transit_min, transit_max in (
+        rng.sample(SHIPPING_OPTIONS, min(spec.shipping_options, len(SHIPPING_OPTIONS)))
+    ):
+        details.append(
+            {
+                "@type": "OfferShippingDetails",
+                "name": name,
+                "shippingRate": {
+                    "@type": "MonetaryAmount",
+                    "value": rate,
+                    "currency": spec.currency,
+                },
+                "shippingDestination": {
+                    "@type": "DefinedRegion",
+                    "addressCountry": "US",
+                },
+                "deliveryTime": {
+                    "@type": "ShippingDeliveryTime",
+                    "handlingTime": {
+                        "@type": "QuantitativeValue",
+                        "min_value": handling_min,
+                        "max_value": handling_max,
+                        "unitCode": "DAY",
+                    },
+                    "transitTime": {
+                        "@type": "QuantitativeValue",
+                        "min_value": transit_min,
+                        "max_value": transit_max,
+                        "unitCode": "DAY",
+                    },
+                },
+            }
+        )
+    return details
+
+
+def _certifications(
+    spec: CatalogSpec, rng: random.Random, group_index: int
+) -> list[dict[str, Any]] | None:
+    if rng.random() >= spec.certification_rate:
+        return None
+    return [
+        {
+            "@type": "Certification",
+            "name": name,
+            "issuedBy": {"@type": "Organization", "name": issuer},
+            "certificationIdentification": (
+                f"{spec.id_prefix}-CERT-{group_index:07d}-{index}"
+            ),
+        }
+        for index, (name, issuer) in enumerate(
+            rng.sample(CERTIFICATIONS, rng.randint(1, 2))
+        )
+    ]
+
+
+class _Vocabularies:
+    """All skewed vocabularies used by the generator."""
+
+    def __init__(self, skew: float):
+        self.origins = _SkewedVocabulary(ORIGINS, skew)
+        self.roasts = _SkewedVocabulary(ROASTS, skew)
+        self.forms = _SkewedVocabulary(FORMS, skew)
+        self.notes = _SkewedVocabulary(FLAVOR_NOTES, skew)
+        self.descriptors = _SkewedVocabulary(DESCRIPTORS, skew)
+        self.brands = _SkewedVocabulary(BRANDS, skew)
+        self.sizes = _SkewedVocabulary(SIZES, skew)
+        self.grinds = _SkewedVocabulary(GRINDS, skew)
+        self.images = _SkewedVocabulary(IMAGES, skew)
+
+
+def _generate_group(
+    spec: CatalogSpec,
+    rng: random.Random,
+    vocab: _Vocabularies,
+    group_index: int,
+) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """Generate one group header and its flat variant products."""
+    origin = vocab.origins.pick(rng)
+    roast = vocab.roasts.pick(rng)
+    form, category = vocab.forms.pick(rng)
+    brand = vocab.brands.pick(rng)
+    notes = vocab.notes.sample(rng, rng.randint(1, 3))
+    descriptor = vocab.descriptors.pick(rng)
+
+    group_id = f"{spec.id_prefix}-{group_index:07d}"
+    name = f"{origin} {form} — {roast}"
+    description = (
+        f"{descriptor} {origin.lower()} {form.lower()} with "
+        f"{', '.join(notes)} notes."
+    )
+    base_price = rng.uniform(4.0, 24.0)
+    certifications = _certifications(spec, rng, group_index)
+
+    num_variants = rng.randint(spec.min_variants, spec.max_variants)
+    sizes = vocab.sizes.sample(rng, num_variants)
+    grinds = vocab.grinds.sample(rng, -(-num_variants // len(sizes)))
+    combos = list(itertools.product(sizes, grinds))[:num_variants]
+
+    variants = []
+    for variant_index, ((size, multiplier), grind) in enumerate(combos):
+        product_id = f"{group_id}-{variant_index:02d}"
+        availability = rng.choices(
+            [a for a, _ in AVAILABILITIES], weights=[w for _, w in AVAILABILITIES]
+        )[0]
+        product: dict[str, Any] = {
+            "@type": "Product",
+            "productID": product_id,
+            "sku": f"SKU-{product_id}",
+            "name": f"{name}, {size}, {grind}" if len(combos) > 1 else name,
+            "image": vocab.images.sample(
+                rng, rng.randint(spec.min_images, spec.max_images)
+            ),
+            "brand": {"@type": "Brand", "name": brand},
+            "offers": {
+                "@type": "Offer",
+                "price": f"{base_price * float(multiplier):.2f}",
+                "priceCurrency": spec.currency,
+                "availability": availability,
+                "itemCondition": "https://schema.org/NewCondition",
+                "shippingDetails": _shipping_details(spec, rng),
+            },
+            "url": f"https://example.com/{product_id.lower()}",
+            "description": description,
+            "gtin": _gtin13(group_index * 100 + variant_index),
+            "mpn": f"{brand[:2].upper()}-{group_index:07d}-{variant_index:02d}",
+            "size": size,
+            "inProductGroupWithID": group_id,
+            "additionalProperty": [
+                {"@type": "PropertyValue", "name": "grind", "value": grind},
+                {"@type": "PropertyValue", "name": "origin", "value": origin},
+            ],
+            "category": category,
+        }
+        if rng.random() < spec.rating_rate:
+            rating_count = int(rng.paretovariate(1.2) * 5)
+            product["aggregateRating"] = {
+                "@type": "AggregateRating",
+                "ratingValue": round(rng.uniform(2.5, 5.0), 1),
+                "ratingCount": rating_count,
+                "reviewCount": rating_count // 3,
+                "bestRating": 5,
+                "worstRating": 1,
+            }
+        if certifications:
+            product["hasCertification"] = certifications
+        variants.append(product)
+
+    group = {
+        "@context": "https://schema.org/",
+        "@type": "ProductGroup",
+        "productGroupID": group_id,
+        "name": name,
+        "description": description,
+        "image": variants[0]["image"],
+        "url": f"https://example.com/{group_id.lower()}",
+    }
+    return group, variants
+
+
+def _iter_groups(
+    spec: CatalogSpec,
+) -> Iterator[tuple[dict[str, Any], list[dict[str, Any]]]]:
+    rng = random.Random(spec.seed)
+    vocab = _Vocabularies(spec.vocabulary_skew)
+    for group_index in range(spec.num_groups):
+        yield _generate_group(spec, rng, vocab, group_index)
+
+
+def generate_products(spec: CatalogSpec) -> Iterator[dict[str, Any]]:
+    """Generate flat `Product` records, one per variant.
+
+    Args:
+        spec: Shape of the catalog to generate.
+
+    Yields:
+        dict[str, Any]: A schema.org `Product` record.
+
+    """
+    for _, variants in _iter_groups(spec):
+        yield from variants
+
+
+def generate_product_groups(spec: CatalogSpec) -> Iterator[dict[str, Any]]:
+    """Generate `ProductGroup` records with nested variants.
+
+    Args:
+        spec: Shape of the catalog to generate.
+
+    Yields:
+        dict[str, Any]: A schema.org `ProductGroup` record.
+
+    """
+    for group, variants in _iter_groups(spec):
+        yield {**group, "hasVariant": variants}
+
+
+def generate_collections(
+    products: Iterable[dict[str, Any]],
+    bundle_size: int = 3,
+    seed: int = 0,
+    id_prefix: str = "GEN",
+) -> Iterator[dict[str, Any]]:
+    """Bundle products into `ProductCollection` records.
+
+    Args:
+        products: Product records to bundle.
+        bundle_size: Number of distinct products per collection.
+        seed: Seed used to pick the quantity of each bundled product.
+        id_prefix: Prefix of the collection identifiers.
+
+    Yields:
+        dict[str, Any]: A schema.org `ProductCollection` record.
+
+    """
+    rng = random.Random(seed)
+    iterator = iter(products)
+    for index in itertools.count():
+        bundle = list(itertools.islice(iterator, bundle_size))
+        if len(bundle) < bundle_size:
+            return
+        yield {
+            "@type": "ProductCollection",
+            "identifier": f"{id_prefix}-BUNDLE-{index:07d}",
+            "name": " + ".join(p["name"].split(" — ")[0] for p in bundle),
+            "description": f"Bundle of {bundle_size} products.",
+            "image": bundle[0]["image"],
+            "url": f"https://example.com/bundle-{index:07d}",
+            "includesObject": [
+                {
+                    "@type": "TypeAndQuantityNode",
+                    "amountOfThisGood": rng.randint(1, 3),
+                    "typeOfGood": product,
+                }
+                for product in bundle
+            ],
+        }
+
+
+def write_catalog(
+    records: Iterable[dict[str, Any]], path: Path, ndjson: bool = False
+) -> int:
+    """Stream records to a JSON array (or NDJSON) file.
+
+    Args:
+        records: Records to write.
+        path: Destination file.
+        ndjson: Write one record per line instead of a JSON array.
+
+    Returns:
+        int: Number of records written.
+
+    """
+    count = 0
+    with path.open("w", encoding="utf-8") as f:
+        if not ndjson:
+            f.write("[\n")
+        for record in records:
+            if not ndjson and count:
+                f.write(",\n")
+            f.write(json.dumps(record, ensure_ascii=False))
+            if ndjson:
+                f.write("\n")
+            count += 1
+        if not ndjson:
+            f.write("\n]\n")
+    return count
+
+
+def _validated(
+    records: Iterable[dict[str, Any]], model: type
+) -> Iterator[dict[str, Any]]:
+    for record in records:
+        model.model_validate(record)
+        yield record
+
+
+@click.command()
+@click.option("--output", type=click.Path(path_type=Path), required=True)
+@click.option(
+    "--kind",
+    type=click.Choice(["products", "groups", "collections"]),
+    default="products",
+    help="Record type to emit; RetailStore loads 'products'.",
+)
+@click.option("--groups", "num_groups", default=1000, show_default=True)
+@click.option("--min-variants", default=1, show_default=True)
+@click.option("--max-variants", default=4, show_default=True)
+@click.option("--min-images", default=1, show_default=True)
+@click.option("--max-images", default=3, show_default=True)
+@click.option("--skew", "vocabulary_skew", default=1.1, show_default=True)
+@click.option("--certification-rate", default=0.3, show_default=True)
+@click.option("--rating-rate", default=0.7, show_default=True)
+@click.option("--shipping-options", default=2, show_default=True)
+@click.option("--id-prefix", default="GEN", show_default=True)
+@click.option("--seed", default=0, show_default=True)
+@click.option("--ndjson", is_flag=True, help="Write NDJSON instead of a JSON array.")
+@click.option(
+    "--validate", is_flag=True, help="Validate every record with pydantic."
+)
+def main(output: Path, kind: str, ndjson: bool, validate: bool, **kwargs):
+    """Generate a synthetic catalog file."""
+    spec = CatalogSpec(**kwargs)
+    if kind == "products":
+        records = generate_products(spec)
+    elif kind == "groups":
+        records = generate_product_groups(spec)
+    else:
+        records = generate_collections(
+            generate_products(spec), seed=spec.seed, id_prefix=spec.id_prefix
+        )
+
+    if validate:
+        from .models.product_types import (
+            Product,
+            ProductCollection,
+            ProductGroup,
+        )
+
+        model = {
+            "products": Product,
+            "groups": ProductGroup,
+            "collections": ProductCollection,
+        }[kind]
+        records = _validated(records, model)
+
+    count = write_catalog(records, output, ndjson=ndjson)
+    click.echo(f"Wrote {count} {kind} records to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Search side tables of a catalog.
+
+The side tables (columns, keyword, prefix, resolver, variant and semantic
+indexes) are derived from the raw records. An `IndexBuilder` collects them
+in one streaming pass, as records are ingested (see
+`catalog_ingest.ingest_catalog`) or read back from a catalog, so no record
+is decoded twice or kept beyond its own step. Precompiled snapshots persist
+the tables so that a store loading a snapshot does not rebuild them (see
+`catalog_snapshot`).
+"""
+
+import logging
+from typing import Any
+from .autocomplete import PrefixIndex, SuggestionsBuilder
+from .catalog import CatalogEntry, ProductCatalog
+from .catalog_columns import ColumnsBuilder
+from .product_resolver import ProductResolver
+from .semantic_index import SemanticIndexBuilder, document_text
+from .text_index import TrigramIndex
+from .variant_index import VariantIndexBuilder
+
+logger = logging.getLogger("business_agent.catalog_indexes")
+
+# `ProductCatalog` attributes holding the side tables
+INDEX_ATTRIBUTES = (
+    "columns",
+    "text_index",
+    "autocomplete",
+    "resolver",
+    "variants",
+    "semantic_index",
+)
+
+
+class IndexBuilder:
+    """Collects the side tables of a catalog as its records are added.
+
+    Records must be passed in catalog order, right after `ProductCatalog.add`
+    accepted them. A record replacing an earlier one with the same product
+    ID cannot be undone in the tables; `build` then reads the catalog back
+    once instead.
+    """
+
+    def __init__(self, catalog: ProductCatalog, semantic_search: bool = True):
+        """Start empty side tables for a catalog.
+
+        Args:
+            catalog: The catalog receiving the records.
+            semantic_search: Also build the semantic index.
+
+        """
+        self.catalog = catalog
+        self.semantic_search = semantic_search
+        self._rows = 0
+        self._replaced = False
+        self._columns = ColumnsBuilder()
+        self._suggestions = SuggestionsBuilder()
+        self._resolver = ProductResolver()
+        self._variants = VariantIndexBuilder()
+        self._semantic = SemanticIndexBuilder() if semantic_search else None
+
+    def add(self, entry: CatalogEntry, record: dict[str, Any]) -> None:
+        """Add a record the catalog has just accepted."""
+        if self._replaced:
+            return
+        if self.catalog.position(entry.product_id) != self._rows:
+            self._replaced = True
+            return
+        self._rows += 1
+        self._columns.add(record)
+        self._suggestions.add(entry, record)
+        self._resolver.add(entry, record)
+        self._variants.add(entry, record)
+        if self._semantic is not None:
+            self._semantic.add(document_text(record))
+
+    def build(self) -> dict[str, Any]:
+        """Return the side tables by `INDEX_ATTRIBUTES` name."""
+        catalog = self.catalog
+        if self._replaced or self._rows != len(catalog):
+            logger.info(
+                "catalog_indexes_rebuild rows=%d catalog=%d",
+                self._rows,
+                len(catalog),
+            )
+            return build_indexes(catalog, self.semantic_search)
+        return {
+            "columns": self._columns.build(catalog),
+            "text_index": TrigramIndex(catalog.entries),
+            "autocomplete": PrefixIndex(self._suggestions.build()),
+            "resolver": self._resolver,
+            "variants": self._variants.build(len(catalog)),
+            "semantic_index": (
+                self._semantic.build() if self._semantic is not None else None
+            ),
+        }
+
+
+def build_indexes(
+    catalog: ProductCatalog, semantic_search: bool = True
+) -> dict[str, Any]:
+    """Build the side tables of a catalog in one pass over its records.
+
+    Args:
+        catalog: The catalog; lazy catalogs are read without validation.
+        semantic_search: Also build the semantic index.
+
+    Returns:
+        dict[str, Any]: Side tables by `INDEX_ATTRIBUTES` name.
+
+    """
+    builder = IndexBuilder(catalog, semantic_search)
+    for entry, record in catalog.iter_records():
+        builder.add(entry, record)
+    return builder.build()
+
+
+def attach_indexes(catalog: ProductCatalog, indexes: dict[str, Any]) -> None:
+    """Attach side tables built by `build_indexes` to a catalog."""
+    for name in INDEX_ATTRIBUTES:
+        setattr(catalog, name, indexes.get(name))
+    catalog.columns.catalog = catalog
@@ -0,0 +1,602 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Streaming catalog ingestion.
+
+Product feeds are read one record at a time, so memory stays bounded by the
+largest record instead of the whole file. Supported formats:
+
+- JSON array (`.json`), parsed incrementally
+- NDJSON (`.ndjson`, `.jsonl`)
+- CSV/TSV merchant feeds (`.csv`, `.tsv`)
+- Parquet merchant feeds (`.parquet`, requires `pyarrow`)
+
+Records that fail to parse or validate are quarantined instead of aborting
+the whole store. Lazy catalogs only check a record's ID and name here; a
+record failing full validation on first access is quarantined then (see
+`IngestReport.reject`). schema.org `ProductGroup` records are flattened into their
+variants (see `flatten_product_group`).
+"""
+
+import csv
+import json
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator, TextIO
+from .catalog import CatalogEntry, ProductCatalog
+from .models.product_types import Product
+
+logger = logging.getLogger("business_agent.catalog_ingest")
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+# a JSON array element larger than this is rejected instead of buffered
+DEFAULT_MAX_RECORD_SIZE = 16 << 20
+DEFAULT_PROGRESS_EVERY = 10_000
+MAX_ERROR_SAMPLES = 20
+
+_WHITESPACE = re.compile(r"\s*")
+# structure of a JSON text, for skipping an unparseable element: strings,
+# and brackets and commas outside of strings. A stray quote leaves the rest
+# of its line unreadable; it ends at the line break JSON forbids in strings,
+# short of a comma ending the line.
+_STRUCTURE = re.compile(
+    r'"(?:[^"\\\n]|\\.)*"|"[^\n]*?(?=,?[ \t\r]*\n)|"[^\n]*|[][{},]'
+)
+# characters of an unparseable element kept in its `RecordParseError`
+_RAW_EXCERPT = 200
+# a decode error this close to the end of the buffer may be a truncated
+# token (`tru`, `1.5e`, `\u00`) rather than a malformed element
+_TRUNCATION_MARGIN = 16
+
+# Google Merchant Center style feed column -> schema.org Product field path.
+# A trailing "[]" appends the value to a list.
+MERCHANT_FEED_COLUMNS = {
+    "id": "productID",
+    "sku": "sku",
+    "title": "name",
+    "description": "description",
+    "link": "url",
+    "image_link": "image[]",
+    "additional_image_link": "image[]",
+    "brand": "brand.name",
+    "gtin": "gtin",
+    "mpn": "mpn",
+    "price": "offers.price",
+    "currency": "offers.priceCurrency",
+    "availability": "offers.availability",
+    "condition": "offers.itemCondition",
+    "product_type": "category",
+    "item_group_id": "inProductGroupWithID",
+    "size": "size",
+    "color": "color",
+    "material": "material",
+}
+
+_AVAILABILITY_VALUES = {
+    "in stock": "https://schema.org/InStock",
+    "in_stock": "https://schema.org/InStock",
+    "out of stock": "https://schema.org/OutOfStock",
+    "out_of_stock": "https://schema.org/OutOfStock",
+    "preorder": "https://schema.org/PreOrder",
+    "backorder": "https://schema.org/BackOrder",
+}
+
+# ProductGroup fields copied to variants that do not set them
+GROUP_INHERITED_FIELDS = ("brand", "category", "description", "image")
+
+_CONDITION_VALUES = {
+    "new": "https://schema.org/NewCondition",
+    "refurbished": "https://schema.org/RefurbishedCondition",
+    "used": "https://schema.org/UsedCondition",
+}
+
+
+@dataclass
+class QuarantinedRecord:
+    """A record rejected during ingestion."""
+
+    # feed record number, or catalog position if rejected on first access
+    position: int
+    error: str
+    record: Any = None
+
+
+@dataclass
+class IngestReport:
+    """Outcome of ingesting a products feed."""
+
+    path: Path
+    loaded: int = 0
+    quarantined: int = 0
+    elapsed_seconds: float = 0.0
+    errors: list[QuarantinedRecord] = field(default_factory=list)
+
+    def reject(
+        self, position: int, error: str, record: Any = None
+    ) -> QuarantinedRecord:
+        """Count a quarantined record and keep a sample of its error.
+
+        Args:
+            position: Feed record number or catalog position.
+            error: Validation or parse error.
+            record: The rejected record.
+
+        Returns:
+            QuarantinedRecord: The rejection, with the first error line.
+
+        """
+        self.quarantined += 1
+        rejected = QuarantinedRecord(
+            position=position, error=error.splitlines()[0], record=record
+        )
+        if len(self.errors) < MAX_ERROR_SAMPLES:
+            self.errors.append(rejected)
+        return rejected
+
+
+class RecordParseError(ValueError):
+    """A single feed record could not be parsed."""
+
+    def __init__(self, message: str, raw: Any = None):
+        super().__init__(message)
+        self.raw = raw
+
+
+def _read_more(
+    f: TextIO, buffer: str, pos: int, size: int
+) -> tuple[str, int, bool]:
+    """Drop the consumed part of the buffer and append `size` characters."""
+    chunk = f.read(size)
+    return buffer[pos:] + chunk, 0, not chunk
+
+
+def _skip_element(
+    f: TextIO,
+    buffer: str,
+    pos: int,
+    eof: bool,
+    chunk_size: int,
+    max_record_size: int,
+) -> tuple[str, int, bool]:
+    """Skip an unparseable array element.
+
+    Scans for the `]` closing the array, or the next `,` followed by `{`
+    outside of strings and of arrays opened since `pos`: inside an object,
+    `,{` cannot be valid, so it starts the next element even when the bad
+    one misses a closing brace. A mismatched closing bracket closes the
+    brackets left open inside it.
+
+    Returns:
+        tuple[str, int, bool]: The buffer, the position of the next
+        element or of the closing `]`, and whether the stream is exhausted.
+
+    Raises:
+        ValueError: If neither is found within `max_record_size`
+            characters.
+
+    """
+    opened: list[str] = []
+    skipped = 0
+    while True:
+        match = _STRUCTURE.search(buffer, pos)
+        if match is None or (match.end() == len(buffer) and not eof):
+            # the next token may be cut by the end of the buffer
+            start = match.start() if match else len(buffer)
+            skipped += start - pos
+            if eof:
+                raise ValueError("Unterminated JSON array")
+            if skipped > max_record_size:
+                raise ValueError(
+                    "No JSON array element found within "
+                    f"{max_record_size} characters of an invalid one"
+                )
+            buffer, pos, eof = _read_more(f, buffer, start, chunk_size)
+            continue
+        token = match.group()
+        if token in "{[":
+            opened.append(token)
+        elif token in "}]":
+            if not opened and token == "]":
+                return buffer, match.start(), eof
+            opening = "{" if token == "}" else "["
+            if opening in opened:
+                del opened[len(opened) - 1 - opened[::-1].index(opening) :]
+        elif token == "," and (not opened or opened[-1] == "{"):
+            after = _WHITESPACE.match(buffer, match.end()).end()
+            if after == len(buffer) and not eof:
+                skipped += match.start() - pos
+                buffer, pos, eof = _read_more(
+                    f, buffer, match.start(), chunk_size
+                )
+                continue
+            if buffer.startswith("{", after):
+                return buffer, after, eof
+        pos = match.end()
+
+
+def iter_json_array(
+    f: TextIO,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_record_size: int = DEFAULT_MAX_RECORD_SIZE,
+) -> Iterator[Any]:
+    """Yield the elements of a JSON array without loading the whole array.
+
+    An element that does not parse is yielded as a `RecordParseError`, and
+    reading resumes at the next top-level `,{`. So are stray or missing
+    commas between elements.
+
+    Args:
+        f: Text stream positioned at the start of the array.
+        chunk_size: Number of characters read at a time.
+        max_record_size: Largest element, in characters, that is buffered
+            while waiting for its end.
+
+    Yields:
+        Any: Each decoded array element, or a `RecordParseError`.
+
+    Raises:
+        ValueError: If the stream is not a JSON array, is truncated, or no
+            element can be found after an unparseable one.
+
+    """
+    decoder = json.JSONDecoder()
+    buffer = f.read(chunk_size).lstrip("\ufeff \t\r\n")
+    if not buffer.startswith("["):
+        raise ValueError("Expected a JSON array")
+    pos = 1
+    eof = False
+    # whether an element may follow: after "[" or after a ","
+    separated = True
+    empty = True
+
+    while True:
+        pos = _WHITESPACE.match(buffer, pos).end()
+        if pos >= len(buffer):
+            if eof:
+                raise ValueError("Unterminated JSON array")
+            buffer, pos, eof = _read_more(f, buffer, pos, chunk_size)
+            continue
+        char = buffer[pos]
+        if char == "]":
+            if separated and not empty:
+                yield RecordParseError("Trailing ',' before ']'")
+            return
+        if char == ",":
+            if separated:
+                yield RecordParseError("Missing element before ','")
+            separated = True
+            pos += 1
+            continue
+        if not separated:
+            yield RecordParseError("Missing ',' between elements")
+            separated = True
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError as e:
+            truncated = e.msg.startswith("Unterminated string") or (
+                e.pos >= len(buffer) - _TRUNCATION_MARGIN
+            )
+            if truncated and not eof and len(buffer) - pos < max_record_size:
+                # the element spans beyond the buffer; read as much again
+                # (so retries stay linear) and retry
+                buffer, pos, eof = _read_more(
+                    f, buffer, pos, max(chunk_size, len(buffer) - pos)
+                )
+                continue
+            yield RecordParseError(
+                f"Invalid JSON array element: {e.msg}",
+                buffer[pos : pos + _RAW_EXCERPT],
+            )
+            buffer, pos, eof = _skip_element(
+                f, buffer, pos, eof, chunk_size, max_record_size
+            )
+            separated = buffer[pos] != "]"
+            empty = False
+            continue
+        yield value
+        pos = end
+        separated = empty = False
+
+
+def iter_ndjson(f: TextIO) -> Iterator[Any]:
+    """Yield one record per non-empty line of an NDJSON stream.
+
+    Args:
+        f: Text stream.
+
+    Yields:
+        Any: Each decoded record, or a `RecordParseError` for bad lines.
+
+    """
+    for line in f:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            yield RecordParseError(f"Invalid JSON line: {e}", line)
+
+
+def _set_path(record: dict[str, Any], path: str, value: Any) -> None:
+    append = path.endswith("[]")
+    keys = path.removesuffix("[]").split(".")
+    target = record
+    for key in keys[:-1]:
+        target = target.setdefault(key, {})
+    if append:
+        target.setdefault(keys[-1], []).extend(
+            v.strip() for v in str(value).split(",") if v.strip()
+        )
+    else:
+        target[keys[-1]] = value
+
+
+def map_feed_row(
+    row: dict[str, Any], columns: dict[str, str] = MERCHANT_FEED_COLUMNS
+) -> dict[str, Any]:
+    """Map a flat merchant feed row to a schema.org `Product` record.
+
+    Args:
+        row: Feed row keyed by column name.
+        columns: Column name -> schema.org field path mapping.
+
+    Returns:
+        dict[str, Any]: The `Product` record.
+
+    """
+    record: dict[str, Any] = {"@type": "Product"}
+    for column, value in row.items():
+        if value is None or value == "" or column not in columns:
+            continue
+        _set_path(record, columns[column], value)
+
+    offers = record.setdefault("offers", {})
+    price = offers.get("price")
+    if isinstance(price, str) and " " in price.strip():
+        # merchant feeds carry "12.99 USD"
+        amount, currency = price.strip().rsplit(" ", 1)
+        offers["price"] = amount
+        offers.setdefault("priceCurrency", currency)
+    elif price is not None:
+        offers["price"] = str(price)
+    availability = offers.get("availability")
+    if isinstance(availability, str):
+        offers["availability"] = _AVAILABILITY_VALUES.get(
+            availability.lower(), availability
+        )
+    condition = offers.get("itemCondition")
+    if isinstance(condition, str):
+        offers["itemCondition"] = _CONDITION_VALUES.get(
+            condition.lower(), condition
+        )
+    if "brand" in record:
+        record["brand"]["@type"] = "Brand"
+    record.setdefault("sku", record.get("productID"))
+    return record
+
+
+def flatten_product_group(record: dict[str, Any]) -> list[dict[str, Any]]:
+    """Split a schema.org `ProductGroup` record into its variant records.
+
+    Variants inherit the shared fields of the group they do not set, point
+    back to it with `inProductGroupWithID`, and keep its name and `variesBy`
+    in `isVariantOf`. Other records are returned unchanged.
+
+    Args:
+        record: schema.org `Product` or `ProductGroup` record.
+
+    Returns:
+        list[dict[str, Any]]: The `Product` records.
+
+    Raises:
+        ValueError: If a group has no ID or no variants.
+
+    """
+    if record.get("@type") != "ProductGroup":
+        return [record]
+    group_id = record.get("productGroupID")
+    variants = record.get("hasVariant")
+    if not isinstance(group_id, str) or not isinstance(variants, list):
+        raise ValueError(
+            "ProductGroup records require 'productGroupID' and 'hasVariant'"
+        )
+
+    parent = {"@type": "ProductGroup", "productGroupID": group_id}
+    for key in ("name", "variesBy"):
+        if key in record:
+            parent[key] = record[key]
+    flattened = []
+    for variant in variants:
+        if not isinstance(variant, dict):
+            raise ValueError("ProductGroup variants must be JSON objects")
+        variant = dict(variant)
+        for key in GROUP_INHERITED_FIELDS:
+            if key in record:
+                variant.setdefault(key, record[key])
+        variant.setdefault("@type", "Product")
+        variant.setdefault("inProductGroupWithID", group_id)
+        variant.setdefault("isVariantOf", parent)
+        flattened.append(variant)
+    return flattened
+
+
+def iter_csv(
+    f: TextIO,
+    delimiter: str = ",",
+    columns: dict[str, str] = MERCHANT_FEED_COLUMNS,
+) -> Iterator[dict[str, Any]]:
+    """Yield schema.org records from a CSV/TSV merchant feed.
+
+    Args:
+        f: Text stream of the feed.
+        delimiter: Column delimiter.
+        columns: Column name -> schema.org field path mapping.
+
+    Yields:
+        dict[str, Any]: Each mapped `Product` record.
+
+    """
+    for row in csv.DictReader(f, delimiter=delimiter):
+        yield map_feed_row(row, columns)
+
+
+def iter_parquet(
+    path: Path,
+    columns: dict[str, str] = MERCHANT_FEED_COLUMNS,
+    batch_size: int = 4096,
+) -> Iterator[dict[str, Any]]:
+    """Yield schema.org records from a Parquet merchant feed.
+
+    Args:
+        path: The Parquet file.
+        columns: Column name -> schema.org field path mapping.
+        batch_size: Rows decoded at a time.
+
+    Yields:
+        dict[str, Any]: Each mapped `Product` record.
+
+    Raises:
+        ValueError: If pyarrow is not installed.
+
+    """
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ValueError("Parquet feeds require the 'pyarrow' package") from e
+
+    parquet_file = pq.ParquetFile(path)
+    for batch in parquet_file.iter_batches(batch_size=batch_size):
+        for row in batch.to_pylist():
+            yield map_feed_row(row, columns)
+
+
+def iter_feed_records(
+    path: Path, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[Any]:
+    """Yield the raw records of a products feed, picking the reader by suffix.
+
+    Args:
+        path: The feed file.
+        chunk_size: Number of characters read at a time from JSON arrays.
+
+    Yields:
+        Any: Each record, or a `RecordParseError` for unparseable ones.
+
+    """
+    suffix = path.suffix.lower()
+    if suffix == ".parquet":
+        yield from iter_parquet(path)
+        return
+
+    with path.open(encoding="utf-8", newline="") as f:
+        if suffix in (".ndjson", ".jsonl"):
+            yield from iter_ndjson(f)
+        elif suffix in (".csv", ".tsv"):
+            yield from iter_csv(f, delimiter="\t" if suffix == ".tsv" else ",")
+        else:
+            yield from iter_json_array(f, chunk_size)
+
+
+def ingest_catalog(
+    path: Path,
+    catalog: ProductCatalog,
+    validate: bool = False,
+    progress: Callable[[int], None] | None = None,
+    progress_every: int = DEFAULT_PROGRESS_EVERY,
+    quarantine_path: Path | None = None,
+    on_added: Callable[[CatalogEntry, dict[str, Any]], None] | None = None,
+) -> IngestReport:
+    """Stream a products feed into a catalog, quarantining bad records.
+
+    Args:
+        path: The feed file.
+        catalog: Catalog receiving the records.
+        validate: Fully validate every record even if the catalog is lazy.
+        progress: Called with the number of records read so far.
+        progress_every: Number of records between progress reports.
+        quarantine_path: Optional NDJSON file receiving rejected records.
+        on_added: Called with each record the catalog accepted and its
+            entry, e.g. `catalog_indexes.IndexBuilder.add`.
+
+    Returns:
+        IngestReport: Counts and a sample of the rejected records.
+
+    """
+    report = IngestReport(path=path)
+    started = time.perf_counter()
+    quarantine = quarantine_path.open("w") if quarantine_path else None
+
+    try:
+        for position, record in enumerate(iter_feed_records(path), start=1):
+            try:
+                if isinstance(record, RecordParseError):
+                    raise record
+                if not isinstance(record, dict):
+                    raise ValueError("Product records must be JSON objects")
+                for variant in flatten_product_group(record):
+                    if validate and catalog.lazy:
+                        Product.model_validate(variant)
+                    entry = catalog.add(variant)
+                    report.loaded += 1
+                    if on_added is not None:
+                        on_added(entry, variant)
+            except ValueError as e:
+                rejected = report.reject(
+                    position, str(e), getattr(e, "raw", record)
+                )
+                if quarantine:
+                    quarantine.write(
+                        json.dumps(
+                            {
+                                "position": rejected.position,
+                                "error": str(e),
+                                "record": rejected.record,
+                            },
+                            default=str,
+                        )
+                        + "\n"
+                    )
+
+            if position % progress_every == 0:
+                logger.info(
+                    "catalog_ingest_progress path=%s records=%d quarantined=%d",
+                    path.name,
+                    position,
+                    report.quarantined,
+                )
+                if progress:
+                    progress(position)
+    finally:
+        if quarantine:
+            quarantine.close()
+
+    report.elapsed_seconds = time.perf_counter() - started
+    if report.quarantined:
+        logger.warning(
+            "catalog_ingest_quarantined path=%s quarantined=%d first_error=%r",
+            path.name,
+            report.quarantined,
+            report.errors[0].error,
+        )
+    logger.info(
+        "catalog_ingest_done path=%s loaded=%d quarantined=%d elapsed=%.3fs",
+        path.name,
+        report.loaded,
+        report.quarantined,
+        report.elapsed_seconds,
+    )
+    return report
@@ -0,0 +1,501 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Precompiled, memory-mappable catalog snapshots.
+
+A snapshot holds the validated raw records of a products JSON file, an
+interned string table, the search projection and the search side tables
+(see `catalog_indexes`), laid out so that a store can map the file and start
+serving without decoding records or rebuilding indexes. Records are still
+validated lazily, on first access.
+
+The side tables are pickled; like the code, snapshots must only be loaded
+from trusted locations. The format version is a hash of the modules that
+write a snapshot (see `format_version`), so a snapshot built by other code
+is rebuilt from the feed instead of being unpickled into changed classes.
+
+Run:
+  uv run python -m business_agent.catalog_snapshot --all
+
+File layout (native byte order, recorded in the header):
+
+  MAGIC | u32 header length | header JSON | sections (8-byte aligned)
+
+Sections:
+  string_offsets  u64[n_strings + 1] offsets into `strings`
+  strings         utf-8 bytes of every distinct string
+  entries         u32[3 * n] string ids of (productID, name, category)
+  record_offsets  u64[n + 1] offsets into `records`
+  records         compact JSON of every raw product record
+  id_index        u32[n] record positions sorted by productID
+  indexes         pickled side tables, by `INDEX_ATTRIBUTES` name
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import logging
+import mmap
+import os
+import pickle
+import struct
+import sys
+import zlib
+from array import array
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Any, Iterator
+
+import click
+
+from .catalog import DEFAULT_PRODUCT_CACHE_SIZE, CatalogEntry, ProductCatalog
+from .catalog_indexes import IndexBuilder
+from .catalog_ingest import ingest_catalog
+
+logger = logging.getLogger("business_agent.catalog_snapshot")
+
+MAGIC = b"UCPCAT\x00\x01"
+# modules whose code shapes a snapshot: its layout, the ingested records and
+# the classes of the pickled side tables
+SNAPSHOT_MODULES = (
+    "autocomplete",
+    "catalog",
+    "catalog_columns",
+    "catalog_indexes",
+    "catalog_ingest",
+    "catalog_snapshot",
+    "product_resolver",
+    "semantic_index",
+    "text_index",
+    "variant_index",
+)
+SNAPSHOT_SUFFIX = ".snapshot"
+
+# Sections verified on load; `records` is only verified by `verify_snapshot`
+# so that load time does not grow with the catalog size.
+_STRUCTURAL_SECTIONS = ("string_offsets", "entries", "record_offsets", "id_index")
+
+_PREFIX = struct.Struct("<8sI")
+
+
+@functools.cache
+def format_version() -> str:
+    """Return the snapshot format version, a hash of `SNAPSHOT_MODULES`."""
+    package = Path(__file__).parent
+    digest = hashlib.sha256()
+    for name in SNAPSHOT_MODULES:
+        digest.update((package / f"{name}.py").read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def snapshot_path_for(products_path: Path) -> Path:
+    """Return the snapshot path that belongs to a products JSON file."""
+    return products_path.with_suffix(SNAPSHOT_SUFFIX)
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _source_fingerprint(path: Path) -> dict[str, Any]:
+    stat = path.stat()
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": _file_sha256(path),
+    }
+
+
+def build_snapshot(products_path: Path, output_path: Path | None = None) -> Path:
+    """Validate a products feed and write its snapshot.
+
+    Invalid records are quarantined exactly as when a store loads the feed.
+
+    Args:
+        products_path: The products JSON file.
+        output_path: Destination; defaults to the `.snapshot` sibling.
+
+    Returns:
+        Path: The written snapshot path.
+
+    """
+    output_path = output_path or snapshot_path_for(products_path)
+    fingerprint = _source_fingerprint(products_path)
+
+    catalog = ProductCatalog(lazy=True)
+    builder = IndexBuilder(catalog, semantic_search=True)
+    ingest_catalog(products_path, catalog, validate=True, on_added=builder.add)
+    records = catalog.records()
+    indexes = builder.build()
+
+    string_ids: dict[str, int] = {}
+    strings: list[bytes] = []
+
+    def intern(value: str) -> int:
+        sid = string_ids.get(value)
+        if sid is None:
+            sid = string_ids[value] = len(strings)
+            strings.append(value.encode())
+        return sid
+
+    entries = array("I")
+    record_offsets = array("Q", [0])
+    for entry, raw in records:
+        entries.extend(
+            (intern(entry.product_id), intern(entry.name), intern(entry.category))
+        )
+        record_offsets.append(record_offsets[-1] + len(raw))
+
+    string_offsets = array("Q", [0])
+    for value in strings:
+        string_offsets.append(string_offsets[-1] + len(value))
+
+    id_index = array(
+        "I",
+        sorted(range(len(records)), key=lambda pos: records[pos][0].product_id),
+    )
+
+    sections = {
+        "string_offsets": string_offsets.tobytes(),
+        "strings": b"".join(strings),
+        "entries": entries.tobytes(),
+        "record_offsets": record_offsets.tobytes(),
+        "records": b"".join(raw for _, raw in records),
+        "id_index": id_index.tobytes(),
+        "indexes": pickle.dumps(indexes, protocol=pickle.HIGHEST_PROTOCOL),
+    }
+
+    header: dict[str, Any] = {
+        "format_version": format_version(),
+        "byteorder": sys.byteorder,
+        "source": fingerprint,
+        "count": len(records),
+        "string_count": len(strings),
+        "sections": {},
+    }
+    # section offsets depend on the header length: lay out until stable
+    header_bytes = b""
+    while True:
+        header_length = len(header_bytes)
+        offset = _PREFIX.size + header_length
+        layout = {}
+        for name, data in sections.items():
+            offset += -offset % 8
+            layout[name] = {
+                "offset": offset,
+                "length": len(data),
+                "crc32": zlib.crc32(data),
+            }
+            offset += len(data)
+        header["sections"] = layout
+        header_bytes = json.dumps(header, sort_keys=True).encode()
+        if len(header_bytes) == header_length:
+            break
+
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    with tmp_path.open("wb") as f:
+        f.write(_PREFIX.pack(MAGIC, len(header_bytes)))
+        f.write(header_bytes)
+        for name, data in sections.items():
+            f.write(b"\0" * (header["sections"][name]["offset"] - f.tell()))
+            f.write(data)
+    os.replace(tmp_path, output_path)
+
+    logger.info(
+        "catalog_snapshot_built source=%s output=%s products=%d strings=%d",
+        products_path,
+        output_path,
+        len(records),
+        len(strings),
+    )
+    return output_path
+
+
+class _Positions(Mapping):
+    """productID -> record position, by binary search over the id index."""
+
+    def __init__(self, snapshot: SnapshotCatalog):
+        self._snapshot = snapshot
+
+    def __getitem__(self, product_id: str) -> int:
+        snapshot = self._snapshot
+        index = snapshot._id_index
+        lo, hi = 0, len(index)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            candidate = snapshot._product_id_at(index[mid])
+            if candidate < product_id:
+                lo = mid + 1
+            elif candidate > product_id:
+                hi = mid
+            else:
+                return index[mid]
+        raise KeyError(product_id)
+
+    def __iter__(self) -> Iterator[str]:
+        snapshot = self._snapshot
+        return (snapshot._product_id_at(pos) for pos in range(len(snapshot)))
+
+    def __len__(self) -> int:
+        return len(self._snapshot)
+
+
+class _Records(Sequence):
+    """Raw JSON records, sliced from the mapped file on access."""
+
+    def __init__(self, offsets: memoryview, data: memoryview):
+        self._offsets = offsets
+        self._data = data
+
+    def __getitem__(self, position: int) -> bytes:
+        return self._data[
+            self._offsets[position] : self._offsets[position + 1]
+        ].tobytes()
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+
+class SnapshotCatalog(ProductCatalog):
+    """Read-only `ProductCatalog` backed by a memory-mapped snapshot.
+
+    Opening a snapshot only reads its header; the search projection is
+    decoded on first use and products are validated lazily.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        cache_size: int = DEFAULT_PRODUCT_CACHE_SIZE,
+        base_url: str = "",
+    ):
+        """Map a snapshot file.
+
+        Args:
+            path: The snapshot file.
+            cache_size: Maximum number of validated products kept.
+            base_url: Base URL prepended to relative image paths.
+
+        Raises:
+            ValueError: If the file is not a readable snapshot.
+
+        """
+        super().__init__(lazy=True, cache_size=cache_size, base_url=base_url)
+        with path.open("rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.path = path
+        self.header = _read_header(self._mmap)
+        if self.header["byteorder"] != sys.byteorder:
+            raise ValueError("Snapshot was built on a different byte order")
+
+        self._view = memoryview(self._mmap)
+        for name in _STRUCTURAL_SECTIONS:
+            if zlib.crc32(self._section(name)) != (
+                self.header["sections"][name]["crc32"]
+            ):
+                raise ValueError(f"Snapshot section '{name}' is corrupt")
+
+        self._string_offsets = self._section("string_offsets").cast("Q")
+        self._strings = self._section("strings")
+        self._entry_ids = self._section("entries").cast("I")
+        self._id_index = self._section("id_index").cast("I")
+        self._records = _Records(
+            self._section("record_offsets").cast("Q"), self._section("records")
+        )
+        self._positions = _Positions(self)
+        self._decoded: dict[int, str] = {}
+        self._entries = None
+
+    def _section(self, name: str) -> memoryview:
+        section = self.header["sections"][name]
+        return self._view[
+            section["offset"] : section["offset"] + section["length"]
+        ]
+
+    def _string(self, sid: int) -> str:
+        value = self._decoded.get(sid)
+        if value is None:
+            value = self._decoded[sid] = sys.intern(
+                str(
+                    self._strings[
+                        self._string_offsets[sid] : self._string_offsets[sid + 1]
+                    ],
+                    "utf-8",
+                )
+            )
+        return value
+
+    def _product_id_at(self, position: int) -> str:
+        return self._string(self._entry_ids[3 * position])
+
+    def add(self, record: dict[str, Any]) -> CatalogEntry:
+        raise ValueError("Snapshot catalogs are read-only")
+
+    def load_indexes(self) -> dict[str, Any]:
+        """Return the side tables persisted in the snapshot.
+
+        Returns:
+            dict[str, Any]: Side tables by `INDEX_ATTRIBUTES` name, to pass
+            to `catalog_indexes.attach_indexes`.
+
+        Raises:
+            ValueError: If the section is corrupt or cannot be unpickled.
+
+        """
+        data = self._section("indexes")
+        if zlib.crc32(data) != self.header["sections"]["indexes"]["crc32"]:
+            raise ValueError("Snapshot section 'indexes' is corrupt")
+        try:
+            return pickle.loads(data)
+        except Exception as e:
+            raise ValueError(f"Snapshot indexes are unreadable: {e}") from e
+
+    @property
+    def entries(self) -> list[CatalogEntry]:
+        """Search projections of all products, decoded on first use."""
+        if self._entries is None:
+            ids = self._entry_ids
+            self._entries = [
+                CatalogEntry(
+                    product_id=self._string(ids[i]),
+                    name=self._string(ids[i + 1]),
+                    category=self._string(ids[i + 2]),
+                )
+                for i in range(0, len(ids), 3)
+            ]
+        return self._entries
+
+    def __len__(self) -> int:
+        return self.header["count"]
+
+
+def _read_header(buffer: mmap.mmap) -> dict[str, Any]:
+    if len(buffer) < _PREFIX.size:
+        raise ValueError("Snapshot is truncated")
+    magic, header_length = _PREFIX.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a catalog snapshot")
+    header = json.loads(buffer[_PREFIX.size : _PREFIX.size + header_length])
+    if header.get("format_version") != format_version():
+        raise ValueError("Unsupported snapshot format version")
+    return header
+
+
+def _stale_reason(products_path: Path, header: dict[str, Any]) -> str | None:
+    source = header["source"]
+    try:
+        stat = products_path.stat()
+    except FileNotFoundError:
+        return None  # the snapshot was shipped without its source
+    if stat.st_size != source["size"]:
+        return "size_changed"
+    if stat.st_mtime_ns != source["mtime_ns"]:
+        # e.g. a fresh checkout; only the content matters
+        if _file_sha256(products_path) != source["sha256"]:
+            return "content_changed"
+    return None
+
+
+def load_snapshot_if_fresh(
+    products_path: Path,
+    cache_size: int = DEFAULT_PRODUCT_CACHE_SIZE,
+    base_url: str = "",
+) -> SnapshotCatalog | None:
+    """Load the snapshot of a products file, if one exists and is current.
+
+    Args:
+        products_path: The products JSON file.
+        cache_size: Maximum number of validated products kept.
+        base_url: Base URL prepended to relative image paths.
+
+    Returns:
+        SnapshotCatalog | None: The snapshot catalog, or None when the caller
+        should fall back to parsing the JSON file.
+
+    """
+    path = snapshot_path_for(products_path)
+    if not path.exists():
+        return None
+
+    try:
+        catalog = SnapshotCatalog(path, cache_size=cache_size, base_url=base_url)
+    except (OSError, ValueError) as e:
+        logger.warning("catalog_snapshot_unusable path=%s error=%s", path, e)
+        return None
+
+    reason = _stale_reason(products_path, catalog.header)
+    if reason:
+        logger.warning(
+            "catalog_snapshot_stale path=%s reason=%s", path, reason
+        )
+        return None
+
+    logger.info(
+        "catalog_snapshot_loaded path=%s products=%d", path, len(catalog)
+    )
+    return catalog
+
+
+def verify_snapshot(path: Path) -> None:
+    """Check every section checksum of a snapshot, records included.
+
+    Args:
+        path: The snapshot file.
+
+    Raises:
+        ValueError: If the snapshot is corrupt.
+
+    """
+    catalog = SnapshotCatalog(path)
+    if zlib.crc32(catalog._section("records")) != (
+        catalog.header["sections"]["records"]["crc32"]
+    ):
+        raise ValueError("Snapshot section 'records' is corrupt")
+    catalog.load_indexes()
+
+
+@click.command()
+@click.argument("products", nargs=-1)
+@click.option(
+    "--all", "build_all", is_flag=True,
+    help="Build snapshots for every *products.json file in the data folder.",
+)
+@click.option("--verify", is_flag=True, help="Verify snapshots after writing.")
+def main(products: tuple[str, ...], build_all: bool, verify: bool):
+    """Build catalog snapshots.
+
+    PRODUCTS are file names relative to the data folder, or absolute paths.
+    """
+    data_path = Path(__file__).parent / "data"
+    paths = [data_path / name for name in products]
+    if build_all:
+        paths.extend(sorted(data_path.glob("*products.json")))
+    if not paths:
+        raise click.UsageError("Pass products files or --all")
+
+    for products_path in paths:
+        output = build_snapshot(products_path)
+        if verify:
+            verify_snapshot(output)
+        click.echo(f"Wrote {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,8 +19,10 @@ ADK_PAYMENT_STATE = "__payment_data__"
 ADK_UCP_METADATA_STATE = "__ucp_metadata__"
 ADK_EXTENSIONS_STATE_KEY = "__session_extensions__"
 ADK_LATEST_TOOL_RESULT = "temp:LATEST_TOOL_RESULT"
+ADK_CHECKOUT_ACK_STATE = "__checkout_ack__"
 
 A2A_UCP_EXTENSION_URL = "https://ucp.dev/specification/reference?v=2026-01-11"
+A2A_CHECKOUT_PATCH_EXTENSION_URL = "urn:business-agent:a2a:checkout-patch:v1"
 
 UCP_AGENT_HEADER = "UCP-Agent"
 UCP_FULFILLMENT_EXTENSION = "dev.ucp.shopping.fulfillment"
@@ -30,7 +32,11 @@ UCP_DISCOUNT_EXTENSION = "dev.ucp.shopping.discount"
 UCP_CHECKOUT_KEY = "a2a.ucp.checkout"
 UCP_PAYMENT_DATA_KEY = "a2a.ucp.checkout.payment_data"
 UCP_RISK_SIGNALS_KEY = "a2a.ucp.checkout.risk_signals"
+UCP_CHECKOUT_VERSION_KEY = "a2a.ucp.checkout.version"
+UCP_CHECKOUT_PATCH_KEY = "a2a.ucp.checkout.patch"
+UCP_CHECKOUT_ACK_KEY = "a2a.ucp.checkout.ack"
+FEDERATED_RESULTS_KEY = "a2a.federated_product_results"
 
-#new
 ADK_SELECTED_STORE_ID = "user:store_id"
-ADK_USER_CHECKOUT_IDS = "user:checkout_ids_by_store"
\ No newline at end of file
+# one key per store (user:checkout_id:<store_id>), so that updates stay small
+ADK_USER_CHECKOUT_ID_PREFIX = "user:checkout_id:"
\ No newline at end of file
@@ -1,8 +1,15 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Mapping
+import asyncio
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from typing import Iterator, Mapping
 
+from .models.product_types import Product, ProductGroup
+from .offer_index import OfferIndex
 from .store import RetailStore
 
 import logging
@@ -11,6 +18,21 @@ logger = logging.getLogger("business_agent.discovery")
 # Capability name we use as the baseline for "agent can checkout here"
 REQUIRED_CHECKOUT_CAPABILITY = "dev.ucp.shopping.checkout"
 
+# Seconds a single store may take to answer a federated search
+DEFAULT_FEDERATED_SEARCH_TIMEOUT = float(
+    os.getenv("FEDERATED_SEARCH_TIMEOUT", "2.0")
+)
+FEDERATED_SEARCH_THREADS = int(os.getenv("FEDERATED_SEARCH_THREADS", "4"))
+
+# Federated searches run on their own pool: a search that timed out keeps
+# its thread until it returns, and must not hold up the default executor.
+FEDERATED_EXECUTOR = ThreadPoolExecutor(
+    max_workers=FEDERATED_SEARCH_THREADS, thread_name_prefix="federated-search"
+)
+# stores whose last search timed out and is still running
+_stalled_stores: set[str] = set()
+_stalled_lock = threading.Lock()
+
 
 @dataclass(frozen=True)
 class StoreDecision:
@@ -19,39 +41,301 @@ class StoreDecision:
     rejected_store_id: str | None = None
 
 
-def build_store_registry() -> dict[str, RetailStore]:
+@dataclass(frozen=True)
+class StoreSpec:
+    """Everything needed to build a store, known without loading it."""
+
+    products_filename: str
+    capabilities: frozenset[str] = frozenset()
+
+
+class StoreRegistry(Mapping[str, RetailStore]):
+    """Registry of stores that builds each `RetailStore` on first use.
+
+    Store ids and capabilities come from the specs, so listing stores or
+    choosing a default never loads a catalog. Concurrent first accesses to
+    the same store share a single build.
+    """
+
+    def __init__(self, specs: Mapping[str, StoreSpec], max_workers: int = 4):
+        """Initialize the registry.
+
+        Args:
+            specs: Store id -> spec, in display order.
+            max_workers: Threads used by `warm` to build stores in parallel.
+
+        """
+        self._specs = dict(specs)
+        self._max_workers = max_workers
+        self._builds: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._offer_index: OfferIndex | None = None
+        self._offer_index_lock = threading.Lock()
+
+    def __getitem__(self, store_id: str) -> RetailStore:
+        spec = self._specs[store_id]
+        with self._lock:
+            build = self._builds.get(store_id)
+            owner = build is None
+            if owner:
+                build = self._builds[store_id] = Future()
+
+        if owner:
+            try:
+                store = RetailStore(
+                    products_filename=spec.products_filename,
+                    capabilities=set(spec.capabilities),
+                )
+            except BaseException as e:
+                with self._lock:
+                    del self._builds[store_id]  # let the next caller retry
+                build.set_exception(e)
+                raise
+            build.set_result(store)
+            logger.info("store_built store_id=%s", store_id)
+        return build.result()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._specs)
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    def __contains__(self, store_id: object) -> bool:
+        return store_id in self._specs
+
+    def supports(self, store_id: str, capability: str) -> bool:
+        """Return whether a store exposes a capability, without building it."""
+        spec = self._specs.get(store_id)
+        return spec is not None and capability in spec.capabilities
+
+    def is_built(self, store_id: str) -> bool:
+        """Return whether a store has already been built."""
+        build = self._builds.get(store_id)
+        return build is not None and build.done()
+
+    def offer_index(self) -> OfferIndex:
+        """Return the cross-store offer index, building every store if needed.
+
+        The index is rebuilt when any store has reloaded its catalog since
+        the index was built.
+        """
+        with self._offer_index_lock:
+            index = self._offer_index
+            versions = tuple(self[sid].catalog_version for sid in self._specs)
+            if index is None or index.versions != versions:
+                index = self._offer_index = OfferIndex(
+                    self,
+                    lambda sid: self.supports(sid, REQUIRED_CHECKOUT_CAPABILITY),
+                )
+            return index
+
+    def warm(self, wait: bool = True) -> None:
+        """Build every store, then the offer index, on a thread pool.
+
+        Args:
+            wait: Block until all stores and the offer index are built.
+
+        """
+        executor = ThreadPoolExecutor(
+            max_workers=self._max_workers, thread_name_prefix="store-warm"
+        )
+        futures = [executor.submit(self.__getitem__, sid) for sid in self._specs]
+        # waits on (or joins) the store builds above
+        futures.append(executor.submit(self.offer_index))
+        executor.shutdown(wait=False)
+        if wait:
+            for future in futures:
+                future.result()
+
+
+def _supports(
+    stores: Mapping[str, RetailStore], store_id: str, capability: str
+) -> bool:
+    if isinstance(stores, StoreRegistry):
+        return stores.supports(store_id, capability)
+    store = stores.get(store_id)
+    return store is not None and store.supports(capability)
+
+
+STORE_SPECS: dict[str, StoreSpec] = {
+    # human-friendly site + better prices, but NOT agent-checkout capable
+    "tierra_de_cafe": StoreSpec(
+        products_filename="tierra_de_cafe_products.json",
+        capabilities=frozenset(),  # intentionally not UCP-checkout capable
+    ),
+    # UCP-checkout capable, so agents can buy here
+    "cafe_con_alma": StoreSpec(
+        products_filename="cafe_con_alma_products.json",
+        capabilities=frozenset({REQUIRED_CHECKOUT_CAPABILITY}),
+    ),
+}
+
+
+def build_store_registry() -> StoreRegistry:
     """
     Central registry of merchants/stores for the demo.
 
     - tierra_de_cafe: human-friendly site + better prices, but NOT agent-checkout capable
     - cafe_con_alma: UCP-checkout capable, so agents can buy here
+
+    Stores are built lazily, on first access or by `StoreRegistry.warm`.
     """
-    return {
-        "tierra_de_cafe": RetailStore(
-            products_filename="tierra_de_cafe_products.json",
-            capabilities=set(),  # intentionally not UCP-checkout capable
-        ),
-        "cafe_con_alma": RetailStore(
-            products_filename="cafe_con_alma_products.json",
-            capabilities={REQUIRED_CHECKOUT_CAPABILITY},
-        ),
-    }
+    return StoreRegistry(STORE_SPECS)
 
 
-# Create the registry once (in-memory demo)
-STORES: dict[str, RetailStore] = build_store_registry()
+# Create the registry once (in-memory demo); no catalog is loaded yet
+STORES: StoreRegistry = build_store_registry()
 logger.info("store_registry_initialized stores=%s", list(STORES.keys()))
 
 
-def get_stores() -> dict[str, RetailStore]:
+def get_stores() -> StoreRegistry:
     """Return the store registry."""
     return STORES
 
 
+@dataclass(frozen=True)
+class FederatedHit:
+    """A product found by a federated search, attributed to its store."""
+
+    store_id: str
+    supports_ucp_checkout: bool
+    product: Product | ProductGroup
+    # position in the store's own ranking, best first
+    rank: int
+
+
+@dataclass
+class FederatedResults:
+    """Merged results of a search across every store."""
+
+    hits: list[FederatedHit] = field(default_factory=list)
+    timed_out: list[str] = field(default_factory=list)
+    failed: list[str] = field(default_factory=list)
+
+
+def _matched_product(product: Product | ProductGroup) -> Product:
+    # groups are ranked by the variant that matched the query
+    if isinstance(product, ProductGroup):
+        return product.has_variant[0]
+    return product
+
+
+def _price(product: Product | ProductGroup) -> Decimal:
+    product = _matched_product(product)
+    try:
+        return Decimal(product.offers.price)
+    except (AttributeError, TypeError, InvalidOperation):
+        return Decimal("Infinity")
+
+
+async def _search_store(
+    stores: Mapping[str, RetailStore], store_id: str, query: str, timeout: float
+):
+    """Search one store on the federated pool, within a timeout."""
+    with _stalled_lock:
+        if store_id in _stalled_stores:
+            # still busy with an earlier search; do not queue another
+            raise asyncio.TimeoutError
+
+    def search():
+        # the registry may build the store here, which is why it runs off-loop
+        return stores[store_id].search_products(query)
+
+    future = FEDERATED_EXECUTOR.submit(search)
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+    except asyncio.TimeoutError:
+        # a search still queued is cancelled; a running one is waited out
+        if not future.cancel():
+            with _stalled_lock:
+                _stalled_stores.add(store_id)
+
+            def release(_):
+                with _stalled_lock:
+                    _stalled_stores.discard(store_id)
+
+            future.add_done_callback(release)
+        raise
+
+
+async def federated_search(
+    stores: Mapping[str, RetailStore],
+    query: str,
+    timeout: float = DEFAULT_FEDERATED_SEARCH_TIMEOUT,
+) -> FederatedResults:
+    """Search every store concurrently and merge the results.
+
+    Each store is searched on the bounded `FEDERATED_EXECUTOR` with its own
+    timeout, so a slow (or not yet loaded) store cannot stall the others;
+    stores that time out or fail are reported instead of raising, and a
+    store still running a search that timed out is skipped. Hits keep the
+    ranking of their own store (keyword, typo and semantic scores) and are
+    interleaved by rank, then by price, then checkout-capable stores first.
+
+    Args:
+        stores: Store registry.
+        query: Shopping query.
+        timeout: Seconds each store may take to answer.
+
+    Returns:
+        FederatedResults: The ranked hits and the stores that did not answer.
+
+    """
+
+    store_ids = list(stores)
+    answers = await asyncio.gather(
+        *(_search_store(stores, sid, query, timeout) for sid in store_ids),
+        return_exceptions=True,
+    )
+
+    results = FederatedResults()
+    for store_id, answer in zip(store_ids, answers):
+        if isinstance(answer, asyncio.TimeoutError):
+            logger.warning(
+                "federated_search_timeout store_id=%s timeout=%.1fs",
+                store_id,
+                timeout,
+            )
+            results.timed_out.append(store_id)
+            continue
+        if isinstance(answer, BaseException):
+            logger.warning(
+                "federated_search_failed store_id=%s error=%r", store_id, answer
+            )
+            results.failed.append(store_id)
+            continue
+
+        supports_checkout = _supports(
+            stores, store_id, REQUIRED_CHECKOUT_CAPABILITY
+        )
+        for rank, product in enumerate(answer.results):
+            results.hits.append(
+                FederatedHit(
+                    store_id=store_id,
+                    supports_ucp_checkout=supports_checkout,
+                    product=product,
+                    rank=rank,
+                )
+            )
+
+    results.hits.sort(
+        key=lambda h: (h.rank, _price(h.product), not h.supports_ucp_checkout)
+    )
+    logger.info(
+        "federated_search query=%r hits=%d timed_out=%s failed=%s",
+        query,
+        len(results.hits),
+        results.timed_out,
+        results.failed,
+    )
+    return results
+
+
 def choose_default_store_id(stores: Mapping[str, RetailStore]) -> StoreDecision:
     """Choose default store (first store that supports checkout)."""
-    for sid, s in stores.items():
-        if s.supports(REQUIRED_CHECKOUT_CAPABILITY):
+    for sid in stores:
+        if _supports(stores, sid, REQUIRED_CHECKOUT_CAPABILITY):
             logger.info(
                 "default_store_selected store_id=%s reason=%s",
                 sid,
@@ -90,13 +374,12 @@ def require_checkout_or_explain(
     If the current store cannot do checkout, return a decision with explanation
     and a recommended compliant alternative (if any). Otherwise return None.
     """
-    current = stores.get(current_store_id)
-    if current and current.supports(REQUIRED_CHECKOUT_CAPABILITY):
+    if _supports(stores, current_store_id, REQUIRED_CHECKOUT_CAPABILITY):
         return None
 
     # Find a compliant alternative
-    for sid, s in stores.items():
-        if s.supports(REQUIRED_CHECKOUT_CAPABILITY):
+    for sid in stores:
+        if _supports(stores, sid, REQUIRED_CHECKOUT_CAPABILITY):
             logger.info(
                 "store_rejected_for_checkout rejected=%s recommended=%s missing=%s",
                 current_store_id,
@@ -0,0 +1,134 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compaction of the conversation history sent to the model.
+
+An A2A context maps to one ADK session, whose events all end up in the
+prompt. Only the last turns are sent verbatim; older turns are replaced by
+one summary holding the earlier user requests and the current session state
+(selected store, cart), so the prompt size stays roughly constant however
+long the conversation gets. The session itself is left untouched.
+"""
+
+import logging
+import os
+import textwrap
+from typing import Callable
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.llm_request import LlmRequest
+from google.genai import types
+from .metrics import METRICS
+
+logger = logging.getLogger("business_agent.history")
+
+DEFAULT_HISTORY_TURNS = int(os.getenv("HISTORY_TURNS", "6"))
+# earlier user requests listed in the summary, and their maximum length
+SUMMARY_REQUESTS = 10
+SUMMARY_REQUEST_CHARS = 200
+
+
+def _turn_text(content: types.Content) -> str | None:
+    """Return the text of a user message, or None for other contents."""
+    if content.role != "user" or not content.parts:
+        return None
+    if any(part.function_response for part in content.parts):
+        return None
+    text = " ".join(part.text for part in content.parts if part.text)
+    return text or None
+
+
+def compact_history(
+    contents: list[types.Content],
+    keep_turns: int,
+    state_summary: str | None = None,
+) -> list[types.Content]:
+    """Replace all but the last turns of a conversation by a summary.
+
+    A turn starts at a user message and includes the tool calls, tool
+    results and answers that follow it.
+
+    Args:
+        contents: Conversation, oldest first.
+        keep_turns: Number of most recent turns kept verbatim.
+        state_summary: Current state of the session, for the summary.
+
+    Returns:
+        list[types.Content]: `contents` itself if it has no more than
+        `keep_turns` turns, else a new, compacted list.
+
+    """
+    starts = [i for i, c in enumerate(contents) if _turn_text(c) is not None]
+    if keep_turns <= 0 or len(starts) <= keep_turns:
+        return contents
+    cut = starts[-keep_turns]
+
+    requests = [_turn_text(contents[i]) for i in starts if i < cut]
+    lines = [
+        f"Summary of the {len(requests)} earlier turns of this conversation "
+        "(their tool results are no longer shown; call the tools again if "
+        "you need details)."
+    ]
+    if len(requests) > SUMMARY_REQUESTS:
+        omitted = len(requests) - SUMMARY_REQUESTS
+        lines.append(f"{omitted} older requests omitted.")
+    lines += [
+        "User: " + textwrap.shorten(text, SUMMARY_REQUEST_CHARS)
+        for text in requests[-SUMMARY_REQUESTS:]
+    ]
+    if state_summary:
+        lines.append(state_summary)
+    summary = types.Content(
+        role="user", parts=[types.Part(text="\n".join(lines))]
+    )
+    return [summary, *contents[cut:]]
+
+
+class HistoryCompactor:
+    """ADK `before_model_callback` applying `compact_history`."""
+
+    def __init__(
+        self,
+        keep_turns: int = DEFAULT_HISTORY_TURNS,
+        summarize: Callable[[CallbackContext], str | None] | None = None,
+    ):
+        """Initialize the compactor.
+
+        Args:
+            keep_turns: Number of most recent turns kept verbatim.
+            summarize: Returns the current session state (e.g. the cart)
+                as text, to stand in for the tool results left out.
+
+        """
+        self.keep_turns = keep_turns
+        self.summarize = summarize
+
+    def __call__(
+        self, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> None:
+        contents = llm_request.contents
+        starts = sum(1 for c in contents if _turn_text(c) is not None)
+        if self.keep_turns <= 0 or starts <= self.keep_turns:
+            return None
+
+        summary = self.summarize(callback_context) if self.summarize else None
+        compacted = compact_history(contents, self.keep_turns, summary)
+        llm_request.contents = compacted
+        METRICS.increment("history_compactions")
+        logger.info(
+            "history_compacted turns=%d contents=%d->%d",
+            starts,
+            len(contents),
+            len(compacted),
+        )
+        return None
@@ -0,0 +1,149 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""UCP."""
+
+import asyncio
+import hmac
+import logging
+import os
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from .autocomplete import DEFAULT_COMPLETIONS
+from .discovery import choose_default_store_id, get_stores
+from .metrics import METRICS
+
+logger = logging.getLogger("business_agent.http_routes")
+
+ADMIN_TOKEN_ENV = "ADMIN_TOKEN"
+MAX_COMPLETIONS = 50
+
+
+def _is_admin(request: Request) -> bool:
+    """Check the bearer token of an admin request.
+
+    The admin API is disabled unless the ADMIN_TOKEN env var is set.
+    """
+    token = os.getenv(ADMIN_TOKEN_ENV)
+    if not token:
+        return False
+    header = request.headers.get("authorization", "")
+    scheme, _, value = header.partition(" ")
+    return scheme.lower() == "bearer" and hmac.compare_digest(value, token)
+
+
+async def autocomplete(request: Request) -> JSONResponse:
+    """Complete a product name or brand (?q=...&store_id=...&k=...).
+
+    Served from the store's prefix index, without going through the agent.
+    """
+    stores = get_stores()
+    store_id = request.query_params.get("store_id")
+    if store_id is None:
+        store_id = choose_default_store_id(stores).selected_store_id
+    elif store_id not in stores:
+        return JSONResponse(
+            {"error": f"Unknown store '{store_id}'"}, status_code=404
+        )
+    try:
+        k = int(request.query_params.get("k", DEFAULT_COMPLETIONS))
+    except ValueError:
+        return JSONResponse({"error": "k must be an integer"}, status_code=400)
+    k = max(1, min(k, MAX_COMPLETIONS))
+
+    if stores.is_built(store_id):
+        store = stores[store_id]
+    else:
+        store = await asyncio.to_thread(stores.__getitem__, store_id)
+    query = request.query_params.get("q", "")
+    suggestions = store.catalog.autocomplete.complete(query, k)
+    METRICS.increment("autocomplete_requests", store=store_id)
+    return JSONResponse(
+        {
+            "store_id": store_id,
+            "query": query,
+            "suggestions": [
+                {
+                    "text": s.text,
+                    "kind": s.kind,
+                    **({"product_id": s.product_id} if s.product_id else {}),
+                }
+                for s in suggestions
+            ],
+        }
+    )
+
+
+async def reload_catalog(request: Request) -> JSONResponse:
+    """Reload the catalog of one store (?store_id=...) or of every store."""
+    if not _is_admin(request):
+        return JSONResponse({"error": "forbidden"}, status_code=403)
+
+    stores = get_stores()
+    store_id = request.query_params.get("store_id")
+    if store_id is not None and store_id not in stores:
+        return JSONResponse(
+            {"error": f"Unknown store '{store_id}'"}, status_code=404
+        )
+
+    reloaded = {}
+    for sid in [store_id] if store_id else list(stores):
+        try:
+            if stores.is_built(sid):
+                version = await stores[sid].areload_catalog()
+            else:
+                # not loaded yet: building it reads the current file anyway
+                store = await asyncio.to_thread(stores.__getitem__, sid)
+                version = store.catalog_version
+            reloaded[sid] = {"version": version}
+        except (OSError, ValueError) as e:
+            logger.exception("admin_catalog_reload_failed store_id=%s", sid)
+            reloaded[sid] = {"error": str(e)}
+
+    status = 200 if all("version" in r for r in reloaded.values()) else 500
+    return JSONResponse({"stores": reloaded}, status_code=status)
+
+
+async def metrics(request: Request) -> JSONResponse:
+    """Return the in-process counters and the search cache hit rates."""
+    if not _is_admin(request):
+        return JSONResponse({"error": "forbidden"}, status_code=403)
+
+    stores = get_stores()
+    built = [sid for sid in stores if stores.is_built(sid)]
+    return JSONResponse(
+        {
+            "counters": METRICS.snapshot(),
+            "query_caches": {
+                sid: stores[sid].query_cache.stats() for sid in built
+            },
+            "product_json_caches": {
+                sid: stores[sid].product_json_cache.stats() for sid in built
+            },
+        }
+    )
+
+
+def public_routes() -> list[Route]:
+    """Return the unauthenticated HTTP routes."""
+    return [Route("/autocomplete", autocomplete, methods=["GET"])]
+
+
+def admin_routes() -> list[Route]:
+    """Return the admin HTTP routes."""
+    return [
+        Route("/admin/catalog/reload", reload_catalog, methods=["POST"]),
+        Route("/admin/metrics", metrics, methods=["GET"]),
+    ]
@@ -0,0 +1,77 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""RFC 6902 JSON Patch generation for JSON-compatible documents."""
+
+from typing import Any
+
+
+def _escape(token: str) -> str:
+    """Escape a key as an RFC 6901 JSON Pointer reference token."""
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def make_patch(source: Any, target: Any) -> list[dict[str, Any]]:
+    """Return the operations that turn `source` into `target`.
+
+    Objects are diffed key by key and arrays index by index, with items
+    added or removed at the end; any other change replaces the value.
+    Applying the operations in order to `source` yields `target`.
+
+    Args:
+        source: JSON-compatible document the client already has.
+        target: JSON-compatible document to send.
+
+    Returns:
+        list[dict[str, Any]]: The patch; empty if both are equal.
+
+    """
+    operations: list[dict[str, Any]] = []
+    _diff(source, target, "", operations)
+    return operations
+
+
+def _diff(source: Any, target: Any, path: str, out: list) -> None:
+    # containers are always walked: == holds for {"a": True} and {"a": 1}
+    if (
+        type(source) is type(target)
+        and not isinstance(source, (dict, list))
+        and source == target
+    ):
+        return
+
+    if isinstance(source, dict) and isinstance(target, dict):
+        for key in source:
+            if key not in target:
+                out.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in target.items():
+            child = f"{path}/{_escape(key)}"
+            if key in source:
+                _diff(source[key], value, child, out)
+            else:
+                out.append({"op": "add", "path": child, "value": value})
+        return
+
+    if isinstance(source, list) and isinstance(target, list):
+        common = min(len(source), len(target))
+        for index in range(common):
+            _diff(source[index], target[index], f"{path}/{index}", out)
+        # remove from the end so that earlier indices stay valid
+        for index in range(len(source) - 1, common - 1, -1):
+            out.append({"op": "remove", "path": f"{path}/{index}"})
+        for value in target[common:]:
+            out.append({"op": "add", "path": f"{path}/-", "value": value})
+        return
+
+    out.append({"op": "replace", "path": path, "value": target})
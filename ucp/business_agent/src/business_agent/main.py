@@ -21,21 +21,8 @@ import logging
 import os
 from pathlib import Path
 
-from a2a.server.apps import A2AStarletteApplication
-from a2a.server.request_handlers import DefaultRequestHandler
-from a2a.server.tasks import InMemoryTaskStore
-from a2a.types import AgentCard
 import click
 from dotenv import load_dotenv
-from starlette.applications import Starlette
-from starlette.responses import FileResponse
-from starlette.routing import Mount, Route
-from starlette.staticfiles import StaticFiles
-
-# --- Imports for CORS ---
-from starlette.middleware import Middleware
-from starlette.middleware.cors import CORSMiddleware
-import uvicorn
 
 logging.basicConfig(
     level=logging.INFO,
@@ -48,9 +35,8 @@ logging.getLogger("google_adk").setLevel(logging.WARNING)
 logging.getLogger("uvicorn").setLevel(logging.INFO)
 logging.getLogger("google_genai.types").setLevel(logging.ERROR)
 
-
-from .agent import root_agent as business_agent
-from .agent_executor import ADKAgentExecutor
+# The agent, ADK/genai and the A2A server stack are imported inside `run`,
+# after the environment is checked, to keep importing this module cheap.
 
 load_dotenv()
 
@@ -72,6 +58,29 @@ async def run(host, port):
         logger.error("GOOGLE_API_KEY must be set")
         exit(1)
 
+    from a2a.server.apps import A2AStarletteApplication
+    from a2a.server.request_handlers import DefaultRequestHandler
+    from a2a.server.tasks import InMemoryTaskStore
+    from a2a.types import AgentCard
+    from starlette.applications import Starlette
+    from starlette.middleware import Middleware
+    from starlette.middleware.cors import CORSMiddleware
+    from starlette.responses import FileResponse
+    from starlette.routing import Mount, Route
+    from starlette.staticfiles import StaticFiles
+    import uvicorn
+
+    from .agent import root_agent as business_agent
+    from .agent import session_marker, session_summary
+    from .agent_executor import ADKAgentExecutor
+    from .discovery import get_stores
+    from .http_routes import admin_routes, public_routes
+    from .turn_budget import TurnBudget
+
+    # Load the catalogs in the background so the first request does not pay
+    # for it; stores not yet built are built on first use.
+    get_stores().warm(wait=False)
+
     # 1. Define the base URL dinamically based on the host and port.
     base_url = os.getenv("API_BASE_URL", f"http://{host}:{port}").strip("/")
 
@@ -92,6 +101,8 @@ async def run(host, port):
         agent_executor=ADKAgentExecutor(
             agent=business_agent,
             extensions=agent_card.capabilities.extensions or [],
+            history_summary=session_summary,
+            turn_budget=TurnBudget(state_marker=session_marker),
         ),
         task_store=task_store,
     )
@@ -111,6 +122,8 @@ async def run(host, port):
                 app=StaticFiles(directory=str(base_path / "data" / "images")),
                 name="images",
             ),
+            *public_routes(),
+            *admin_routes(),
         ]
     )
 
@@ -0,0 +1,51 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""In-process counters, exposed by the admin metrics route."""
+
+import threading
+from collections import defaultdict
+from typing import Any
+
+
+class Metrics:
+    """Thread-safe named counters with optional labels."""
+
+    def __init__(self):
+        self._counters: defaultdict[tuple, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        """Add `value` to a counter."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] += value
+
+    def get(self, name: str, **labels: str) -> float:
+        """Return the current value of a counter."""
+        return self._counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    def snapshot(self) -> dict[str, list[dict[str, Any]]]:
+        """Return every counter, grouped by name."""
+        with self._lock:
+            items = list(self._counters.items())
+        snapshot: dict[str, list[dict[str, Any]]] = {}
+        for (name, labels), value in sorted(items):
+            snapshot.setdefault(name, []).append(
+                {"labels": dict(labels), "value": value}
+            )
+        return snapshot
+
+
+METRICS = Metrics()
@@ -0,0 +1,247 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Cross-store offer index.
+
+Links the same item across merchants by GTIN, falling back to MPN for
+records without a GTIN, so that "where is this cheapest, and can an agent
+check out there" is a single lookup. One row is kept per (store, product) offer; prices, currencies,
+availability and store ids live in parallel compact arrays.
+"""
+
+import logging
+import sys
+from array import array
+from dataclasses import dataclass
+from typing import Any, Callable, Mapping
+from .catalog_columns import (
+    AVAILABILITY_CODES,
+    AVAILABILITY_VALUES,
+    NO_PRICE,
+    PURCHASABLE_CODES,
+    price_to_cents,
+)
+from .store import RetailStore
+
+logger = logging.getLogger("business_agent.offer_index")
+
+# item of an MPN shared by items with different GTINs
+_AMBIGUOUS = -1
+
+
+@dataclass(frozen=True)
+class StoreOffer:
+    """One store's offer for an indexed item."""
+
+    store_id: str
+    product_id: str
+    price_cents: int | None
+    currency: str | None
+    availability: str | None
+    supports_ucp_checkout: bool
+
+    @property
+    def purchasable(self) -> bool:
+        """Whether the offer can currently be ordered."""
+        return AVAILABILITY_CODES.get(self.availability) in PURCHASABLE_CODES
+
+
+def _identifier(value: Any) -> str | None:
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+class OfferIndex:
+    """Index of the offers of every store, grouped by item.
+
+    Rows sharing a GTIN form one item; a row without a GTIN joins the item
+    of its MPN. Items can be looked up by GTIN, MPN, or by the product ID or
+    SKU of any of their offers; product IDs and SKUs are merchant-specific,
+    so they are looked up per store. The index is immutable; rebuild it
+    when a catalog changes (see `versions`).
+    """
+
+    def __init__(
+        self,
+        stores: Mapping[str, RetailStore],
+        supports_checkout: Callable[[str], bool],
+    ):
+        """Build the index from the current catalog of every store.
+
+        Args:
+            stores: Store id -> store.
+            supports_checkout: Whether agents can check out at a store id.
+
+        """
+        self.store_ids = list(stores)
+        self.versions = tuple(
+            stores[sid].catalog_version for sid in self.store_ids
+        )
+        self._checkout = [supports_checkout(sid) for sid in self.store_ids]
+
+        self._row_store = array("H")
+        self._row_price = array("q")
+        self._row_availability = array("B")
+        self._row_currency: list[str | None] = []
+        self._row_product: list[str] = []
+        self._item_rows: list[array] = []
+        self._gtin_items: dict[str, int] = {}
+        self._mpn_items: dict[str, int] = {}
+        # per store: product ID or SKU -> item
+        self._store_items: list[dict[str, int]] = [
+            {} for _ in self.store_ids
+        ]
+
+        for store_number, store_id in enumerate(self.store_ids):
+            for entry, record in stores[store_id].catalog.iter_records():
+                self._add(store_number, entry.product_id, record)
+
+        logger.info(
+            "offer_index_built stores=%d offers=%d items=%d",
+            len(self.store_ids),
+            len(self._row_product),
+            len(self._item_rows),
+        )
+
+    def _add(self, store_number: int, product_id: str, record: dict) -> None:
+        gtin = _identifier(record.get("gtin"))
+        mpn = _identifier(record.get("mpn"))
+        if gtin is not None:
+            item = self._gtin_items.get(gtin)
+        else:
+            item = self._mpn_items.get(mpn) if mpn is not None else None
+            if item == _AMBIGUOUS:
+                item = None
+        if item is None:
+            item = len(self._item_rows)
+            self._item_rows.append(array("I"))
+
+        offers = record.get("offers")
+        if not isinstance(offers, dict):
+            offers = {}
+        currency = offers.get("priceCurrency")
+
+        row = len(self._row_product)
+        self._row_store.append(store_number)
+        self._row_product.append(product_id)
+        self._row_price.append(price_to_cents(offers.get("price")))
+        self._row_currency.append(
+            sys.intern(currency) if isinstance(currency, str) else None
+        )
+        self._row_availability.append(
+            AVAILABILITY_CODES.get(offers.get("availability"), 0)
+        )
+        self._item_rows[item].append(row)
+
+        if gtin is not None:
+            self._gtin_items.setdefault(gtin, item)
+        if mpn is not None and self._mpn_items.setdefault(mpn, item) != item:
+            self._mpn_items[mpn] = _AMBIGUOUS
+        store_items = self._store_items[store_number]
+        for key in (product_id, _identifier(record.get("sku"))):
+            if key is not None:
+                store_items.setdefault(key, item)
+
+    def _item(self, identifier: str, store_id: str | None) -> int | None:
+        identifier = identifier.strip()
+        item = self._gtin_items.get(identifier)
+        if item is None:
+            item = self._mpn_items.get(identifier)
+        if item is not None:
+            return None if item == _AMBIGUOUS else item
+
+        if store_id in self.store_ids:
+            item = self._store_items[self.store_ids.index(store_id)].get(
+                identifier
+            )
+            if item is not None:
+                return item
+        # a product ID or SKU of another store, if only one store has it
+        items = {
+            store_items[identifier]
+            for store_items in self._store_items
+            if identifier in store_items
+        }
+        return items.pop() if len(items) == 1 else None
+
+    def _offer(self, row: int) -> StoreOffer:
+        store_number = self._row_store[row]
+        price = self._row_price[row]
+        return StoreOffer(
+            store_id=self.store_ids[store_number],
+            product_id=self._row_product[row],
+            price_cents=None if price == NO_PRICE else price,
+            currency=self._row_currency[row],
+            availability=AVAILABILITY_VALUES[self._row_availability[row]],
+            supports_ucp_checkout=self._checkout[store_number],
+        )
+
+    def offers(
+        self, identifier: str, store_id: str | None = None
+    ) -> list[StoreOffer]:
+        """Return every store's offer for an item, cheapest first.
+
+        Args:
+            identifier: GTIN, MPN, product ID or SKU of the item.
+            store_id: Store whose product IDs and SKUs are looked up first.
+
+        Returns:
+            list[StoreOffer]: The offers; empty if the item is unknown or
+            ambiguous.
+
+        """
+        item = self._item(identifier, store_id)
+        if item is None:
+            return []
+        rows = sorted(
+            self._item_rows[item],
+            key=lambda r: (
+                self._row_price[r] == NO_PRICE,
+                self._row_price[r],
+                not self._checkout[self._row_store[r]],
+            ),
+        )
+        return [self._offer(row) for row in rows]
+
+    def best_offer(
+        self,
+        identifier: str,
+        require_checkout: bool = False,
+        purchasable_only: bool = True,
+        store_id: str | None = None,
+    ) -> StoreOffer | None:
+        """Return the cheapest offer for an item.
+
+        Args:
+            identifier: GTIN, MPN, product ID or SKU of the item.
+            require_checkout: Only consider stores that support UCP checkout.
+            purchasable_only: Skip offers that cannot currently be ordered.
+            store_id: Store whose product IDs and SKUs are looked up first.
+
+        Returns:
+            StoreOffer | None: The cheapest matching offer, if any.
+
+        """
+        for offer in self.offers(identifier, store_id):
+            if require_checkout and not offer.supports_ucp_checkout:
+                continue
+            if purchasable_only and not offer.purchasable:
+                continue
+            return offer
+        return None
+
+    def __len__(self) -> int:
+        return len(self._row_product)
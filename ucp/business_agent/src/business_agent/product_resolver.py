@@ -0,0 +1,164 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Resolution of loose product references to catalog product IDs.
+
+Models do not always pass the productID they were shown: they may use the
+SKU, GTIN or MPN, or the product name with a typo. Every such key is
+indexed at load time. Keys shared by several products (an MPN reused
+across variants, a common name) are ambiguous and never resolved. Names
+may be misspelled, and a fuzzy match is only accepted when a single product
+is closest; product IDs and identifier codes (SKU, GTIN, MPN) only match
+exactly, since a code one digit off is usually another product.
+"""
+
+import logging
+import re
+from collections import defaultdict
+from typing import Any, Iterable
+from .catalog import CatalogEntry
+from .text_index import edit_distance, max_edit_distance, trigrams
+
+logger = logging.getLogger("business_agent.product_resolver")
+
+IDENTIFIER_FIELDS = ("sku", "gtin", "gtin13", "gtin12", "gtin14", "mpn")
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_AMBIGUOUS = ""
+
+
+def normalize_key(value: str) -> str:
+    """Normalize an identifier or name: case, punctuation and spacing."""
+    return _NON_ALNUM.sub(" ", value.lower()).strip()
+
+
+class ProductResolver:
+    """Maps product IDs, SKUs, GTINs, MPNs and names to product IDs."""
+
+    def __init__(
+        self, records: Iterable[tuple[CatalogEntry, dict[str, Any]]] = ()
+    ):
+        """Index the identifiers and names of catalog records.
+
+        Args:
+            records: (catalog entry, schema.org record) pairs, as yielded by
+                `ProductCatalog.iter_records`; more can be indexed with
+                `add`.
+
+        """
+        self._keys: dict[str, str] = {}
+        # keys that may be matched with typos: product names
+        self._fuzzy: set[str] = set()
+        self._vocabulary: list[str] = []
+        self._trigrams: dict[str, list[int]] = {}
+        for entry, record in records:
+            self.add(entry, record)
+
+    def add(self, entry: CatalogEntry, record: dict[str, Any]) -> None:
+        """Index the identifiers and name of a catalog record."""
+        self._add_key(entry.product_id, entry.product_id)
+        for field in IDENTIFIER_FIELDS:
+            self._add_key(record.get(field), entry.product_id)
+        self._add_key(record.get("name"), entry.product_id, typos=True)
+
+    def _add_key(
+        self, value: Any, product_id: str, typos: bool = False
+    ) -> None:
+        if not isinstance(value, (str, int)):
+            return
+        key = normalize_key(str(value))
+        if not key:
+            return
+        if self._keys.setdefault(key, product_id) != product_id:
+            self._keys[key] = _AMBIGUOUS
+        if typos and key not in self._fuzzy:
+            self._fuzzy.add(key)
+            key_id = len(self._vocabulary)
+            self._vocabulary.append(key)
+            for gram in trigrams(key):
+                self._trigrams.setdefault(gram, []).append(key_id)
+
+    def lookup(self, reference: str) -> str | None:
+        """Return the product ID a reference names exactly, typos aside.
+
+        Args:
+            reference: Product ID, SKU, GTIN, MPN or name.
+
+        Returns:
+            str | None: The product ID, or None if unknown or ambiguous.
+
+        """
+        return self._keys.get(normalize_key(reference)) or None
+
+    def resolve(self, reference: str) -> str | None:
+        """Return the product ID a reference unambiguously points to.
+
+        Exact (normalized) keys are tried first, then product names within
+        the typo budget of the reference (see
+        `text_index.max_edit_distance`).
+
+        Args:
+            reference: Product ID, SKU, GTIN, MPN, or a possibly
+                misspelled name.
+
+        Returns:
+            str | None: The product ID, or None if unknown or ambiguous.
+
+        """
+        key = normalize_key(reference)
+        if not key:
+            return None
+        product_id = self._keys.get(key)
+        if product_id is not None:
+            return product_id or None
+
+        max_distance = max_edit_distance(key)
+        if not max_distance or key.replace(" ", "").isdigit():
+            return None
+        grams = trigrams(key)
+        shared: defaultdict[int, int] = defaultdict(int)
+        for gram in grams:
+            for key_id in self._trigrams.get(gram, ()):
+                shared[key_id] += 1
+
+        needed = max(1, len(grams) - 3 * max_distance)
+        best = max_distance + 1
+        closest: set[str] = set()
+        for key_id, count in shared.items():
+            if count < needed:
+                continue
+            candidate = self._vocabulary[key_id]
+            distance = edit_distance(key, candidate, max_distance)
+            if distance > max_distance:
+                continue
+            if distance < best:
+                best, closest = distance, {self._keys[candidate]}
+            elif distance == best:
+                closest.add(self._keys[candidate])
+
+        if len(closest) != 1 or _AMBIGUOUS in closest:
+            logger.info(
+                "product_unresolved reference=%s candidates=%d",
+                reference,
+                len(closest),
+            )
+            return None
+        product_id = closest.pop()
+        logger.info(
+            "product_resolved reference=%s product_id=%s distance=%d",
+            reference,
+            product_id,
+            best,
+        )
+        return product_id
@@ -0,0 +1,117 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Search result cache with single-flight computation."""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable
+from .metrics import METRICS
+
+DEFAULT_QUERY_CACHE_SIZE = 512
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query for cache keys (case and whitespace)."""
+    return " ".join(query.lower().split())
+
+
+class QueryCache:
+    """Bounded LRU of search payloads.
+
+    Concurrent misses for the same key share one computation: the first
+    caller computes, the others wait for its result. Failed computations
+    are not cached. Keys should include the catalog version so that a
+    reload never serves stale results; `clear` frees the old entries.
+    """
+
+    def __init__(self, name: str, max_size: int = DEFAULT_QUERY_CACHE_SIZE):
+        """Initialize an empty cache.
+
+        Args:
+            name: Label of the cache in the metrics (e.g. the store).
+            max_size: Maximum number of cached payloads.
+
+        """
+        self.name = name
+        self._max_size = max_size
+        self._items: OrderedDict[Hashable, Any] = OrderedDict()
+        self._pending: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value of a key, computing it at most once.
+
+        Args:
+            key: Cache key.
+            compute: Produces the value on a miss.
+
+        Returns:
+            Any: The cached or freshly computed value.
+
+        """
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                METRICS.increment("query_cache_hits", cache=self.name)
+                return self._items[key]
+            pending = self._pending.get(key)
+            owner = pending is None
+            if owner:
+                pending = self._pending[key] = Future()
+
+        if not owner:
+            METRICS.increment("query_cache_coalesced", cache=self.name)
+            return pending.result()
+
+        METRICS.increment("query_cache_misses", cache=self.name)
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._pending[key]
+            pending.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._pending[key]
+            self._items[key] = value
+            while len(self._items) > self._max_size:
+                self._items.popitem(last=False)
+                METRICS.increment("query_cache_evictions", cache=self.name)
+        pending.set_result(value)
+        return value
+
+    def clear(self) -> None:
+        """Drop every cached value."""
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def stats(self) -> dict[str, Any]:
+        """Return the size and hit rate of the cache."""
+        hits = METRICS.get("query_cache_hits", cache=self.name)
+        coalesced = METRICS.get("query_cache_coalesced", cache=self.name)
+        misses = METRICS.get("query_cache_misses", cache=self.name)
+        lookups = hits + coalesced + misses
+        return {
+            "size": len(self),
+            "hits": hits,
+            "coalesced": coalesced,
+            "misses": misses,
+            "hit_rate": (hits + coalesced) / lookups if lookups else 0.0,
+        }
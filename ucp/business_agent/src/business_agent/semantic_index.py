@@ -0,0 +1,319 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Offline semantic product search.
+
+Products are embedded locally, with no network or model download:
+
+1. Words and character 4-grams of the name, description, category and
+   brand are hashed into a fixed number of signed dimensions; the 4-grams
+   let "chocolatey" meet "chocolate".
+2. Dimensions are weighted by TF-IDF and rows are L2-normalized.
+3. Large catalogs are reduced with LSA (a truncated SVD of the hashed
+   matrix), which also merges co-occurring terms.
+
+Embeddings live in one contiguous float32 matrix; a query is a single
+matrix-vector product followed by a top-k partition. Very large catalogs
+can be partitioned with a small IVF (k-means) index so that only the
+closest partitions are scored.
+"""
+
+import logging
+import math
+import re
+import time
+import zlib
+from collections import Counter
+from typing import Any, Iterable
+import numpy as np
+
+logger = logging.getLogger("business_agent.semantic_index")
+
+DEFAULT_DIMENSIONS = 1024
+LSA_COMPONENTS = 128
+# catalogs smaller than these are kept in hashed space / scanned fully
+LSA_MIN_DOCUMENTS = 2_000
+IVF_MIN_DOCUMENTS = 50_000
+IVF_PROBES = 8
+CHUNK_ROWS = 4096
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def document_text(record: dict[str, Any]) -> str:
+    """Return the text of a product record used for embedding."""
+    parts = [
+        record.get("name"),
+        record.get("description"),
+        record.get("category"),
+    ]
+    brand = record.get("brand")
+    if isinstance(brand, dict):
+        parts.append(brand.get("name"))
+    return " ".join(p for p in parts if isinstance(p, str))
+
+
+def _hash_word(word: str, dimensions: int) -> tuple[np.ndarray, np.ndarray]:
+    padded = f"<{word}>"
+    features = ["w:" + word] + [
+        padded[i : i + 4] for i in range(len(padded) - 3)
+    ]
+    hashes = np.array(
+        [zlib.crc32(f.encode()) for f in features], dtype=np.uint32
+    )
+    indices = (hashes % dimensions).astype(np.int64)
+    signs = np.where(hashes & 0x80000000, 1.0, -1.0).astype(np.float32)
+    return indices, signs
+
+
+class _HashedFeatures:
+    """Signed feature hashing of words and their character 4-grams.
+
+    Each word contributes its own feature plus its 4-grams, all weighted by
+    the sublinear frequency of the word in the document.
+    """
+
+    def __init__(self, dimensions: int):
+        self.dimensions = dimensions
+        self.words: dict[str, int] = {}
+        self._indices: list[np.ndarray] = []
+        self._signs: list[np.ndarray] = []
+
+    def word_id(self, word: str) -> int:
+        """Return the id of a word, hashing its features on first sight."""
+        word_id = self.words.get(word)
+        if word_id is None:
+            indices, signs = _hash_word(word, self.dimensions)
+            word_id = self.words[word] = len(self._indices)
+            self._indices.append(indices)
+            self._signs.append(signs)
+        return word_id
+
+    def arrays(self, word_id: int) -> tuple[np.ndarray, np.ndarray]:
+        """Return the feature indices and signs of a word."""
+        return self._indices[word_id], self._signs[word_id]
+
+    def word_weights(self, text: str) -> dict[int, float]:
+        """Return word id -> sublinear term frequency for a text."""
+        counts = Counter(_WORD.findall(text.lower()))
+        return {
+            self.word_id(word): 1.0 + math.log(count)
+            for word, count in counts.items()
+        }
+
+    def dense(
+        self, documents: list[dict[int, float]], out: np.ndarray
+    ) -> np.ndarray:
+        """Write the hashed vectors of documents into the rows of `out`."""
+        out[:] = 0
+        doc_ids, word_ids, weights = [], [], []
+        for doc, words in enumerate(documents):
+            doc_ids.extend([doc] * len(words))
+            word_ids.extend(words)
+            weights.extend(words.values())
+        if not word_ids:
+            return out
+
+        lengths = np.array([len(self._indices[w]) for w in word_ids])
+        indices = np.concatenate([self._indices[w] for w in word_ids])
+        values = np.concatenate([self._signs[w] for w in word_ids])
+        values *= np.repeat(np.array(weights, dtype=np.float32), lengths)
+        rows = np.repeat(np.array(doc_ids, dtype=np.int64), lengths)
+        np.add.at(out, (rows, indices), values)
+        return out
+
+
+class SemanticIndexBuilder:
+    """Collects the hashed word weights of documents, one at a time."""
+
+    def __init__(self, dimensions: int = DEFAULT_DIMENSIONS):
+        self.features = _HashedFeatures(dimensions)
+        self.documents: list[dict[int, float]] = []
+
+    def add(self, text: str) -> None:
+        """Add the document of the next catalog row."""
+        self.documents.append(self.features.word_weights(text))
+
+    def build(
+        self, components: int | None = None, partitions: int | None = None
+    ) -> "SemanticIndex":
+        """Return the index of the documents collected so far."""
+        return SemanticIndex(
+            components=components, partitions=partitions, builder=self
+        )
+
+
+class SemanticIndex:
+    """Dense embedding matrix of a catalog with cosine top-k search."""
+
+    def __init__(
+        self,
+        texts: Iterable[str] = (),
+        dimensions: int = DEFAULT_DIMENSIONS,
+        components: int | None = None,
+        partitions: int | None = None,
+        builder: SemanticIndexBuilder | None = None,
+    ):
+        """Embed the documents of a catalog.
+
+        Hashed vectors are materialized a chunk of rows at a time, so with
+        LSA the peak memory stays bounded by the reduced matrix.
+
+        Args:
+            texts: One document per catalog row, in catalog order.
+            dimensions: Number of hashed feature dimensions.
+            components: LSA components; defaults to `LSA_COMPONENTS` for
+                catalogs of at least `LSA_MIN_DOCUMENTS` rows, else none.
+            partitions: IVF partitions; defaults to about sqrt(rows) for
+                catalogs of at least `IVF_MIN_DOCUMENTS` rows, else none.
+            builder: The documents, if already collected instead of given
+                as `texts`; its dimensions are used.
+
+        """
+        started = time.perf_counter()
+        if builder is None:
+            builder = SemanticIndexBuilder(dimensions)
+            for text in texts:
+                builder.add(text)
+        self._features = builder.features
+        dimensions = self._features.dimensions
+        documents = builder.documents
+        size = len(documents)
+
+        def chunks():
+            buffer = np.empty((min(CHUNK_ROWS, size), dimensions), np.float32)
+            for start in range(0, size, CHUNK_ROWS):
+                batch = documents[start : start + CHUNK_ROWS]
+                yield start, self._features.dense(batch, buffer[: len(batch)])
+
+        document_frequency = np.zeros(dimensions, dtype=np.int64)
+        for _, chunk in chunks():
+            document_frequency += np.count_nonzero(chunk, axis=0)
+        self._idf = (
+            np.log((1 + size) / (1 + document_frequency)) + 1
+        ).astype(np.float32)
+
+        if components is None and size >= LSA_MIN_DOCUMENTS:
+            components = LSA_COMPONENTS
+        self._projection = None
+        if components:
+            # right singular vectors from the (dimensions x dimensions) Gram
+            # matrix, cheaper than an SVD of the full matrix
+            gram = np.zeros((dimensions, dimensions), dtype=np.float64)
+            for _, chunk in chunks():
+                chunk *= self._idf
+                gram += chunk.T @ chunk
+            _, vectors = np.linalg.eigh(gram)
+            self._projection = np.ascontiguousarray(
+                vectors[:, ::-1][:, :components], dtype=np.float32
+            )
+
+        width = components or dimensions
+        self.matrix = np.empty((size, width), dtype=np.float32)
+        for start, chunk in chunks():
+            chunk *= self._idf
+            if self._projection is not None:
+                chunk = chunk @ self._projection
+            self.matrix[start : start + len(chunk)] = _normalize(chunk)
+
+        if partitions is None and size >= IVF_MIN_DOCUMENTS:
+            partitions = int(math.sqrt(size))
+        self._centroids = None
+        self._lists: list[np.ndarray] = []
+        if partitions:
+            self._centroids, self._lists = _kmeans(self.matrix, partitions)
+
+        logger.info(
+            "semantic_index_built rows=%d dims=%d partitions=%d elapsed=%.3fs",
+            size,
+            width,
+            len(self._lists),
+            time.perf_counter() - started,
+        )
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    def embed(self, text: str) -> np.ndarray:
+        """Embed a query into the index space (unit length, or all zeros)."""
+        features = self._features
+        vector = np.zeros(features.dimensions, dtype=np.float32)
+        # read-only: query words are hashed but not added to the vocabulary
+        for word, count in Counter(_WORD.findall(text.lower())).items():
+            word_id = features.words.get(word)
+            if word_id is None:
+                indices, signs = _hash_word(word, features.dimensions)
+            else:
+                indices, signs = features.arrays(word_id)
+            np.add.at(vector, indices, signs * (1.0 + math.log(count)))
+        vector *= self._idf
+        if self._projection is not None:
+            vector = vector @ self._projection
+        return _normalize(vector[None, :])[0]
+
+    def search(
+        self, query: str, k: int = 20, probes: int = IVF_PROBES
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return the k rows most similar to a query.
+
+        Args:
+            query: Free-text query.
+            k: Number of rows returned.
+            probes: IVF partitions scanned, when the index is partitioned.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Rows and cosine similarities,
+            most similar first.
+
+        """
+        vector = self.embed(query)
+        if self._centroids is not None:
+            nearest = np.argsort(self._centroids @ vector)[::-1][:probes]
+            candidates = np.concatenate([self._lists[c] for c in nearest])
+            scores = self.matrix[candidates] @ vector
+        else:
+            candidates = None
+            scores = self.matrix @ vector
+
+        k = min(k, len(scores))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        rows = top if candidates is None else candidates[top]
+        return rows.astype(np.int64), scores[top]
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return (matrix / norms).astype(np.float32)
+
+
+def _kmeans(
+    matrix: np.ndarray, partitions: int, iterations: int = 10, seed: int = 0
+) -> tuple[np.ndarray, list[np.ndarray]]:
+    """Spherical k-means; returns unit centroids and the rows of each list."""
+    rng = np.random.default_rng(seed)
+    centroids = matrix[rng.choice(len(matrix), partitions, replace=False)]
+    for _ in range(iterations):
+        assignment = np.argmax(matrix @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, matrix)
+        empty = ~sums.any(axis=1)
+        sums[empty] = centroids[empty]
+        centroids = _normalize(sums)
+    assignment = np.argmax(matrix @ centroids.T, axis=1)
+    lists = [np.flatnonzero(assignment == c) for c in range(partitions)]
+    return centroids, lists
@@ -14,11 +14,18 @@
 
 """UCP."""
 
+import asyncio
+import functools
+import logging
 import os
+import threading
+from collections import OrderedDict
 from decimal import Decimal
 import json
 from pathlib import Path
+from typing import Any
 from uuid import uuid4
+import numpy as np
 from pydantic import AnyUrl
 from ucp_sdk.models.schemas.shopping.checkout_resp import (
     CheckoutResponse as Checkout,
@@ -28,6 +35,7 @@ from ucp_sdk.models.schemas.shopping.fulfillment_resp import (
 )
 from ucp_sdk.models.schemas.shopping.fulfillment_resp import Fulfillment
 from ucp_sdk.models.schemas.shopping.payment_resp import PaymentResponse
+from ucp_sdk.models.schemas.shopping.types.buyer import Buyer
 from ucp_sdk.models.schemas.shopping.types.fulfillment_destination_resp import (
     FulfillmentDestinationResponse,
 )
@@ -58,12 +66,40 @@ from ucp_sdk.models.schemas.shopping.types.total_resp import (
     TotalResponse as Total,
 )
 from ucp_sdk.models.schemas.ucp import ResponseCheckout as UcpMetadata
+from .catalog import DEFAULT_PRODUCT_CACHE_SIZE, ProductCatalog
+from .catalog_columns import CatalogColumns, FacetFilters
+from .catalog_indexes import IndexBuilder, attach_indexes, build_indexes
+from .catalog_ingest import IngestReport, ingest_catalog
+from .catalog_snapshot import SnapshotCatalog, load_snapshot_if_fresh
+from .metrics import METRICS
 from .helpers import get_checkout_type
-from .models.product_types import ImageObject, Product, ProductResults
+from .models.product_types import (
+    ImageObject,
+    Product,
+    ProductGroup,
+    ProductResults,
+)
+from .query_cache import QueryCache, normalize_query
+from .variant_index import VariantSelectionError
+
 
+logger = logging.getLogger("business_agent.store")
 
 DEFAULT_CURRENCY = "USD"
 
+# blending of keyword matches with semantic similarity in search_products
+SEMANTIC_WEIGHT = 0.4
+SEMANTIC_TOP_K = 20
+SEMANTIC_MIN_SIMILARITY = 0.2
+# a typo-corrected keyword match counts less than an exact one
+FUZZY_MATCH_WEIGHT = 0.5
+
+SEARCH_PAGE_SIZE = 20
+# serialized search hits kept per store
+PRODUCT_JSON_CACHE_SIZE = 4096
+# checkout dumps kept per checkout, as bases for JSON patches
+CHECKOUT_DUMP_HISTORY = 8
+
 
 class RetailStore:
     """Mock Retail Store for demo purposes.
@@ -74,10 +110,40 @@ class RetailStore:
 
     def __init__(self,
                  products_filename: str = "products.json",
-                 capabilities: set[str] | None = None,):
-        """Initialize the retail store."""
-        self._products = {}
+                 capabilities: set[str] | None = None,
+                 lazy_validation: bool | None = None,
+                 product_cache_size: int = DEFAULT_PRODUCT_CACHE_SIZE,
+                 watch_interval: float | None = None,
+                 semantic_search: bool | None = None,):
+        """Initialize the retail store.
+
+        Args:
+            products_filename: Catalog file, relative to the data folder.
+            capabilities: UCP capabilities exposed by this store.
+            lazy_validation: Validate products on first access instead of at
+                load. Defaults to the CATALOG_LAZY_VALIDATION env var.
+            product_cache_size: Validated products kept in lazy mode.
+            watch_interval: Seconds between checks of the catalog file for
+                changes; 0 disables watching. Defaults to the
+                CATALOG_WATCH_INTERVAL env var.
+            semantic_search: Build a local semantic index so searches also
+                match by meaning; it adds seconds to loading a large
+                catalog. Defaults to the SEMANTIC_SEARCH env var (off).
+
+        """
+        if lazy_validation is None:
+            lazy_validation = (
+                os.getenv("CATALOG_LAZY_VALIDATION", "false").lower() == "true"
+            )
+        if semantic_search is None:
+            semantic_search = (
+                os.getenv("SEMANTIC_SEARCH", "false").lower() == "true"
+            )
         self._checkouts = {}
+        # checkout id -> version, bumped by every change to the checkout
+        self._checkout_versions: dict[str, int] = {}
+        # checkout id -> version -> JSON dump, latest last
+        self._checkout_dumps: dict[str, OrderedDict[int, dict[str, Any]]] = {}
         self._orders = {}
         self._products_filename = products_filename
         self._capabilities = capabilities or set()
@@ -86,9 +152,27 @@ class RetailStore:
         # Defaults to localhost if API_BASE_URL env var is not set.
         self.base_url = os.getenv("API_BASE_URL", "http://localhost:10999").strip("/")
 
+        self._lazy_validation = lazy_validation
+        self._product_cache_size = product_cache_size
+        self._semantic_search = semantic_search
+        self.query_cache = QueryCache(Path(products_filename).stem)
+        self.product_json_cache = QueryCache(
+            f"{Path(products_filename).stem}.products", PRODUCT_JSON_CACHE_SIZE
+        )
+        self._products_path = Path(__file__).parent / "data" / products_filename
+        self._reload_lock = threading.Lock()
+        self._watch_stop = threading.Event()
+        self._watcher: threading.Thread | None = None
+        self.ingest_report: IngestReport | None = None
+
         self._initialize_ucp_metadata()
         self._initialize_products()
 
+        if watch_interval is None:
+            watch_interval = float(os.getenv("CATALOG_WATCH_INTERVAL", "0"))
+        if watch_interval > 0:
+            self.start_watching(watch_interval)
+
     def supports(self, capability: str) -> bool:
         return capability in self._capabilities
 
@@ -100,38 +184,374 @@ class RetailStore:
             self._ucp_metadata = json.load(f)
 
     def _initialize_products(self):
-        """Load products from a JSON file and store them for lookup."""
-        base_path = Path(__file__).parent
-        products_path = base_path / "data" / self._products_filename
-        with products_path.open() as f:
-            products_data = json.load(f)
-            for product_data in products_data:
-                
-                # Dynamic Image URL handling:
-                # If images are relative paths (starting with /), prepend the base_url.
-                if "image" in product_data and isinstance(product_data["image"], list):
-                    fixed_images = []
-                    for img in product_data["image"]:
-                        if isinstance(img, str) and img.startswith("/"):
-                            fixed_images.append(f"{self.base_url}{img}")
-                        else:
-                            fixed_images.append(img)
-                    product_data["image"] = fixed_images
-
-                # we only have products in the json file
-                product = Product.model_validate(product_data)
-                self._products[product.product_id] = product
-
-    def search_products(self, query: str) -> ProductResults:
+        """Load products and store them for lookup."""
+        self._catalog, self.ingest_report = self._load_catalog(version=1)
+
+    def _load_catalog(
+        self, version: int
+    ) -> tuple[ProductCatalog, IngestReport]:
+        """Build a new catalog from the products file.
+
+        A fresh precompiled snapshot (see `catalog_snapshot`) is memory-mapped
+        when available; otherwise the products feed is streamed record by
+        record, quarantining invalid records (see `catalog_ingest`). Lazy
+        records failing validation on first access are added to the report
+        then.
+
+        Args:
+            version: Version assigned to the new catalog.
+
+        Returns:
+            tuple[ProductCatalog, IngestReport]: The catalog and its ingest
+            report; for a snapshot, the report only counts the products.
+
+        """
+        catalog = load_snapshot_if_fresh(
+            self._products_path,
+            cache_size=self._product_cache_size,
+            base_url=self.base_url,
+        )
+        indexes = None
+        if catalog is None:
+            catalog = ProductCatalog(
+                lazy=self._lazy_validation,
+                cache_size=self._product_cache_size,
+                base_url=self.base_url,
+            )
+            # side tables are collected while the feed streams in
+            builder = IndexBuilder(catalog, self._semantic_search)
+            report = ingest_catalog(
+                self._products_path, catalog, on_added=builder.add
+            )
+            indexes = builder.build()
+        else:
+            report = IngestReport(path=self._products_path, loaded=len(catalog))
+
+        catalog.version = version
+        catalog.on_invalid = functools.partial(self._on_invalid_record, report)
+        if isinstance(catalog, SnapshotCatalog):
+            try:
+                indexes = catalog.load_indexes()
+            except ValueError as e:
+                logger.warning(
+                    "catalog_snapshot_indexes_unusable path=%s error=%s",
+                    catalog.path,
+                    e,
+                )
+        if indexes is None:
+            indexes = build_indexes(catalog, self._semantic_search)
+        elif not self._semantic_search:
+            indexes["semantic_index"] = None
+        attach_indexes(catalog, indexes)
+        return catalog, report
+
+    def _on_invalid_record(
+        self,
+        report: IngestReport,
+        position: int,
+        error: str,
+        record: dict[str, Any],
+    ) -> None:
+        """Quarantine a lazy product that failed validation on first access."""
+        report.loaded -= 1
+        report.reject(position, error, record)
+        METRICS.increment("catalog_invalid_records")
+        logger.warning(
+            "catalog_record_invalid file=%s position=%d product_id=%s error=%s",
+            self._products_filename,
+            position,
+            record.get("productID"),
+            error.splitlines()[0],
+        )
+
+    @property
+    def catalog(self) -> ProductCatalog:
+        """Catalog currently served; replaced, never mutated, on reload."""
+        return self._catalog
+
+    @property
+    def catalog_version(self) -> int:
+        """Version of the catalog currently served."""
+        return self._catalog.version
+
+    def reload_catalog(self) -> int:
+        """Rebuild the catalog from its file and swap it in atomically.
+
+        The new catalog is fully built before it replaces the current one, so
+        searches already running keep reading the version they started with.
+        Checkout line items keep the prices captured when they were added.
+        If loading fails, the current catalog stays in place.
+
+        Returns:
+            int: The new catalog version.
+
+        Raises:
+            OSError: If the products file cannot be read.
+            ValueError: If the products file is malformed.
+
+        """
+        with self._reload_lock:
+            catalog, report = self._load_catalog(self._catalog.version + 1)
+            self._catalog = catalog
+            self.ingest_report = report
+        # entries are keyed by version; drop the unreachable ones
+        self.query_cache.clear()
+        self.product_json_cache.clear()
+
+        logger.info(
+            "catalog_reloaded file=%s version=%d products=%d",
+            self._products_filename,
+            catalog.version,
+            len(catalog),
+        )
+        return catalog.version
+
+    async def areload_catalog(self) -> int:
+        """Reload the catalog on a worker thread, off the event loop.
+
+        Returns:
+            int: The new catalog version.
+
+        """
+        return await asyncio.to_thread(self.reload_catalog)
+
+    def _source_signature(self) -> tuple[int, int] | None:
+        try:
+            stat = self._products_path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def start_watching(self, interval: float = 2.0) -> None:
+        """Reload the catalog whenever its file changes.
+
+        Args:
+            interval: Seconds between checks of the file.
+
+        """
+        if self._watcher is not None:
+            return
+        self._watch_stop.clear()
+        # taken here, not in the thread, so an early change is not missed
+        signature = self._source_signature()
+        self._watcher = threading.Thread(
+            target=self._watch,
+            args=(interval, signature),
+            name=f"catalog-watch-{self._products_filename}",
+            daemon=True,
+        )
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        """Stop watching the catalog file."""
+        if self._watcher is None:
+            return
+        self._watch_stop.set()
+        self._watcher.join()
+        self._watcher = None
+
+    def _watch(
+        self, interval: float, last_signature: tuple[int, int] | None
+    ) -> None:
+        while not self._watch_stop.wait(interval):
+            signature = self._source_signature()
+            if signature is None or signature == last_signature:
+                continue
+            last_signature = signature
+            try:
+                self.reload_catalog()
+            except Exception:
+                logger.exception(
+                    "catalog_reload_failed file=%s", self._products_filename
+                )
+
+    def search_products_json(
+        self,
+        query: str,
+        filters: FacetFilters | None = None,
+        page: int = 0,
+        sort_by: str | None = None,
+    ) -> str:
+        """Search the catalog and return the results serialized as JSON.
+
+        Payloads are cached per (catalog version, normalized query, filters,
+        page, sort order), and concurrent identical searches are computed
+        once. On a miss, the payload is assembled from the cached JSON of
+        each hit, so products are serialized once per catalog version.
+
+        Args:
+            query (str): shopping query
+            filters (FacetFilters | None): structured facet filters
+            page (int): zero-based result page
+            sort_by (str | None): one of `SORT_ORDERS`, defaults to relevance
+
+        Returns:
+            str: the `ProductResults` JSON
+        """
+        return self._cached_json(query, filters, page, sort_by, self._catalog)
+
+    def search_products_payload(
+        self,
+        query: str,
+        filters: FacetFilters | None = None,
+        page: int = 0,
+        sort_by: str | None = None,
+    ) -> dict[str, Any]:
+        """Search the catalog and return the results as parsed JSON.
+
+        The payload is parsed once per cached `search_products_json` result
+        and shared between callers; it must not be modified.
+
+        Args:
+            query (str): shopping query
+            filters (FacetFilters | None): structured facet filters
+            page (int): zero-based result page
+            sort_by (str | None): one of `SORT_ORDERS`, defaults to relevance
+
+        Returns:
+            dict[str, Any]: the `ProductResults` as a JSON-compatible dict
+        """
+        catalog = self._catalog
+        key = self._query_key(query, filters, page, sort_by, catalog)
+        return self.query_cache.get_or_compute(
+            (*key, "parsed"),
+            lambda: json.loads(
+                self._cached_json(query, filters, page, sort_by, catalog)
+            ),
+        )
+
+    @staticmethod
+    def _query_key(
+        query: str,
+        filters: FacetFilters | None,
+        page: int,
+        sort_by: str | None,
+        catalog: ProductCatalog,
+    ) -> tuple:
+        return (
+            catalog.version,
+            normalize_query(query),
+            filters or None,
+            page,
+            sort_by,
+        )
+
+    def _cached_json(
+        self,
+        query: str,
+        filters: FacetFilters | None,
+        page: int,
+        sort_by: str | None,
+        catalog: ProductCatalog,
+    ) -> str:
+        key = self._query_key(query, filters, page, sort_by, catalog)
+        return self.query_cache.get_or_compute(
+            key,
+            lambda: self._search_products_json(
+                query, filters, page, sort_by, catalog
+            ),
+        )
+
+    def _search_products_json(
+        self,
+        query: str,
+        filters: FacetFilters | None,
+        page: int,
+        sort_by: str | None,
+        catalog: ProductCatalog,
+    ) -> str:
+        """Serialize a search like `ProductResults.model_dump_json`."""
+        rows, hits, content = self._rank(query, filters, sort_by, catalog)
+        if not len(rows):
+            return ProductResults(
+                results=[], content="No products found"
+            ).model_dump_json()
+
+        def hit_json(row: int) -> str:
+            # "" for a product found invalid, which is left out
+            hit = self._search_hit(catalog, row)
+            return hit.model_dump_json() if hit is not None else ""
+
+        start = page * SEARCH_PAGE_SIZE
+        fragments = (
+            self.product_json_cache.get_or_compute(
+                (catalog.version, int(row)), lambda row=row: hit_json(row)
+            )
+            for row in hits[start : start + SEARCH_PAGE_SIZE]
+        )
+        results = ",".join(fragment for fragment in fragments if fragment)
+        next_page_token = (
+            str(page + 1) if start + SEARCH_PAGE_SIZE < len(hits) else None
+        )
+        hints = self._facet_hints(catalog.columns, rows)
+
+        def dump(value: Any) -> str:
+            return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+        # same field order and formatting as the pydantic serializer
+        return (
+            f'{{"content":{dump(content)},"hints":{dump(hints)},'
+            f'"results":[{results}],"next_page_token":{dump(next_page_token)}}}'
+        )
+
+    def search_products(
+        self,
+        query: str,
+        filters: FacetFilters | None = None,
+        page: int = 0,
+        catalog: ProductCatalog | None = None,
+        sort_by: str | None = None,
+    ) -> ProductResults:
         """Search the product catalog for products that match the given query.
 
         Args:
             query (str): shopping query
+            filters (FacetFilters | None): structured facet filters
+            page (int): zero-based page of `SEARCH_PAGE_SIZE` results
+            catalog (ProductCatalog | None): catalog version to search,
+                defaults to the current one
+            sort_by (str | None): one of `SORT_ORDERS`, defaults to relevance
 
         Returns:
-            ProductResults: product items that match the criteria of the query
+            ProductResults: product items that match the criteria of the query,
+            with facet counts of all the matches in `hints` and the next page
+            number in `next_page_token`
         """
-        all_products = list(self._products.values())
+        catalog = catalog or self._catalog
+        rows, hits, content = self._rank(query, filters, sort_by, catalog)
+        if not len(rows):
+            return ProductResults(results=[], content="No products found")
+
+        start = page * SEARCH_PAGE_SIZE
+        page_rows = hits[start : start + SEARCH_PAGE_SIZE]
+        results = [self._search_hit(catalog, row) for row in page_rows]
+        return ProductResults(
+            results=[hit for hit in results if hit is not None],
+            content=content,
+            hints=self._facet_hints(catalog.columns, rows),
+            next_page_token=(
+                str(page + 1) if start + SEARCH_PAGE_SIZE < len(hits) else None
+            ),
+        )
+
+    def _rank(
+        self,
+        query: str,
+        filters: FacetFilters | None,
+        sort_by: str | None,
+        catalog: ProductCatalog,
+    ) -> tuple[np.ndarray, np.ndarray, str | None]:
+        """Rank the catalog rows matching a query.
+
+        With a `sort_by` order, the matches are ordered by that column
+        instead, relevance breaking ties.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, str | None]: Every matching row,
+            best first; the search hits, with one row per product group;
+            and the message for the user, if any
+        """
+        columns = catalog.columns
 
         # Words that are too generic and would match everything
         stopwords = {
@@ -142,64 +562,205 @@ class RetailStore:
         raw_keywords = [k.strip() for k in query.lower().split() if k.strip()]
         keywords = [k for k in raw_keywords if k not in stopwords]
 
-        matching_products = {}
+        content = None
 
-        # If the user only typed generic words (e.g. "coffee"),
-        # return everything with a helpful message
-        if not keywords:
-            return ProductResults(
-                results=all_products,
-                content=(
+        if keywords:
+            # score against the keyword index; only hits are validated
+            scores = np.zeros(len(catalog), dtype=np.float32)
+            for keyword in keywords:
+                keyword_rows, _ = catalog.text_index.search(
+                    keyword, correct=False
+                )
+                scores[keyword_rows] += 1
+
+            similar = np.empty(0, dtype=np.int64)
+            similarity = np.empty(0, dtype=np.float32)
+            if catalog.semantic_index is not None:
+                similar, similarity = catalog.semantic_index.search(
+                    query, k=SEMANTIC_TOP_K
+                )
+                keep = similarity >= SEMANTIC_MIN_SIMILARITY
+                similar, similarity = similar[keep], similarity[keep]
+
+            # correct typos only when nothing matched at all: a word missing
+            # next to matching ones is more likely absent than misspelled
+            if not scores.any() and not len(similar):
+                corrections = []
+                for keyword in keywords:
+                    keyword_rows, corrected = catalog.text_index.search(keyword)
+                    if corrected is not None:
+                        corrections.append(f"'{keyword}' -> '{corrected}'")
+                        scores[keyword_rows] += FUZZY_MATCH_WEIGHT
+                if corrections:
+                    content = (
+                        "Showing results for " + ", ".join(corrections) + "."
+                    )
+            scores /= len(keywords)
+
+            # blend in products that are close in meaning
+            if catalog.semantic_index is not None:
+                scores *= 1 - SEMANTIC_WEIGHT
+                scores[similar] += SEMANTIC_WEIGHT * similarity
+
+            rows = np.flatnonzero(scores)
+            rows = rows[np.argsort(-scores[rows], kind="stable")]
+        else:
+            # If the user only typed generic words (e.g. "coffee"),
+            # return everything with a helpful message
+            rows = np.arange(len(catalog))
+            if not filters:
+                content = (
                     "Showing all products. "
                     "Try a more specific search like 'instant', 'ground', or 'espresso'."
-                ),
-            )
+                )
 
-        for keyword in keywords:
-            for product in all_products:
-                if product.product_id not in matching_products and (
-                    keyword in product.name.lower()
-                    or (
-                        product.category
-                        and keyword in product.category.lower()
-                    )
-                ):
-                    matching_products[product.product_id] = product
+        if filters:
+            rows = rows[columns.mask(**filters.mask_kwargs())[rows]]
+        invalid = catalog.invalid_positions
+        if invalid:
+            rows = rows[~np.isin(rows, invalid)]
+        if sort_by is not None:
+            rows = columns.sort(rows, sort_by)
+
+        # one hit per product group, at the rank of its best variant
+        return rows, catalog.variants.collapse(rows), content
+
+    @staticmethod
+    def _search_hit(
+        catalog: ProductCatalog, row: int
+    ) -> Product | ProductGroup | None:
+        """Return the product at a row, or its group if it is a variant.
+
+        Groups carry the matched variant and a compact `variantMatrix` (the
+        options, productID, price and availability of every variant) instead
+        of every variant's full record. Returns None if the product fails
+        validation.
+        """
+        product = catalog.get(catalog.entries[row].product_id)
+        if product is None:
+            return None
+        group = catalog.variants.group_of_row(row)
+        if group is None:
+            return product
+        return ProductGroup(
+            name=group.name,
+            productGroupID=group.group_id,
+            image=product.image,
+            description=product.description,
+            hasVariant=[product],
+            variesBy=group.varies_by,
+            variantMatrix=catalog.variants.matrix(group, catalog.columns),
+        )
 
-        product_list = list(matching_products.values())
-        if not product_list:
-            return ProductResults(results=[], content="No products found")
+    @staticmethod
+    def _facet_hints(columns: CatalogColumns, rows: np.ndarray) -> list[str]:
+        """Describe the facet values of the matches, for narrowing searches."""
+        hints = []
+        price_range = columns.price_range(rows)
+        if price_range is not None:
+            low, high = price_range
+            hints.append(f"price: {low / 100:.2f}-{high / 100:.2f}")
+        for name, counts in columns.facet_counts(rows).items():
+            if counts:
+                hints.append(
+                    f"{name}: "
+                    + ", ".join(f"{value} ({count})" for value, count in counts)
+                )
+        return hints
+
+    def resolve_product_id(
+        self,
+        reference: str,
+        variant: str | None = None,
+        catalog: ProductCatalog | None = None,
+    ) -> str | None:
+        """Resolve a product reference to a product ID.
+
+        Args:
+            reference (str): Product ID, SKU, GTIN, MPN, or a possibly
+                misspelled name (see `product_resolver.ProductResolver`); or a
+                product group ID or name when `variant` is given
+            variant (str | None): Option values selecting a variant of the
+                referenced group, e.g. "Dark Roast" or "12 oz, Whole Bean"
+            catalog (ProductCatalog | None): catalog version to resolve
+                against, defaults to the current one
+
+        Returns:
+            str | None: Product ID if the reference is unambiguous, None
+            otherwise
 
-        return ProductResults(results=product_list)
+        Raises:
+            VariantSelectionError: If the reference is a product group and
+                `variant` does not select one of its variants
 
-    def get_product(self, product_id: str) -> Product | None:
-        """Retrieve a product by its SKU.
+        """
+        catalog = catalog or self._catalog
+        variants = catalog.variants
+        if variant:
+            product_id = variants.resolve(reference, variant, catalog.columns)
+            if product_id is not None:
+                return product_id
+        if reference in catalog:
+            return reference
+
+        product_id = catalog.resolver.resolve(reference)
+        if product_id is None:
+            number = variants.find_group(reference, catalog.columns)
+            if number is not None:
+                group = variants.groups[number]
+                raise VariantSelectionError(
+                    f"'{reference}' has several variants; choose one of: "
+                    f"{group.describe_options()}"
+                )
+        return product_id
+
+    def get_product(
+        self,
+        product_id: str,
+        variant: str | None = None,
+        catalog: ProductCatalog | None = None,
+    ) -> Product | None:
+        """Retrieve a product by its ID, SKU, GTIN, MPN or name.
 
         Args:
-            product_id (str): Product ID
+            product_id (str): Product ID or another product reference
+            variant (str | None): Variant options, when `product_id` is a
+                product group (see `resolve_product_id`)
+            catalog (ProductCatalog | None): catalog version to read,
+                defaults to the current one
 
         Returns:
             Product | None: Product object if found, None otherwise
 
         """
-        return self._products.get(product_id)
+        catalog = catalog or self._catalog
+        resolved = self.resolve_product_id(product_id, variant, catalog)
+        return catalog.get(resolved) if resolved else None
 
-    def _get_line_item(self, product: Product, quantity: int) -> LineItem:
+    def _get_line_item(
+        self, product: Product, quantity: int, catalog: ProductCatalog
+    ) -> LineItem:
         """Create a line item for a product.
 
         Args:
             product (Product): Product object
             quantity (int): Quantity of the product
+            catalog (ProductCatalog): catalog version the product was read
+                from, whose columns hold its price
 
         Returns:
             LineItem: Line item object
 
         """
-        # read product.offers.price, convert to Decimal
-        if not product.offers or not product.offers.price:
-            raise ValueError(f"Product {product.name} does not have a price.")
-
-        unit_price = int(Decimal(product.offers.price) * 100)
+        # prices are pre-parsed to cents in the catalog columns
+        unit_price = catalog.columns.price_cents_of(product.product_id)
+        if unit_price is None:
+            # read product.offers.price, convert to Decimal
+            if not product.offers or not product.offers.price:
+                raise ValueError(
+                    f"Product {product.name} does not have a price."
+                )
+            unit_price = int(Decimal(product.offers.price) * 100)
 
         image_url = None
 
@@ -231,22 +792,31 @@ class RetailStore:
         product_id: str,
         quantity: int,
         checkout_id: str | None = None,
-    ) -> Checkout:
+        variant: str | None = None,
+    ) -> tuple[Checkout, str]:
         """Add a product to the checkout.
 
         Args:
             metadata (UcpMetadata): UCP metadata object
-            product_id (str): Product ID of the product to add to checkout
+            product_id (str): Product ID, or another reference accepted by
+                `get_product`, of the product to add to checkout
             quantity (int): Quantity of the product to add
             checkout_id (str | None, optional): checkout identifier
+            variant (str | None, optional): variant options, when
+                `product_id` is a product group
 
         Returns:
-            Checkout: checkout object
+            tuple[Checkout, str]: checkout object, and the ID of the
+            product that was added
 
         """
-        product = self.get_product(product_id)
+        # one catalog version for the product and its price, even if a
+        # reload swaps the catalog meanwhile
+        catalog = self._catalog
+        product = self.get_product(product_id, variant, catalog)
         if not product:
             raise ValueError(f"Product with ID {product_id} is not found")
+        product_id = product.product_id
 
         if not checkout_id:
             checkout_id = str(uuid4())
@@ -275,13 +845,39 @@ class RetailStore:
                 found = True
                 break
         if not found:
-            order_item = self._get_line_item(product, quantity)
+            order_item = self._get_line_item(product, quantity, catalog)
             checkout.line_items.append(order_item)
 
         self._recalculate_checkout(checkout)
         self._checkouts[checkout_id] = checkout
+        self.touch_checkout(checkout_id)
 
-        return checkout
+        return checkout, product_id
+
+    def _find_line_item(
+        self, checkout: Checkout, reference: str
+    ) -> LineItem | None:
+        """Find the line item of a checkout a product reference points to.
+
+        The reference is matched against the line item product IDs first,
+        then as an exact SKU, GTIN, MPN or name of the current catalog.
+        Misspellings are not corrected: editing the wrong line is worse
+        than reporting that nothing matched.
+
+        Args:
+            checkout (Checkout): Checkout to search
+            reference (str): Product ID or another exact product reference
+
+        Returns:
+            LineItem | None: The line item, or None if none matches
+
+        """
+        by_id = {item.item.id: item for item in checkout.line_items}
+        line_item = by_id.get(reference)
+        if line_item is None:
+            product_id = self._catalog.resolver.lookup(reference)
+            line_item = by_id.get(product_id) if product_id else None
+        return line_item
 
     def get_checkout(self, checkout_id: str) -> Checkout | None:
         """Retrieve a Checkout by its ID.
@@ -295,6 +891,99 @@ class RetailStore:
         """
         return self._checkouts.get(checkout_id)
 
+    def checkout_version(self, checkout_id: str) -> int:
+        """Return the version of a checkout (0 if it does not exist).
+
+        Args:
+            checkout_id (str): ID of the checkout
+
+        Returns:
+            int: Version, increased by every change to the checkout
+
+        """
+        return self._checkout_versions.get(checkout_id, 0)
+
+    def touch_checkout(self, checkout_id: str) -> int:
+        """Record a change to a checkout.
+
+        Every code path that modifies a checkout must call this, so that
+        `checkout_json` does not serve a stale dump.
+
+        Args:
+            checkout_id (str): ID of the changed checkout
+
+        Returns:
+            int: The new version of the checkout
+
+        """
+        version = self._checkout_versions.get(checkout_id, 0) + 1
+        self._checkout_versions[checkout_id] = version
+        return version
+
+    def checkout_json(self, checkout: Checkout) -> dict[str, Any]:
+        """Return `checkout.model_dump(mode="json")`, cached per version.
+
+        The dump is shared between callers and must not be modified. The
+        last `CHECKOUT_DUMP_HISTORY` dumps of a checkout are kept (see
+        `checkout_json_at`).
+
+        Args:
+            checkout (Checkout): Checkout to serialize
+
+        Returns:
+            dict[str, Any]: The JSON-compatible checkout
+
+        """
+        version = self.checkout_version(checkout.id)
+        history = self._checkout_dumps.get(checkout.id)
+        if history is not None and version in history:
+            METRICS.increment("checkout_json_cache_hits")
+            return history[version]
+
+        METRICS.increment("checkout_json_cache_misses")
+        dump = checkout.model_dump(mode="json")
+        if checkout.id in self._checkouts:
+            history = self._checkout_dumps.setdefault(checkout.id, OrderedDict())
+            history[version] = dump
+            while len(history) > CHECKOUT_DUMP_HISTORY:
+                history.popitem(last=False)
+        return dump
+
+    def checkout_json_at(
+        self, checkout_id: str, version: int
+    ) -> dict[str, Any] | None:
+        """Return a previously served dump of a checkout.
+
+        Args:
+            checkout_id (str): ID of the checkout
+            version (int): Version of the dump
+
+        Returns:
+            dict[str, Any] | None: The dump, or None if it is no longer kept
+
+        """
+        return self._checkout_dumps.get(checkout_id, {}).get(version)
+
+    def update_buyer(self, checkout_id: str, buyer: Buyer) -> Checkout:
+        """Set the buyer of the checkout.
+
+        Args:
+            checkout_id (str): ID of the checkout to update
+            buyer (Buyer): The buyer
+
+        Returns:
+            Checkout: checkout object
+
+        """
+        checkout = self.get_checkout(checkout_id)
+        if checkout is None:
+            raise ValueError(f"Checkout with ID {checkout_id} not found")
+
+        if checkout.buyer != buyer:
+            checkout.buyer = buyer
+            self.touch_checkout(checkout_id)
+        return checkout
+
     def remove_from_checkout(
         self, checkout_id: str, product_id: str
     ) -> Checkout:
@@ -302,10 +991,12 @@ class RetailStore:
 
         Args:
             checkout_id (str): ID of the checkout to remove from
-            product_id (str): Product ID of the product to remove from checkout
+            product_id (str): Product ID of the product to remove from
+                checkout, or another exact reference (see `_find_line_item`)
 
         Returns:
-            Checkout: checkout object
+            tuple[Checkout, str | None]: checkout object, and the ID of the
+            removed product (None if it was not in the checkout)
 
         """
         checkout = self.get_checkout(checkout_id)
@@ -313,14 +1004,16 @@ class RetailStore:
         if checkout is None:
             raise ValueError(f"Checkout with ID {checkout_id} not found")
 
-        for line_item in checkout.line_items:
-            if line_item.item.id == product_id:
-                checkout.line_items.remove(line_item)
-                break
+        line_item = self._find_line_item(checkout, product_id)
+        if line_item is None:
+            # not in the checkout: nothing changes
+            return checkout, None
+        checkout.line_items.remove(line_item)
 
         self._recalculate_checkout(checkout)
         self._checkouts[checkout_id] = checkout
-        return checkout
+        self.touch_checkout(checkout_id)
+        return checkout, line_item.item.id
 
     def update_checkout(
         self, checkout_id: str, product_id: str, quantity: int
@@ -329,11 +1022,13 @@ class RetailStore:
 
         Args:
             checkout_id (str): ID of the checkout to update
-            product_id (str): ID of the product to update
+            product_id (str): ID of the product to update, or another exact
+                reference (see `_find_line_item`)
             quantity (int): New quantity of the product
 
         Returns:
-            Checkout: checkout object
+            tuple[Checkout, str | None]: checkout object, and the ID of the
+            updated product (None if it was not in the checkout)
 
         """
         checkout = self.get_checkout(checkout_id)
@@ -341,14 +1036,18 @@ class RetailStore:
         if checkout is None:
             raise ValueError(f"Checkout with ID {checkout_id} not found")
 
-        for line_item in checkout.line_items:
-            if line_item.item.id == product_id:
-                line_item.quantity = quantity
-                break
+        line_item = self._find_line_item(checkout, product_id)
+        if line_item is None:
+            # not in the checkout: nothing changes
+            return checkout, None
+        if line_item.quantity == quantity:
+            return checkout, line_item.item.id
+        line_item.quantity = quantity
 
         self._recalculate_checkout(checkout)
         self._checkouts[checkout_id] = checkout
-        return checkout
+        self.touch_checkout(checkout_id)
+        return checkout, line_item.item.id
 
     def _recalculate_checkout(self, checkout: Checkout) -> None:
         """Recalculate the checkout totals.
@@ -500,6 +1199,7 @@ class RetailStore:
 
         self._recalculate_checkout(checkout)
         self._checkouts[checkout_id] = checkout
+        self.touch_checkout(checkout_id)
         return checkout
 
     def start_payment(self, checkout_id: str) -> Checkout | str:
@@ -535,6 +1235,7 @@ class RetailStore:
         self._recalculate_checkout(checkout)
         checkout.status = "ready_for_complete"
         self._checkouts[checkout_id] = checkout
+        self.touch_checkout(checkout_id)
         return checkout
 
     def place_order(self, checkout_id: str) -> Checkout:
@@ -562,6 +1263,8 @@ class RetailStore:
         self._orders[order_id] = checkout
         # Clear the checkout after placing the order
         del self._checkouts[checkout_id]
+        self._checkout_versions.pop(checkout_id, None)
+        self._checkout_dumps.pop(checkout_id, None)
         return checkout
 
     def _get_fulfillment_options(self) -> list[FulfillmentOptionResponse]:
@@ -0,0 +1,211 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Keyword index with typo tolerance.
+
+Product names and categories are split into whitespace-delimited words.
+Every distinct word keeps the catalog rows it appears in, and a trigram
+index over the vocabulary finds near-miss spellings ("expreso",
+"colombain"), confirmed with a bounded edit distance. Common English words
+("cold", "mild") are never corrected: a catalog without them has nothing
+they describe, not a misspelling of "gold" or "wild".
+"""
+
+import functools
+from bisect import bisect_right
+from collections import defaultdict
+from pathlib import Path
+from typing import Iterable
+import numpy as np
+from .catalog import CatalogEntry
+
+# shortest keyword that is corrected when nothing matches exactly
+MIN_FUZZY_LENGTH = 4
+
+COMMON_WORDS_PATH = Path(__file__).parent / "data" / "common_words.txt"
+
+
+@functools.cache
+def common_words() -> frozenset[str]:
+    """Return the common English words that are never corrected."""
+    with COMMON_WORDS_PATH.open(encoding="utf-8") as f:
+        return frozenset(line.strip() for line in f if line.strip())
+
+
+def max_edit_distance(keyword: str) -> int:
+    """Return the typo budget of a keyword, growing with its length."""
+    if len(keyword) < MIN_FUZZY_LENGTH:
+        return 0
+    return 1 if len(keyword) < 6 else 2
+
+
+def trigrams(word: str) -> set[str]:
+    """Return the trigrams of a word, padded so short words have some."""
+    padded = f"${word}$"
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance, stopping once above `limit`.
+
+    Adjacent transpositions count as one edit, so "colombain" is one edit
+    away from "colombian".
+
+    Returns:
+        int: The distance, or `limit + 1` if it exceeds the limit.
+
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2: list[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + cost,
+            )
+            if (
+                i > 1
+                and j > 1
+                and a[i - 1] == b[j - 2]
+                and a[i - 2] == b[j - 1]
+            ):
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1] if previous[-1] <= limit else limit + 1
+
+
+class TrigramIndex:
+    """Inverted index from words, and their trigrams, to catalog rows."""
+
+    def __init__(self, entries: Iterable[CatalogEntry]):
+        """Index the lower-cased names and categories of catalog entries.
+
+        Args:
+            entries: Catalog search projections, in catalog order.
+
+        """
+        words: dict[str, int] = {}
+        postings: list[list[int]] = []
+        for row, entry in enumerate(entries):
+            for word in set(entry.name.split()) | set(entry.category.split()):
+                word_id = words.get(word)
+                if word_id is None:
+                    word_id = words[word] = len(postings)
+                    postings.append([])
+                postings[word_id].append(row)
+
+        self.vocabulary = list(words)
+        self._postings = [np.array(rows, dtype=np.int64) for rows in postings]
+
+        # all words joined, for fast substring scans with str.find
+        self._blob = "\n".join(self.vocabulary)
+        self._starts = []
+        offset = 0
+        for word in self.vocabulary:
+            self._starts.append(offset)
+            offset += len(word) + 1
+
+        trigram_words: defaultdict[str, list[int]] = defaultdict(list)
+        for word_id, word in enumerate(self.vocabulary):
+            for gram in trigrams(word):
+                trigram_words[gram].append(word_id)
+        self._trigrams = dict(trigram_words)
+
+    def _rows(self, word_ids: list[int]) -> np.ndarray:
+        if not word_ids:
+            return np.empty(0, dtype=np.int64)
+        if len(word_ids) == 1:
+            return self._postings[word_ids[0]]
+        return np.unique(np.concatenate([self._postings[w] for w in word_ids]))
+
+    def containing(self, keyword: str) -> list[int]:
+        """Return the ids of the words that contain a keyword."""
+        word_ids = []
+        position = self._blob.find(keyword)
+        while position != -1:
+            word_id = bisect_right(self._starts, position) - 1
+            word_ids.append(word_id)
+            if word_id + 1 == len(self._starts):
+                break
+            position = self._blob.find(keyword, self._starts[word_id + 1])
+        return word_ids
+
+    def similar(self, keyword: str, max_distance: int) -> list[tuple[int, int]]:
+        """Return (word id, distance) of words within an edit distance.
+
+        Candidates must share enough trigrams with the keyword (each edit
+        changes at most three of them) before the edit distance is computed.
+
+        Returns:
+            list[tuple[int, int]]: Matches, closest first.
+
+        """
+        grams = trigrams(keyword)
+        shared: defaultdict[int, int] = defaultdict(int)
+        for gram in grams:
+            for word_id in self._trigrams.get(gram, ()):
+                shared[word_id] += 1
+
+        needed = max(1, len(grams) - 3 * max_distance)
+        matches = []
+        for word_id, count in shared.items():
+            if count < needed:
+                continue
+            distance = edit_distance(
+                keyword, self.vocabulary[word_id], max_distance
+            )
+            if distance <= max_distance:
+                matches.append((word_id, distance))
+        matches.sort(key=lambda m: m[1])
+        return matches
+
+    def search(
+        self, keyword: str, correct: bool = True
+    ) -> tuple[np.ndarray, str | None]:
+        """Return the rows matching a keyword, correcting typos if needed.
+
+        Keywords match as substrings of words, like a plain substring search
+        over the names and categories. Only when nothing matches are the
+        closest spellings within the keyword's typo budget used instead,
+        unless the keyword is a common word.
+
+        Args:
+            keyword: Lower-cased search keyword.
+            correct: Whether to fall back to the closest spellings.
+
+        Returns:
+            tuple[np.ndarray, str | None]: Sorted matching rows, and the
+            corrected word when a fuzzy match was used.
+
+        """
+        word_ids = self.containing(keyword)
+        if word_ids:
+            return self._rows(word_ids), None
+
+        max_distance = max_edit_distance(keyword)
+        if not correct or not max_distance or keyword in common_words():
+            return self._rows([]), None
+        matches = self.similar(keyword, max_distance)
+        if not matches:
+            return self._rows([]), None
+        best = matches[0][1]
+        closest = [word_id for word_id, d in matches if d == best]
+        return self._rows(closest), self.vocabulary[closest[0]]
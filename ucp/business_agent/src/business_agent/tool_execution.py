@@ -0,0 +1,101 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Execution of agent tools off the event loop.
+
+ADK calls synchronous tools on the event loop, so a slow search or a large
+checkout dump stalls every conversation served by the worker. `off_loop`
+turns a tool into a coroutine running it on a bounded thread pool; ADK then
+runs the function calls of one model response concurrently. `serialized`
+makes the tools touching one checkout run one at a time.
+"""
+
+import asyncio
+import contextvars
+import functools
+import os
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable
+from google.adk.tools.tool_context import ToolContext
+
+TOOL_THREADS = int(os.getenv("TOOL_THREADS", "8"))
+
+TOOL_EXECUTOR = ThreadPoolExecutor(
+    max_workers=TOOL_THREADS, thread_name_prefix="tool"
+)
+
+
+def off_loop(func: Callable[..., Any]) -> Callable[..., Awaitable[Any]]:
+    """Wrap a synchronous tool to run on the tool thread pool.
+
+    The wrapper keeps the name, docstring and signature of the tool, from
+    which ADK builds its declaration.
+    """
+
+    @functools.wraps(func)
+    async def run(*args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        call = functools.partial(
+            contextvars.copy_context().run, func, *args, **kwargs
+        )
+        return await loop.run_in_executor(TOOL_EXECUTOR, call)
+
+    return run
+
+
+class CheckoutLocks:
+    """One asyncio lock per checkout, dropped when no call uses it."""
+
+    def __init__(self):
+        self._locks: weakref.WeakValueDictionary[str, asyncio.Lock] = (
+            weakref.WeakValueDictionary()
+        )
+
+    def get(self, key: str) -> asyncio.Lock:
+        """Return the lock of a checkout key."""
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+
+
+def serialized(
+    key: Callable[[ToolContext], str], locks: CheckoutLocks
+) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Any]]]:
+    """Make calls of an async tool with the same checkout key sequential.
+
+    Args:
+        key: Returns the checkout key of a call from its tool context; it
+            must not depend on state the tool itself sets, such as the ID of
+            a checkout the call may create.
+        locks: Locks shared by all the tools touching checkouts.
+
+    Returns:
+        The decorator; the tool must take a `tool_context` argument.
+
+    """
+
+    def decorate(func: Callable[..., Awaitable[Any]]):
+        @functools.wraps(func)
+        async def run(*args: Any, **kwargs: Any) -> Any:
+            tool_context = kwargs.get("tool_context")
+            if tool_context is None:
+                tool_context = args[0]
+            async with locks.get(key(tool_context)):
+                return await func(*args, **kwargs)
+
+        return run
+
+    return decorate
@@ -0,0 +1,88 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Side-channel store of the tool results sent to clients.
+
+Every write to ADK session state is recorded in an event's state delta,
+which the session service copies and keeps. Full tool payloads (product
+pages, checkouts) are therefore kept here, keyed by (session, turn), and
+session state only holds the turn as a reference. Results are taken once
+when the agent output is built; results of turns that never got there
+expire after a bounded lifetime.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+from .metrics import METRICS
+
+DEFAULT_RESULT_TTL = float(os.getenv("TOOL_RESULT_TTL", "300"))
+DEFAULT_MAX_RESULTS = 1024
+
+
+class ToolResultStore:
+    """Bounded, expiring map of (session, turn) to the latest tool result."""
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_RESULT_TTL,
+        max_results: int = DEFAULT_MAX_RESULTS,
+    ):
+        """Initialize an empty store.
+
+        Args:
+            ttl: Seconds a result is kept if it is never taken.
+            max_results: Maximum number of results kept; the oldest are
+                dropped first.
+
+        """
+        self._ttl = ttl
+        self._max_results = max_results
+        self._results: OrderedDict[tuple[str, str], tuple[float, Any]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def put(self, session_id: str, turn: str, result: Any) -> None:
+        """Keep the latest result of a turn, replacing any earlier one."""
+        now = time.monotonic()
+        with self._lock:
+            self._results.pop((session_id, turn), None)
+            self._results[(session_id, turn)] = (now + self._ttl, result)
+            self._expire(now)
+
+    def take(self, session_id: str, turn: str) -> Any | None:
+        """Remove and return the result of a turn, unless it expired."""
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            item = self._results.pop((session_id, turn), None)
+        return None if item is None else item[1]
+
+    def _expire(self, now: float) -> None:
+        # insertion order is expiry order, since the TTL is fixed
+        while self._results:
+            expires, _ = next(iter(self._results.values()))
+            if expires > now and len(self._results) <= self._max_results:
+                break
+            self._results.popitem(last=False)
+            METRICS.increment("tool_results_expired")
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+
+TOOL_RESULTS = ToolResultStore()
@@ -0,0 +1,176 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compact, model-facing views of tool results.
+
+Clients get the full structured payloads (products with images, GTINs and
+shipping details, checkouts with payment handler configs). The model only
+needs enough to reason and to call the next tool: IDs, names, prices,
+availability and totals. Views are kept under a token budget by dropping
+trailing list items, with a note of how many were left out.
+"""
+
+import json
+import os
+from typing import Any
+from .constants import (
+    FEDERATED_RESULTS_KEY,
+    UCP_CHECKOUT_KEY,
+    UCP_CHECKOUT_VERSION_KEY,
+)
+
+PRODUCT_RESULTS_KEY = "a2a.product_results"
+DEFAULT_TOKEN_BUDGET = int(os.getenv("MODEL_TOOL_RESULT_TOKENS", "1200"))
+# rough size of a token in JSON text
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(value: Any) -> int:
+    """Estimate the number of tokens of a JSON-compatible value."""
+    return len(json.dumps(value, ensure_ascii=False)) // CHARS_PER_TOKEN
+
+
+def _short(url: Any) -> Any:
+    # schema.org enumerations: https://schema.org/InStock -> InStock
+    return url.rsplit("/", 1)[-1] if isinstance(url, str) else url
+
+
+def product_view(product: dict[str, Any]) -> dict[str, Any]:
+    """Return the ID, name, price and availability of a product or group."""
+    if product.get("@type") == "ProductGroup":
+        view = {
+            "productGroupID": product.get("productGroupID"),
+            "name": product.get("name"),
+            "variesBy": product.get("variesBy"),
+            "variants": product.get("variantMatrix"),
+        }
+        return {k: v for k, v in view.items() if v is not None}
+
+    offers = product.get("offers") or {}
+    price = offers.get("price")
+    if price is not None and offers.get("priceCurrency"):
+        price = f"{price} {offers['priceCurrency']}"
+    brand = product.get("brand")
+    rating = product.get("aggregateRating")
+    view = {
+        "productID": product.get("productID"),
+        "name": product.get("name"),
+        "brand": brand.get("name") if isinstance(brand, dict) else None,
+        "price": price,
+        "availability": _short(offers.get("availability")),
+        "rating": rating.get("ratingValue") if isinstance(rating, dict) else None,
+    }
+    return {k: v for k, v in view.items() if v is not None}
+
+
+def checkout_view(checkout: dict[str, Any]) -> dict[str, Any]:
+    """Return the status, line items and totals of a checkout."""
+    view: dict[str, Any] = {
+        "id": checkout.get("id"),
+        "status": checkout.get("status"),
+        "currency": checkout.get("currency"),
+        "line_items": [
+            {
+                "product_id": (line.get("item") or {}).get("id"),
+                "title": (line.get("item") or {}).get("title"),
+                "quantity": line.get("quantity"),
+                "total": next(
+                    (
+                        t.get("amount")
+                        for t in line.get("totals") or []
+                        if t.get("type") == "total"
+                    ),
+                    None,
+                ),
+            }
+            for line in checkout.get("line_items") or []
+        ],
+        # amounts in minor units (cents)
+        "totals": {
+            t.get("type"): t.get("amount") for t in checkout.get("totals") or []
+        },
+    }
+    buyer = checkout.get("buyer")
+    if isinstance(buyer, dict) and buyer.get("email"):
+        view["buyer_email"] = buyer["email"]
+    if checkout.get("fulfillment"):
+        view["has_shipping_address"] = True
+    order = checkout.get("order")
+    if isinstance(order, dict):
+        view["order"] = {"id": order.get("id"), "url": order.get("permalink_url")}
+    return view
+
+
+def _fit(view: dict[str, Any], key: str, budget: int) -> dict[str, Any]:
+    """Drop trailing items of `view[key]` until the view fits the budget."""
+    items = view[key]
+    if estimate_tokens(view) <= budget:
+        return view
+    kept = len(items)
+    while kept > 1:
+        kept -= 1
+        trimmed = {
+            **view,
+            key: items[:kept],
+            "omitted": f"{len(items) - kept} more; ask for fewer or refine",
+        }
+        if estimate_tokens(trimmed) <= budget:
+            return trimmed
+    return {**view, key: items[:1], "omitted": f"{len(items) - 1} more"}
+
+
+def model_view(
+    result: dict[str, Any], budget: int = DEFAULT_TOKEN_BUDGET
+) -> dict[str, Any]:
+    """Return the compact view of a tool result for the model.
+
+    Product results, federated results and checkouts are projected; other
+    keys are kept as is, except the checkout version.
+
+    Args:
+        result: Full tool result, as sent to the client.
+        budget: Approximate maximum number of tokens of the view.
+
+    Returns:
+        dict[str, Any]: A new dict; `result` is not modified.
+
+    """
+    # checkout versions are for the client's patch acknowledgements
+    view = {k: v for k, v in result.items() if k != UCP_CHECKOUT_VERSION_KEY}
+    if isinstance(view.get(UCP_CHECKOUT_KEY), dict):
+        view[UCP_CHECKOUT_KEY] = checkout_view(view[UCP_CHECKOUT_KEY])
+
+    results = view.get(PRODUCT_RESULTS_KEY)
+    if isinstance(results, dict):
+        products = {
+            **{k: v for k, v in results.items() if v is not None},
+            "results": [product_view(p) for p in results.get("results") or []],
+        }
+        rest = {k: v for k, v in view.items() if k != PRODUCT_RESULTS_KEY}
+        view[PRODUCT_RESULTS_KEY] = _fit(
+            products, "results", budget - estimate_tokens(rest)
+        )
+
+    hits = view.get(FEDERATED_RESULTS_KEY)
+    if isinstance(hits, list):
+        view[FEDERATED_RESULTS_KEY] = [
+            {
+                "store_id": hit.get("store_id"),
+                "supports_ucp_checkout": hit.get("supports_ucp_checkout"),
+                **product_view(hit.get("product") or {}),
+            }
+            for hit in hits
+        ]
+        view = _fit(view, FEDERATED_RESULTS_KEY, budget)
+    return view
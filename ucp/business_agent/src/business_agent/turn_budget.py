@@ -0,0 +1,214 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Per-turn budget of tool calls and wall-clock time.
+
+A turn may call tools a bounded number of times, repeat an identical call a
+bounded number of times, and run for a bounded time. A call is only a
+repeat if the session state it reads (e.g. the checkout version) is
+unchanged, so re-reading a checkout after updating it is not a loop. When the tool budget
+trips, the call is refused and the model gets one more call to answer with
+what it already has; after that, or when the time is up, the turn ends with
+a fixed message. The tool results already captured are still sent to the
+client, so the response is partial rather than lost.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.tool_context import ToolContext
+from google.genai import types
+from .metrics import METRICS
+
+logger = logging.getLogger("business_agent.turn_budget")
+
+DEFAULT_MAX_TOOL_CALLS = int(os.getenv("TURN_MAX_TOOL_CALLS", "12"))
+DEFAULT_MAX_SECONDS = float(os.getenv("TURN_MAX_SECONDS", "30"))
+DEFAULT_MAX_REPEATS = int(os.getenv("TURN_MAX_REPEATED_CALLS", "2"))
+# turns older than this many time budgets are dropped if never finished
+STALE_TURN_FACTOR = 10
+
+STOP_MESSAGE = (
+    "I had to stop working on this request because it was taking too many "
+    "steps. Here is what I have so far; please tell me how to continue."
+)
+
+
+@dataclass
+class TurnUsage:
+    """Tool calls and time used by a running turn."""
+
+    started: float
+    tool_calls: int = 0
+    calls: dict[str, int] = field(default_factory=dict)
+    tripped: str | None = None
+    answered: bool = False
+
+
+class TurnBudget:
+    """Enforces the per-turn budget through ADK callbacks.
+
+    A turn is one agent invocation: its budget starts with the first
+    callback of the invocation and ends with `finish` (see
+    `ADKAgentExecutor`), so overlapping requests of one session are
+    budgeted separately.
+    """
+
+    def __init__(
+        self,
+        max_tool_calls: int = DEFAULT_MAX_TOOL_CALLS,
+        max_seconds: float = DEFAULT_MAX_SECONDS,
+        max_repeats: int = DEFAULT_MAX_REPEATS,
+        state_marker: Callable[[ToolContext], Any] | None = None,
+    ):
+        """Initialize the budget.
+
+        Args:
+            max_tool_calls: Tool calls allowed per turn.
+            max_seconds: Wall-clock seconds after which no model call or
+                tool call is started.
+            max_repeats: Times a call with identical arguments is allowed
+                per turn.
+            state_marker: Returns a JSON-compatible marker of the session
+                state tools depend on (e.g. the checkout version); calls
+                with identical arguments are only repeats if it is equal.
+
+        """
+        self.max_tool_calls = max_tool_calls
+        self.max_seconds = max_seconds
+        self.max_repeats = max_repeats
+        self.state_marker = state_marker
+        # invocation id -> usage of the turn
+        self._turns: dict[str, TurnUsage] = {}
+        self._lock = threading.Lock()
+
+    def _turn(self, invocation_id: str) -> TurnUsage:
+        """Return the usage of an invocation, starting its turn if new."""
+        with self._lock:
+            usage = self._turns.get(invocation_id)
+            if usage is None:
+                now = time.monotonic()
+                # turns whose invocation failed before `finish` was told
+                # its id; long past their time budget
+                stale = now - STALE_TURN_FACTOR * self.max_seconds
+                for key in [
+                    key
+                    for key, turn in self._turns.items()
+                    if turn.started < stale
+                ]:
+                    del self._turns[key]
+                usage = self._turns[invocation_id] = TurnUsage(started=now)
+            return usage
+
+    def finish(self, invocation_id: str) -> None:
+        """End the turn of an invocation and record its usage."""
+        with self._lock:
+            usage = self._turns.pop(invocation_id, None)
+        if usage is None:
+            return
+        METRICS.increment("turns")
+        METRICS.increment("turn_tool_calls", usage.tool_calls)
+        METRICS.increment("turn_seconds", time.monotonic() - usage.started)
+
+    def _trip(self, invocation_id: str, usage: TurnUsage, reason: str) -> None:
+        usage.tripped = reason
+        METRICS.increment("turn_budget_trips", reason=reason)
+        logger.warning(
+            "turn_budget_tripped invocation_id=%s reason=%s tool_calls=%d "
+            "elapsed=%.1fs",
+            invocation_id,
+            reason,
+            usage.tool_calls,
+            time.monotonic() - usage.started,
+        )
+
+    def before_model(
+        self, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> LlmResponse | None:
+        """End the turn once the budget is spent.
+
+        Args:
+            callback_context: The callback context for the agent run.
+            llm_request: The request about to be sent to the model.
+
+        Returns:
+            LlmResponse | None: The final response, or None to call the
+            model.
+
+        """
+        invocation_id = callback_context.invocation_id
+        usage = self._turn(invocation_id)
+        if usage.tripped is None:
+            if time.monotonic() - usage.started <= self.max_seconds:
+                return None
+            self._trip(invocation_id, usage, "wall_clock")
+            usage.answered = True
+        elif not usage.answered:
+            # one more model call to answer from the results so far
+            usage.answered = True
+            return None
+        return LlmResponse(
+            content=types.Content(
+                role="model", parts=[types.Part(text=STOP_MESSAGE)]
+            )
+        )
+
+    def before_tool(
+        self, tool: BaseTool, args: dict[str, Any], tool_context: ToolContext
+    ) -> dict | None:
+        """Refuse tool calls beyond the budget of the turn.
+
+        Args:
+            tool: The tool about to be executed.
+            args: The arguments passed to the tool.
+            tool_context: The tool context for the current request.
+
+        Returns:
+            dict | None: The response given to the model instead of running
+            the tool, or None to run it.
+
+        """
+        invocation_id = tool_context.invocation_id
+        usage = self._turn(invocation_id)
+        usage.tool_calls += 1
+        marker = self.state_marker(tool_context) if self.state_marker else None
+        key = json.dumps([tool.name, marker, args], sort_keys=True, default=str)
+        repeats = usage.calls[key] = usage.calls.get(key, 0) + 1
+        if usage.tripped is None:
+            if repeats > self.max_repeats:
+                METRICS.increment("turn_repeated_calls", tool=tool.name)
+                self._trip(invocation_id, usage, "repeated_call")
+            elif usage.tool_calls > self.max_tool_calls:
+                self._trip(invocation_id, usage, "tool_calls")
+            elif time.monotonic() - usage.started > self.max_seconds:
+                self._trip(invocation_id, usage, "wall_clock")
+            else:
+                return None
+
+        return {
+            "status": "error",
+            "message": (
+                "Tool budget for this request exhausted "
+                f"({usage.tripped}); no more tools can be called. Answer the "
+                "user with the results you already have."
+            ),
+        }
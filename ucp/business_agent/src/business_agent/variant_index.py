@@ -0,0 +1,327 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Variant index for catalogs with product groups.
+
+Variants (sizes, grinds, colors, ...) are separate catalog rows that share
+an `inProductGroupWithID` (feeds with schema.org `ProductGroup` records are
+flattened into such rows at ingestion). The index groups them so that
+search can return one entry per group with a compact variant matrix, and
+maps (group, option values) to the variant's product ID with one dict
+lookup.
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Iterable
+import numpy as np
+from .catalog import CatalogEntry
+from .catalog_columns import AVAILABILITY_VALUES, NO_PRICE, CatalogColumns
+from .product_resolver import normalize_key
+
+logger = logging.getLogger("business_agent.variant_index")
+
+VARIANT_ATTRIBUTES = ("size", "color", "material", "pattern")
+# option name used when variants only differ by name
+NAME_OPTION = "variant"
+NO_GROUP = -1
+
+_OPTION_SEPARATORS = re.compile(r"[,;/|]")
+_NAME_SEPARATORS = " —–-:,|"
+
+
+class VariantSelectionError(ValueError):
+    """A product group was referenced without a matching variant."""
+
+
+@dataclass
+class VariantGroup:
+    """The variants of one product group, in catalog order."""
+
+    group_id: str
+    name: str
+    varies_by: list[str]
+    rows: list[int]
+    product_ids: list[str]
+    options: list[dict[str, str]]
+
+    def describe_options(self) -> str:
+        """Return the variant options, for error messages."""
+        return "; ".join(
+            ", ".join(option.values()) or product_id
+            for product_id, option in zip(self.product_ids, self.options)
+        )
+
+
+def variant_group_id(record: dict[str, Any]) -> str | None:
+    """Return the product group ID of a variant record, if any."""
+    group_id = record.get("inProductGroupWithID")
+    if isinstance(group_id, list):
+        group_id = group_id[0] if group_id else None
+    if group_id is None:
+        parent = record.get("isVariantOf")
+        if isinstance(parent, dict):
+            group_id = parent.get("productGroupID")
+    return group_id if isinstance(group_id, str) and group_id else None
+
+
+def variant_attributes(record: dict[str, Any]) -> dict[str, str]:
+    """Return the attributes a variant may differ by."""
+    values = {}
+    for name in VARIANT_ATTRIBUTES:
+        value = record.get(name)
+        if isinstance(value, dict):
+            value = value.get("name")
+        if isinstance(value, (str, int, float)) and str(value).strip():
+            values[name] = str(value).strip()
+    properties = record.get("additionalProperty")
+    if isinstance(properties, dict):
+        properties = [properties]
+    for prop in properties if isinstance(properties, list) else []:
+        if (
+            isinstance(prop, dict)
+            and isinstance(prop.get("name"), str)
+            and prop.get("value") is not None
+        ):
+            values[prop["name"]] = str(prop["value"]).strip()
+    return values
+
+
+def _common_name(names: list[str]) -> str:
+    words = [name.split() for name in names]
+    common = []
+    for column in zip(*words):
+        if any(word != column[0] for word in column):
+            break
+        common.append(column[0])
+    return " ".join(common).rstrip(_NAME_SEPARATORS)
+
+
+class VariantIndex:
+    """Groups variant rows and resolves option values to variants."""
+
+    def __init__(
+        self,
+        records: Iterable[tuple[CatalogEntry, dict[str, Any]]] = (),
+        size: int | None = None,
+        builder: "VariantIndexBuilder | None" = None,
+    ):
+        """Group the variant records of a catalog.
+
+        Groups with a single variant are left as plain products.
+
+        Args:
+            records: (catalog entry, schema.org record) pairs, as yielded by
+                `ProductCatalog.iter_records`.
+            size: Number of catalog rows; defaults to the records seen.
+            builder: The variant records, if already collected instead of
+                given as `records`.
+
+        """
+        if builder is None:
+            builder = VariantIndexBuilder()
+            for entry, record in records:
+                builder.add(entry, record)
+        members = builder.members
+        if size is None:
+            size = builder.rows
+
+        self.groups: list[VariantGroup] = []
+        self.row_group = np.full(size, NO_GROUP, dtype=np.int32)
+        self._group_keys: dict[str, int] = {}
+        self._variants: dict[tuple[int, frozenset[str]], str] = {}
+        for group_id, variants in members.items():
+            if len(variants) > 1:
+                self._add_group(group_id, variants)
+
+        logger.info(
+            "variant_index_built groups=%d variants=%d",
+            len(self.groups),
+            int(np.count_nonzero(self.row_group != NO_GROUP)),
+        )
+
+    def _add_group(self, group_id: str, variants: list) -> None:
+        number = len(self.groups)
+        rows, product_ids, names, attributes, parents = zip(*variants)
+        parent = parents[0]
+
+        name = parent.get("name")
+        if not isinstance(name, str) or not name:
+            name = _common_name(list(names)) or group_id
+
+        varies_by = parent.get("variesBy")
+        if isinstance(varies_by, str):
+            varies_by = [varies_by]
+        if isinstance(varies_by, list):
+            # schema.org lists properties as URLs (https://schema.org/size)
+            varies_by = [str(v).rstrip("/").rsplit("/", 1)[-1] for v in varies_by]
+        else:
+            varies_by = [
+                key
+                for key in dict.fromkeys(k for a in attributes for k in a)
+                if len({a.get(key) for a in attributes}) > 1
+            ]
+
+        if varies_by:
+            options = [
+                {key: a[key] for key in varies_by if key in a}
+                for a in attributes
+            ]
+        else:
+            # variants only told apart by their names ("... - Dark Roast")
+            varies_by = [NAME_OPTION]
+            options = [
+                {NAME_OPTION: n[len(name) :].strip(_NAME_SEPARATORS) or n}
+                if n.startswith(name)
+                else {NAME_OPTION: n}
+                for n in names
+            ]
+
+        group = VariantGroup(
+            group_id=group_id,
+            name=name,
+            varies_by=varies_by,
+            rows=list(rows),
+            product_ids=list(product_ids),
+            options=options,
+        )
+        self.groups.append(group)
+        self.row_group[list(rows)] = number
+        for key in (group_id, name):
+            self._group_keys.setdefault(normalize_key(key), number)
+
+        value_counts: dict[str, int] = {}
+        for option in options:
+            for value in option.values():
+                value = normalize_key(value)
+                value_counts[value] = value_counts.get(value, 0) + 1
+        for product_id, variant_name, option in zip(
+            product_ids, names, options
+        ):
+            values = {normalize_key(v) for v in option.values()}
+            self._variants[(number, frozenset(values))] = product_id
+            self._variants[
+                (number, frozenset([normalize_key(variant_name)]))
+            ] = product_id
+            for value in values:
+                if value_counts[value] == 1:
+                    self._variants[(number, frozenset([value]))] = product_id
+
+    def __len__(self) -> int:
+        return len(self.groups)
+
+    def group_of_row(self, row: int) -> VariantGroup | None:
+        """Return the group of a catalog row, if it is a variant."""
+        number = self.row_group[row]
+        return None if number == NO_GROUP else self.groups[number]
+
+    def find_group(
+        self, reference: str, columns: CatalogColumns
+    ) -> int | None:
+        """Return the group number of a group ID, group name or variant."""
+        number = self._group_keys.get(normalize_key(reference))
+        if number is not None:
+            return number
+        row = columns.row(reference)
+        if row is None or self.row_group[row] == NO_GROUP:
+            return None
+        return int(self.row_group[row])
+
+    def collapse(self, rows: np.ndarray) -> np.ndarray:
+        """Keep the first (best ranked) row of each group, in order."""
+        if not self.groups or not len(rows):
+            return rows
+        groups = self.row_group[rows]
+        keep = groups == NO_GROUP
+        _, first = np.unique(groups, return_index=True)
+        keep[first] = True
+        return rows[keep]
+
+    def resolve(
+        self, reference: str, variant: str, columns: CatalogColumns
+    ) -> str | None:
+        """Return the variant of a group matching option values.
+
+        Args:
+            reference: Group ID, group name, or the ID of any variant.
+            variant: Option values ("Dark Roast", "12 oz, Whole Bean") or
+                the full variant name.
+            columns: Catalog columns, to locate variants by product ID.
+
+        Returns:
+            str | None: The product ID, or None if the reference is not a
+            group or the values do not select exactly one variant.
+
+        """
+        number = self.find_group(reference, columns)
+        if number is None:
+            return None
+        whole = frozenset([normalize_key(variant)])
+        product_id = self._variants.get((number, whole))
+        if product_id is None:
+            values = frozenset(
+                normalize_key(v) for v in _OPTION_SEPARATORS.split(variant)
+            )
+            product_id = self._variants.get((number, values - {""}))
+        return product_id
+
+    def matrix(
+        self, group: VariantGroup, columns: CatalogColumns
+    ) -> list[dict[str, str]]:
+        """Return one compact row (options, ID, price) per variant."""
+        matrix = []
+        for row, product_id, option in zip(
+            group.rows, group.product_ids, group.options
+        ):
+            cell = {**option, "productID": product_id}
+            price = columns.price_cents[row]
+            if price != NO_PRICE:
+                cell["price"] = f"{price / 100:.2f}"
+            availability = AVAILABILITY_VALUES[columns.availability[row]]
+            if availability:
+                cell["availability"] = availability.rsplit("/", 1)[-1]
+            matrix.append(cell)
+        return matrix
+
+
+class VariantIndexBuilder:
+    """Collects the variant records of a catalog, one record at a time."""
+
+    def __init__(self):
+        # group ID -> (row, product ID, name, attributes, parent) per variant
+        self.members: dict[str, list] = {}
+        self.rows = 0
+
+    def add(self, entry: CatalogEntry, record: dict[str, Any]) -> None:
+        """Add the record at the next catalog position."""
+        row = self.rows
+        self.rows += 1
+        group_id = variant_group_id(record)
+        if group_id is None:
+            return
+        parent = record.get("isVariantOf")
+        self.members.setdefault(group_id, []).append(
+            (
+                row,
+                entry.product_id,
+                record.get("name") or "",
+                variant_attributes(record),
+                parent if isinstance(parent, dict) else {},
+            )
+        )
+
+    def build(self, size: int | None = None) -> VariantIndex:
+        """Return the index of the variants collected so far."""
+        return VariantIndex(size=size, builder=self)
@@ -0,0 +1,52 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import json
+from pathlib import Path
+import pytest
+from business_agent.store import RetailStore
+
+DATA_DIR = Path(__file__).parents[1] / "src" / "business_agent" / "data"
+
+
+@pytest.fixture
+def records() -> list[dict]:
+    """Product records of the sample catalog, safe to modify."""
+    with (DATA_DIR / "products.json").open() as f:
+        return copy.deepcopy(json.load(f))
+
+
+@pytest.fixture
+def write_feed(tmp_path):
+    """Write product records to a JSON feed and return its path."""
+
+    def write(records: list[dict], name: str = "products.json") -> Path:
+        path = tmp_path / name
+        path.write_text(json.dumps(records))
+        return path
+
+    return write
+
+
+@pytest.fixture
+def make_store():
+    """Build a store over a feed, without semantic search or watching."""
+
+    def make(path: Path, **kwargs) -> RetailStore:
+        kwargs.setdefault("semantic_search", False)
+        kwargs.setdefault("watch_interval", 0)
+        return RetailStore(str(path), **kwargs)
+
+    return make
@@ -0,0 +1,179 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+import time
+from types import SimpleNamespace
+import pytest
+from google.adk.tools.base_tool import BaseTool
+from business_agent import agent
+from business_agent.constants import (
+    ADK_SELECTED_STORE_ID,
+    ADK_UCP_METADATA_STATE,
+    UCP_CHECKOUT_KEY,
+)
+from business_agent.ucp_contracts_demo import load_ucp_metadata_from_repo
+
+SEARCH_ONLY_STORE = "tierra_de_cafe"
+CHECKOUT_STORE = "cafe_con_alma"
+
+
+def context(store_id: str) -> SimpleNamespace:
+    return SimpleNamespace(state={ADK_SELECTED_STORE_ID: store_id})
+
+
+def tool_names(store_id: str | None) -> set[str]:
+    ctx = context(store_id) if store_id else None
+    tools = asyncio.run(agent.StoreToolset().get_tools(ctx))
+    return {tool.name for tool in tools}
+
+
+def test_toolset_follows_store_capabilities():
+    checkout_names = agent.CHECKOUT_TOOL_NAMES
+    assert checkout_names <= tool_names(CHECKOUT_STORE)
+    assert not checkout_names & tool_names(SEARCH_ONLY_STORE)
+    assert "search_shopping_catalog" in tool_names(SEARCH_ONLY_STORE)
+    assert tool_names(None) == tool_names(CHECKOUT_STORE)
+
+
+def test_tool_not_offered_is_explained():
+    placeholder = BaseTool(name="add_to_checkout", description="Tool not found")
+    response = agent.on_tool_error_modifier(
+        placeholder, {}, context(SEARCH_ONLY_STORE), ValueError("not found")
+    )
+    assert response["status"] == "error"
+    assert response["recommended_store"] == CHECKOUT_STORE
+
+
+@pytest.mark.parametrize("store_id", [SEARCH_ONLY_STORE, CHECKOUT_STORE])
+def test_tool_failure_is_logged_not_rewritten(store_id, caplog):
+    tool = BaseTool(name="add_to_checkout", description="Add to checkout")
+    with caplog.at_level(logging.ERROR, logger="business_agent.agent"):
+        response = agent.on_tool_error_modifier(
+            tool, {}, context(store_id), KeyError("line_items")
+        )
+    assert response["status"] == "error"
+    assert "not available" not in response["message"]
+    assert "recommended_store" not in response
+    assert "tool_failed tool=add_to_checkout" in caplog.text
+    assert caplog.records[0].exc_info[1].args == ("line_items",)
+
+
+def test_add_to_checkout_reports_resolved_product_id():
+    ctx = context(CHECKOUT_STORE)
+    ctx.state[ADK_UCP_METADATA_STATE] = load_ucp_metadata_from_repo()[0]
+
+    response = agent.add_to_checkout(ctx, "1111111111111")
+    assert response["status"] == "success"
+    assert response["resolved_product_id"] == "COF-GR-001"
+
+    response = agent.add_to_checkout(ctx, "COF-GR-001")
+    assert "resolved_product_id" not in response
+
+    response = agent.add_to_checkout(ctx, "4444444444442")
+    assert response["status"] == "error"
+
+
+def test_cart_edits_match_line_items_exactly():
+    ctx = context(CHECKOUT_STORE)
+    ctx.state[ADK_UCP_METADATA_STATE] = load_ucp_metadata_from_repo()[0]
+    agent.add_to_checkout(ctx, "COF-GR-001")
+
+    def quantities():
+        checkout = agent.get_checkout(ctx)[UCP_CHECKOUT_KEY]
+        return {
+            line["item"]["id"]: line["quantity"]
+            for line in checkout["line_items"]
+        }
+
+    response = agent.update_checkout(ctx, "1111111111111", 3)
+    assert response["resolved_product_id"] == "COF-GR-001"
+    assert quantities() == {"COF-GR-001": 3}
+
+    # a sibling ID, a misspelled name and a product group are not the line
+    for reference in (
+        "COF-GR-002",
+        "Colombian Ground Cofee — Medium Roast",
+        "Colombian Ground Coffee",
+    ):
+        response = agent.update_checkout(ctx, reference, 5)
+        assert response["status"] == "success"
+        assert "resolved_product_id" not in response
+        response = agent.remove_from_checkout(ctx, reference)
+        assert response["status"] == "success"
+        assert quantities() == {"COF-GR-001": 3}
+
+    agent.remove_from_checkout(ctx, "COF-GR-001")
+    assert quantities() == {}
+
+
+def test_parallel_first_adds_share_one_checkout(monkeypatch):
+    ctx = context(CHECKOUT_STORE)
+    ctx.session = SimpleNamespace(id="parallel-adds")
+    ctx.state[ADK_UCP_METADATA_STATE] = load_ucp_metadata_from_repo()[0]
+    add = agent.RetailStore.add_to_checkout
+
+    def slow_add(*args, **kwargs):
+        # widen the window between reading and storing the checkout ID
+        time.sleep(0.05)
+        return add(*args, **kwargs)
+
+    monkeypatch.setattr(agent.RetailStore, "add_to_checkout", slow_add)
+    tool = next(
+        f for f in agent.CHECKOUT_TOOLS if f.__name__ == "add_to_checkout"
+    )
+
+    async def main():
+        return await asyncio.gather(
+            tool(tool_context=ctx, product_id="COF-GR-001"),
+            tool(tool_context=ctx, product_id="COF-GR-002"),
+        )
+
+    responses = asyncio.run(main())
+    ids = {r[UCP_CHECKOUT_KEY]["id"] for r in responses}
+    assert len(ids) == 1
+    checkout = agent.get_checkout(ctx)[UCP_CHECKOUT_KEY]
+    assert checkout["id"] in ids
+    assert {line["item"]["id"] for line in checkout["line_items"]} == {
+        "COF-GR-001",
+        "COF-GR-002",
+    }
+
+
+def test_search_sort_by_is_validated():
+    ctx = context(SEARCH_ONLY_STORE)
+
+    response = agent.search_shopping_catalog(ctx, "coffee", sort_by="price_low")
+    prices = [
+        float(p["offers"]["price"])
+        for p in response["a2a.product_results"]["results"]
+    ]
+    assert prices == sorted(prices)
+
+    response = agent.search_shopping_catalog(ctx, "coffee", sort_by="cheapest")
+    assert response["status"] == "error"
+    assert "price_low" in response["message"]
+
+
+def test_session_marker_follows_checkout_changes():
+    ctx = context(CHECKOUT_STORE)
+    ctx.state[ADK_UCP_METADATA_STATE] = load_ucp_metadata_from_repo()[0]
+
+    before = agent.session_marker(ctx)
+    agent.add_to_checkout(ctx, "COF-GR-001")
+    after = agent.session_marker(ctx)
+    assert after[0] == before[0] == CHECKOUT_STORE
+    assert after != before
+    assert agent.session_marker(ctx) == after
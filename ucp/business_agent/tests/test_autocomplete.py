@@ -0,0 +1,69 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+import pytest
+from business_agent.autocomplete import PrefixIndex, Suggestion
+
+WORDS = ["dark", "decaf", "espresso", "ethiopian", "roast", "bean", "best"]
+
+
+def brute_force(suggestions, prefix, k):
+    matches = [
+        t
+        for t, s in enumerate(suggestions)
+        if any(
+            " ".join(s.text.lower().split()[i:]).startswith(prefix)
+            for i in range(len(s.text.split()))
+        )
+    ]
+    matches.sort(key=lambda t: (suggestions[t].popularity, -t), reverse=True)
+    return [suggestions[t] for t in matches[:k]]
+
+
+@pytest.fixture
+def suggestions():
+    rng = random.Random(7)
+    return [
+        Suggestion(
+            " ".join(rng.choices(WORDS, k=rng.randint(1, 4))).title(),
+            "product",
+            rng.randint(0, 5),
+        )
+        for _ in range(300)
+    ]
+
+
+@pytest.mark.parametrize(
+    "prefix", ["d", "de", "dark", "dark r", "es", "bean dark", "best be", "x"]
+)
+@pytest.mark.parametrize("k", [1, 5, 50])
+def test_complete_matches_brute_force(suggestions, prefix, k):
+    index = PrefixIndex(suggestions)
+    assert index.complete(prefix, k) == brute_force(suggestions, prefix, k)
+
+
+def test_complete_normalizes_prefix():
+    index = PrefixIndex(
+        [
+            Suggestion("Whole Bean Coffee", "product", 3, "WB-1"),
+            Suggestion("Bean Co", "brand", 9),
+        ]
+    )
+    assert [s.text for s in index.complete("  BEAN ")] == [
+        "Bean Co",
+        "Whole Bean Coffee",
+    ]
+    assert index.complete("") == []
+    assert index.complete("bean", 0) == []
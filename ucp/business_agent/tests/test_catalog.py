@@ -0,0 +1,124 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import pytest
+from business_agent.catalog import ProductCatalog
+from business_agent.store import SEARCH_PAGE_SIZE
+
+
+@pytest.fixture
+def espresso_feed(records, write_feed):
+    """Sample feed plus a malformed and a valid espresso product."""
+    broken = dict(records[6], productID="ESP-BAD", name="Espresso Broken")
+    broken["offers"] = "call for price"
+    valid = dict(records[7], productID="ESP-OK", name="Espresso Roast")
+    return write_feed([*records, broken, valid])
+
+
+def test_lazy_get_returns_none_for_invalid_record(records):
+    catalog = ProductCatalog(lazy=True)
+    invalid = []
+    catalog.on_invalid = lambda position, error, record: invalid.append(
+        (position, record["productID"])
+    )
+    catalog.add(records[0])
+    catalog.add(dict(records[1], offers="call for price"))
+
+    assert catalog.get(records[0]["productID"]) is not None
+    assert catalog.get(records[1]["productID"]) is None
+    # marked once, then treated as absent
+    assert catalog.get(records[1]["productID"]) is None
+    assert catalog.invalid_positions == [1]
+    assert invalid == [(1, records[1]["productID"])]
+
+
+def test_search_skips_invalid_lazy_record(espresso_feed, make_store):
+    store = make_store(espresso_feed, lazy_validation=True)
+
+    payload = json.loads(store.search_products_json("espresso"))
+    assert [p["productID"] for p in payload["results"]] == ["ESP-OK"]
+    results = store.search_products("espresso broken").results
+    assert [p.product_id for p in results] == ["ESP-OK"]
+    assert store.get_product("ESP-BAD") is None
+    assert store.get_product("ESP-OK") is not None
+
+
+def test_lazy_invalid_record_is_quarantined_on_access(
+    espresso_feed, make_store
+):
+    store = make_store(espresso_feed, lazy_validation=True)
+    report = store.ingest_report
+    assert (report.loaded, report.quarantined) == (10, 0)
+
+    store.search_products("espresso")
+    store.search_products("espresso")
+    assert (report.loaded, report.quarantined) == (9, 1)
+    assert report.errors[0].record["productID"] == "ESP-BAD"
+
+
+def test_eager_ingest_quarantines_invalid_record(espresso_feed, make_store):
+    store = make_store(espresso_feed, lazy_validation=False)
+    report = store.ingest_report
+    assert (report.loaded, report.quarantined) == (9, 1)
+    assert report.errors[0].position == 9
+    assert "ESP-BAD" not in store.catalog
+
+
+def test_search_pages_follow_next_page_token(records, write_feed, make_store):
+    many = [
+        dict(records[6], productID=f"ROAST-{i:03}", name=f"Roast Number {i}")
+        for i in range(45)
+    ]
+    store = make_store(write_feed(many))
+
+    seen, token = [], "0"
+    while token is not None:
+        payload = json.loads(store.search_products_json("roast", page=int(token)))
+        seen += [p["productID"] for p in payload["results"]]
+        token = payload["next_page_token"]
+        assert len(payload["results"]) <= SEARCH_PAGE_SIZE
+    assert sorted(seen) == sorted(p["productID"] for p in many)
+    model = store.search_products("roast", page=2)
+    assert [p.product_id for p in model.results] == seen[40:]
+    assert model.next_page_token is None
+
+
+def test_search_sorts_by_price_and_rating(records, write_feed, make_store):
+    roasts = []
+    for i, (price, rating) in enumerate(
+        [("9.00", 4.1), ("3.50", None), (None, 4.8), ("6.25", 3.0)]
+    ):
+        roast = dict(records[6], productID=f"ROAST-{i}", name=f"Roast {i}")
+        roast["offers"] = dict(roast["offers"])
+        if price is None:
+            del roast["offers"]["price"]
+        else:
+            roast["offers"]["price"] = price
+        if rating is not None:
+            roast["aggregateRating"] = {"ratingValue": rating, "reviewCount": 3}
+        roasts.append(roast)
+    store = make_store(write_feed(roasts))
+
+    def ids(sort_by):
+        payload = json.loads(store.search_products_json("roast", sort_by=sort_by))
+        return [p["productID"] for p in payload["results"]]
+
+    assert ids("price_low") == ["ROAST-1", "ROAST-3", "ROAST-0", "ROAST-2"]
+    assert ids("price_high") == ["ROAST-0", "ROAST-3", "ROAST-1", "ROAST-2"]
+    assert ids("rating") == ["ROAST-2", "ROAST-0", "ROAST-3", "ROAST-1"]
+    # cached per order, relevance order untouched
+    assert ids(None) == ["ROAST-0", "ROAST-1", "ROAST-2", "ROAST-3"]
+    with pytest.raises(ValueError):
+        store.search_products("roast", sort_by="name")
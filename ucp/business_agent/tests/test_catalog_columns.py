@@ -0,0 +1,154 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+from business_agent.catalog_columns import FacetFilters
+
+ISSUER = {"@type": "Organization", "name": "Certifier"}
+FAIR_TRADE = {"name": "Fair Trade", "issuedBy": ISSUER}
+ORGANIC = {"name": "Organic", "issuedBy": ISSUER}
+
+
+@pytest.fixture
+def store(records, write_feed, make_store):
+    """Sample catalog with ratings, certifications and a few gaps."""
+    by_id = {record["productID"]: record for record in records}
+    for product_id, rating in (
+        ("COFFEE-001", 4.5),
+        ("COFFEE-002", 3.8),
+        ("STRAW-001", 4.9),
+    ):
+        by_id[product_id]["aggregateRating"] = {
+            "ratingValue": rating,
+            "reviewCount": 10,
+        }
+    by_id["COFFEE-001"]["hasCertification"] = [FAIR_TRADE, ORGANIC]
+    # a single certification needs no list
+    by_id["COFFEE-002"]["hasCertification"] = FAIR_TRADE
+    by_id["STRAW-001"]["hasCertification"] = [ORGANIC]
+    by_id["CHIPS-001"]["offers"]["availability"] = (
+        "https://schema.org/OutOfStock"
+    )
+    del by_id["NUTRIBAR-001"]["offers"]["price"]
+    return make_store(write_feed(records))
+
+
+def product_ids(store, rows) -> list[str]:
+    entries = store.catalog.entries
+    return [entries[row].product_id for row in rows]
+
+
+def masked(store, **filters) -> set[str]:
+    mask = store.catalog.columns.mask(**filters)
+    return set(product_ids(store, np.flatnonzero(mask)))
+
+
+def test_price_filters_are_inclusive_and_drop_unpriced(store):
+    assert masked(store, min_price_cents=449, max_price_cents=499) == {
+        "BISC-001",
+        "STRAW-001",
+        "SW-CHIPS-001",
+    }
+    assert masked(store, max_price_cents=379) == {"CHIPS-001"}
+    assert "NUTRIBAR-001" not in masked(store, min_price_cents=0)
+
+
+def test_text_facets_match_case_insensitive_fragments(store):
+    assert masked(store, brands=["roastmaster"]) == {"COFFEE-001", "COFFEE-002"}
+    assert masked(store, brands=["cookie", "farm"]) == {
+        "BISC-001",
+        "O-COOKIES-001",
+        "STRAW-001",
+    }
+    assert masked(store, categories=["chips"]) == {"CHIPS-001", "SW-CHIPS-001"}
+    assert masked(store, categories=["furniture"]) == set()
+
+
+def test_certification_filter_matches_any_certification(store):
+    assert masked(store, certifications=["fair trade"]) == {
+        "COFFEE-001",
+        "COFFEE-002",
+    }
+    assert masked(store, certifications=["organic", "fair"]) == {
+        "COFFEE-001",
+        "COFFEE-002",
+        "STRAW-001",
+    }
+
+
+def test_availability_rating_and_combined_filters(store):
+    everything = masked(store)
+    assert len(everything) == 8
+    assert masked(store, availability=["OutOfStock"]) == {"CHIPS-001"}
+    assert masked(store, purchasable=True) == everything - {"CHIPS-001"}
+    # unrated products never pass a rating filter
+    assert masked(store, min_rating=4) == {"COFFEE-001", "STRAW-001"}
+    assert masked(
+        store, brands=["roastmaster"], min_rating=4, max_price_cents=1299
+    ) == {"COFFEE-001"}
+
+
+def test_search_applies_facet_filters(store):
+    filters = FacetFilters(brands=("roastmaster",), max_price_cents=1000)
+    payload = store.search_products_payload("coffee", filters=filters)
+    assert [p["productID"] for p in payload["results"]] == ["COFFEE-002"]
+    assert not FacetFilters()
+    assert filters.mask_kwargs() == {
+        "brands": ("roastmaster",),
+        "max_price_cents": 1000,
+    }
+
+
+def test_facet_counts_most_frequent_first(store):
+    columns = store.catalog.columns
+    counts = columns.facet_counts(np.arange(len(store.catalog)))
+    assert counts["brand"] == [
+        ("CookieCo", 2),
+        ("SaltySnacks", 2),
+        ("RoastMaster", 2),
+        ("FarmFresh", 1),
+        ("HealthEats", 1),
+    ]
+    assert counts["availability"] == [("InStock", 7), ("OutOfStock", 1)]
+    # ties keep the order values first appear in the catalog
+    assert counts["certification"] == [("Organic", 2), ("Fair Trade", 2)]
+
+    rows = np.array([columns.row("COFFEE-002"), columns.row("STRAW-001")])
+    counts = columns.facet_counts(rows, top=1)
+    assert counts["brand"] == [("FarmFresh", 1)]
+    assert counts["category"] == [("Groceries > Fresh Produce > Fruits", 1)]
+    assert counts["certification"] == [("Organic", 1)]
+
+
+def test_sort_puts_missing_values_last(store):
+    columns = store.catalog.columns
+    rows = np.arange(len(store.catalog))
+    by_price = product_ids(store, columns.sort(rows, "price_low"))
+    assert by_price[:2] == ["CHIPS-001", "STRAW-001"]
+    assert by_price[-2:] == ["COFFEE-001", "NUTRIBAR-001"]
+    by_price = product_ids(store, columns.sort(rows, "price_high"))
+    assert by_price[:2] == ["COFFEE-001", "COFFEE-002"]
+    assert by_price[-1] == "NUTRIBAR-001"
+    # unrated products tie and keep their catalog order
+    by_rating = product_ids(store, columns.sort(rows, "rating"))
+    assert by_rating == [
+        "STRAW-001",
+        "COFFEE-001",
+        "COFFEE-002",
+        *(p for p in product_ids(store, rows) if p not in by_rating[:3]),
+    ]
+    assert len(columns.sort(rows[:0], "rating")) == 0
+    with pytest.raises(ValueError):
+        columns.sort(rows, "name")
@@ -0,0 +1,106 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+from collections import Counter
+from click.testing import CliRunner
+from business_agent.catalog_generator import (
+    CatalogSpec,
+    generate_collections,
+    generate_product_groups,
+    generate_products,
+    main,
+    write_catalog,
+)
+from business_agent.models.product_types import (
+    Product,
+    ProductCollection,
+    ProductGroup,
+)
+
+SPEC = CatalogSpec(num_groups=40, min_variants=1, max_variants=4, seed=7)
+
+
+def gtin_is_valid(gtin: str) -> bool:
+    total = sum(
+        int(digit) * (3 if index % 2 else 1)
+        for index, digit in enumerate(gtin[:-1])
+    )
+    return (10 - total % 10) % 10 == int(gtin[-1])
+
+
+def test_products_are_valid_and_reproducible():
+    products = list(generate_products(SPEC))
+    assert products == list(generate_products(SPEC))
+    assert products != list(generate_products(CatalogSpec(num_groups=40)))
+
+    for record in products:
+        Product.model_validate(record)
+        assert gtin_is_valid(record["gtin"])
+    for key in ("productID", "sku", "gtin", "mpn"):
+        assert len({record[key] for record in products}) == len(products)
+
+    variants = Counter(record["inProductGroupWithID"] for record in products)
+    assert len(variants) == SPEC.num_groups
+    assert set(variants.values()) <= set(range(1, 5))
+
+
+def test_groups_nest_the_flat_products():
+    groups = list(generate_product_groups(SPEC))
+    for group in groups:
+        ProductGroup.model_validate(group)
+    nested = [v for group in groups for v in group["hasVariant"]]
+    assert nested == list(generate_products(SPEC))
+
+
+def test_collections_bundle_products():
+    products = list(generate_products(SPEC))
+    collections = list(generate_collections(products, bundle_size=3))
+    assert len(collections) == len(products) // 3
+    for collection in collections:
+        ProductCollection.model_validate(collection)
+        assert len(collection["includesObject"]) == 3
+
+
+def test_generated_feed_loads_into_a_store(tmp_path, make_store):
+    path = tmp_path / "products.json"
+    assert write_catalog(generate_products(SPEC), path) == len(
+        list(generate_products(SPEC))
+    )
+    store = make_store(path)
+    assert store.ingest_report.quarantined == 0
+    assert len(store.catalog) == store.ingest_report.loaded
+
+    group_ids = {
+        record["inProductGroupWithID"] for record in generate_products(SPEC)
+    }
+    hits = store.search_products("coffee").results
+    groups = [hit for hit in hits if isinstance(hit, ProductGroup)]
+    assert groups
+    assert {group.product_group_id for group in groups} <= group_ids
+
+
+def test_cli_writes_validated_ndjson(tmp_path):
+    path = tmp_path / "groups.ndjson"
+    result = CliRunner().invoke(
+        main,
+        [
+            "--output", str(path), "--kind", "groups", "--groups", "5",
+            "--ndjson", "--validate",
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    lines = path.read_text().splitlines()
+    assert len(lines) == 5
+    assert all(json.loads(line)["@type"] == "ProductGroup" for line in lines)
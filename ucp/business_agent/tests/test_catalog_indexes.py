@@ -0,0 +1,64 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import numpy as np
+import pytest
+from business_agent.catalog import ProductCatalog
+from business_agent.catalog_indexes import IndexBuilder, build_indexes
+from business_agent.catalog_ingest import ingest_catalog
+
+
+def streamed(path, lazy):
+    catalog = ProductCatalog(lazy=lazy)
+    builder = IndexBuilder(catalog, semantic_search=False)
+    ingest_catalog(path, catalog, on_added=builder.add)
+    return catalog, builder.build()
+
+
+def assert_same_indexes(indexes, expected):
+    columns, other = indexes["columns"], expected["columns"]
+    for name in ("price_cents", "availability", "rating", "brand", "category"):
+        np.testing.assert_array_equal(
+            getattr(columns, name), getattr(other, name)
+        )
+    assert columns.brands == other.brands
+    assert (
+        indexes["autocomplete"].suggestions
+        == expected["autocomplete"].suggestions
+    )
+    assert indexes["resolver"]._keys == expected["resolver"]._keys
+    np.testing.assert_array_equal(
+        indexes["variants"].row_group, expected["variants"].row_group
+    )
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_ingest_builds_the_tables_of_a_full_pass(records, write_feed, lazy):
+    catalog, indexes = streamed(write_feed(records), lazy)
+    assert_same_indexes(indexes, build_indexes(catalog, semantic_search=False))
+
+
+def test_replaced_record_rebuilds_from_the_catalog(records, write_feed):
+    cheaper = json.loads(json.dumps(records[0]))
+    cheaper["offers"]["price"] = "0.50"
+    cheaper["name"] = "Renamed Cookies"
+    catalog, indexes = streamed(write_feed([*records, cheaper]), lazy=True)
+
+    assert len(catalog) == len(records)
+    row = catalog.position(records[0]["productID"])
+    assert indexes["columns"].price_cents[row] == 50
+    resolver = indexes["resolver"]
+    assert resolver.resolve("renamed cookies") == cheaper["productID"]
+    assert_same_indexes(indexes, build_indexes(catalog, semantic_search=False))
@@ -0,0 +1,149 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import json
+import pytest
+from business_agent.catalog import ProductCatalog
+from business_agent.catalog_ingest import (
+    RecordParseError,
+    ingest_catalog,
+    iter_json_array,
+    map_feed_row,
+)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 20])
+def test_json_array_is_read_incrementally(records, chunk_size):
+    text = json.dumps(records, indent=2)
+    parsed = list(iter_json_array(io.StringIO(text), chunk_size=chunk_size))
+    assert parsed == records
+
+
+def test_truncated_json_array_is_an_error(records):
+    text = json.dumps(records)[:-40]
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO(text), chunk_size=64))
+
+
+def parsed_ids(text: str, chunk_size: int, **kwargs) -> list:
+    return [
+        "error" if isinstance(v, RecordParseError) else v["productID"]
+        for v in iter_json_array(io.StringIO(text), chunk_size, **kwargs)
+    ]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 1 << 20])
+def test_bad_json_array_element_is_skipped(records, chunk_size):
+    good = [json.dumps(r, indent=2) for r in records[:3]]
+    # an unescaped quote and a missing bracket inside the nested offers
+    bad = [
+        '{"productID": "X", "name": "12" Pizza", "offers": [{},{}]}',
+        '{"productID": "Y", "offers": [{"price": "1"}, {"price": "2"}}',
+    ]
+    text = "[" + ",\n".join([good[0], bad[0], good[1], bad[1], good[2]]) + "]"
+    assert parsed_ids(text, chunk_size) == [
+        "BISC-001",
+        "error",
+        "STRAW-001",
+        "error",
+        "CHIPS-001",
+    ]
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ('[{"productID": "A"} {"productID": "B"}]', ["A", "error", "B"]),
+        ('[{"productID": "A"},, {"productID": "B"}]', ["A", "error", "B"]),
+        ('[, {"productID": "A"}]', ["error", "A"]),
+        ('[{"productID": "A"},]', ["A", "error"]),
+        ("[]", []),
+    ],
+)
+def test_json_array_takes_exactly_one_comma(text, expected):
+    assert parsed_ids(text, 3) == expected
+
+
+def test_oversized_json_array_element_is_not_buffered():
+    big = '{"productID": "BIG", "description": "' + "x" * 5000 + '"}'
+    text = f'[{big}, {{"productID": "A"}}]'
+    assert parsed_ids(text, 64, max_record_size=1000) == ["error", "A"]
+    assert parsed_ids(text, 64) == ["BIG", "A"]
+
+
+def test_merchant_feed_row_is_mapped():
+    record = map_feed_row(
+        {
+            "id": "COF-1",
+            "title": "Dark Roast",
+            "price": "12.99 USD",
+            "availability": "in stock",
+            "brand": "AndesBrew",
+            "image_link": "a.jpg, b.jpg",
+            "gtin": "",
+            "unknown_column": "x",
+        }
+    )
+    assert record == {
+        "@type": "Product",
+        "productID": "COF-1",
+        "sku": "COF-1",
+        "name": "Dark Roast",
+        "offers": {
+            "price": "12.99",
+            "priceCurrency": "USD",
+            "availability": "https://schema.org/InStock",
+        },
+        "brand": {"name": "AndesBrew", "@type": "Brand"},
+        "image": ["a.jpg", "b.jpg"],
+    }
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_bad_ndjson_records_are_quarantined(records, tmp_path, lazy):
+    feed = tmp_path / "products.ndjson"
+    lines = [json.dumps(r) for r in records[:3]]
+    lines.insert(1, "{not json")
+    lines.append(json.dumps(["not", "an", "object"]))
+    lines.append(json.dumps(dict(records[3], offers="call for price")))
+    feed.write_text("\n".join(lines) + "\n\n")
+    quarantine = tmp_path / "quarantine.ndjson"
+
+    catalog = ProductCatalog(lazy=lazy)
+    report = ingest_catalog(
+        feed, catalog, validate=True, quarantine_path=quarantine
+    )
+    assert (report.loaded, report.quarantined) == (3, 3)
+    assert [e.position for e in report.errors] == [2, 5, 6]
+    assert len(catalog) == 3
+    rejected = [json.loads(line) for line in quarantine.read_text().splitlines()]
+    assert [r["position"] for r in rejected] == [2, 5, 6]
+    assert rejected[0]["record"].startswith("{not json")
+
+
+def test_csv_feed_is_ingested(tmp_path):
+    feed = tmp_path / "products.csv"
+    feed.write_text(
+        "id,title,price,availability,item_group_id,size\n"
+        "TEA-S,Green Tea Small,4.00 USD,in stock,TEA,small\n"
+        "TEA-L,Green Tea Large,7.50 USD,out of stock,TEA,large\n"
+        ",No ID,1.00 USD,in stock,,\n"
+    )
+    catalog = ProductCatalog()
+    report = ingest_catalog(feed, catalog)
+    assert (report.loaded, report.quarantined) == (2, 1)
+    product = catalog.get("TEA-L")
+    assert product.offers.price == "7.50"
+    assert product.offers.availability.endswith("OutOfStock")
@@ -0,0 +1,129 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import time
+import pytest
+from starlette.applications import Starlette
+from starlette.testclient import TestClient
+from business_agent import http_routes
+from business_agent.discovery import StoreRegistry, StoreSpec
+from business_agent.ucp_contracts_demo import load_ucp_metadata_from_repo
+
+
+def product_ids(store, query: str) -> list[str]:
+    payload = store.search_products_payload(query)
+    return [product["productID"] for product in payload["results"]]
+
+
+def write_changed(write_feed, records) -> None:
+    """Rewrite the feed with a modification time the watcher cannot miss."""
+    path = write_feed(records)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def test_reload_swaps_the_catalog_and_invalidates_caches(
+    records, write_feed, make_store
+):
+    store = make_store(write_feed(records))
+    old_catalog = store.catalog
+    assert product_ids(store, "cookies") == ["BISC-001", "O-COOKIES-001"]
+    assert store.query_cache.stats()["size"]
+
+    write_feed([*records[1:], dict(records[0], productID="BISC-002")])
+    assert store.reload_catalog() == 2
+    assert store.catalog_version == 2
+    assert not store.query_cache.stats()["size"]
+    assert not store.product_json_cache.stats()["size"]
+    assert product_ids(store, "cookies") == ["O-COOKIES-001", "BISC-002"]
+
+    # a search that started before the reload keeps its catalog
+    results = store.search_products("cookies", catalog=old_catalog)
+    assert [p.product_id for p in results.results] == [
+        "BISC-001",
+        "O-COOKIES-001",
+    ]
+
+
+def test_checkout_keeps_its_prices_across_reloads(
+    records, write_feed, make_store
+):
+    store = make_store(write_feed(records))
+    metadata = load_ucp_metadata_from_repo()[0]
+    checkout, _ = store.add_to_checkout(metadata, "COFFEE-001", 1)
+
+    records[6]["offers"]["price"] = "20.00"
+    write_feed(records)
+    store.reload_catalog()
+    checkout = store.get_checkout(checkout.id)
+    assert checkout.line_items[0].item.price == 1299
+
+    checkout, _ = store.add_to_checkout(metadata, "COFFEE-002", 1, checkout.id)
+    assert [line.item.price for line in checkout.line_items] == [1299, 949]
+
+
+def test_failed_reload_keeps_the_current_catalog(
+    records, write_feed, make_store
+):
+    path = write_feed(records)
+    store = make_store(path)
+    path.write_text('{"not": "an array"}')
+
+    with pytest.raises(ValueError):
+        store.reload_catalog()
+    assert store.catalog_version == 1
+    assert len(store.catalog) == len(records)
+
+
+def test_watcher_reloads_when_the_file_changes(
+    records, write_feed, make_store
+):
+    store = make_store(write_feed(records), watch_interval=0.02)
+    try:
+        write_changed(write_feed, records[:2])
+        deadline = time.monotonic() + 5
+        while store.catalog_version == 1 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert store.catalog_version == 2
+        assert len(store.catalog) == 2
+    finally:
+        store.stop_watching()
+
+
+def test_admin_reload_route(records, write_feed, monkeypatch):
+    registry = StoreRegistry(
+        {"north": StoreSpec(str(write_feed(records)))}
+    )
+    monkeypatch.setattr(http_routes, "get_stores", lambda: registry)
+    monkeypatch.setenv(http_routes.ADMIN_TOKEN_ENV, "secret")
+    client = TestClient(Starlette(routes=http_routes.admin_routes()))
+
+    response = client.post("/admin/catalog/reload")
+    assert response.status_code == 403
+
+    headers = {"Authorization": "Bearer secret"}
+    response = client.post("/admin/catalog/reload", headers=headers)
+    # not built yet: building it loads the current file
+    assert response.json() == {"stores": {"north": {"version": 1}}}
+    response = client.post(
+        "/admin/catalog/reload?store_id=north", headers=headers
+    )
+    assert response.json() == {"stores": {"north": {"version": 2}}}
+    response = client.post(
+        "/admin/catalog/reload?store_id=south", headers=headers
+    )
+    assert response.status_code == 404
+    assert json.loads(response.text)["error"] == "Unknown store 'south'"
@@ -0,0 +1,89 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+from business_agent import catalog_snapshot
+from business_agent.catalog import ProductCatalog
+from business_agent.catalog_snapshot import (
+    SnapshotCatalog,
+    build_snapshot,
+    load_snapshot_if_fresh,
+    verify_snapshot,
+)
+
+
+def test_fresh_snapshot_serves_persisted_indexes(
+    records, write_feed, make_store
+):
+    feed = write_feed(records)
+    plain = make_store(feed, semantic_search=True)
+    verify_snapshot(build_snapshot(feed))
+
+    store = make_store(feed, semantic_search=True)
+    assert isinstance(store.catalog, SnapshotCatalog)
+    assert store.ingest_report.loaded == len(records)
+    assert store.catalog.columns.catalog is store.catalog
+    for query in ("coffee", "cookies", "dark roast", "cokies"):
+        assert store.search_products_json(query) == plain.search_products_json(
+            query
+        )
+    assert store.resolve_product_id("Chocochip Cookies") == "BISC-001"
+
+
+def test_snapshot_without_semantic_search(records, write_feed, make_store):
+    feed = write_feed(records)
+    build_snapshot(feed)
+    store = make_store(feed, semantic_search=False)
+    assert isinstance(store.catalog, SnapshotCatalog)
+    assert store.catalog.semantic_index is None
+
+
+def test_stale_snapshot_falls_back_to_feed(records, write_feed, make_store):
+    feed = write_feed(records)
+    build_snapshot(feed)
+    write_feed([*records, dict(records[0], productID="NEW-001")])
+
+    assert load_snapshot_if_fresh(feed) is None
+    store = make_store(feed)
+    assert type(store.catalog) is ProductCatalog
+    assert "NEW-001" in store.catalog
+
+
+def test_snapshot_of_other_code_falls_back_to_feed(
+    records, write_feed, make_store, monkeypatch
+):
+    feed = write_feed(records)
+    with monkeypatch.context() as patch:
+        patch.setattr(catalog_snapshot, "format_version", lambda: "older")
+        build_snapshot(feed)
+        assert load_snapshot_if_fresh(feed) is not None
+
+    assert load_snapshot_if_fresh(feed) is None
+    store = make_store(feed)
+    assert type(store.catalog) is ProductCatalog
+    assert store.resolve_product_id("Chocochip Cookies") == "BISC-001"
+
+
+def test_corrupt_indexes_are_rebuilt(records, write_feed, make_store):
+    feed = write_feed(records)
+    path = build_snapshot(feed)
+    offset = SnapshotCatalog(path).header["sections"]["indexes"]["offset"]
+    data = bytearray(path.read_bytes())
+    data[offset + 10] ^= 0xFF
+    path.write_bytes(data)
+
+    store = make_store(feed)
+    assert isinstance(store.catalog, SnapshotCatalog)
+    payload = json.loads(store.search_products_json("cookies"))
+    assert payload["results"]
@@ -0,0 +1,58 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from business_agent.catalog_columns import NO_PRICE, price_to_cents
+from business_agent.ucp_contracts_demo import load_ucp_metadata_from_repo
+
+
+@pytest.mark.parametrize(
+    "price, cents",
+    [
+        ("12.99", 1299),
+        ("3", 300),
+        ("1.005", 101),
+        ("0.125", 13),
+        ("0.124", 12),
+        (2.675, 268),
+        ("", NO_PRICE),
+        ("call for price", NO_PRICE),
+        (None, NO_PRICE),
+    ],
+)
+def test_price_to_cents_rounds_half_up(price, cents):
+    assert price_to_cents(price) == cents
+
+
+def test_line_item_is_priced_from_the_catalog_of_its_product(
+    records, write_feed, make_store, monkeypatch
+):
+    path = write_feed(records)
+    store = make_store(path)
+    metadata = load_ucp_metadata_from_repo()[0]
+
+    # the catalog is reloaded with a new price while the item is added
+    get_product = store.get_product
+
+    def get_product_then_reload(*args):
+        product = get_product(*args)
+        records[6]["offers"]["price"] = "99.99"
+        write_feed(records)
+        store.reload_catalog()
+        return product
+
+    monkeypatch.setattr(store, "get_product", get_product_then_reload)
+    checkout, _ = store.add_to_checkout(metadata, "COFFEE-001", 1)
+    assert checkout.line_items[0].item.price == 1299
+    assert store.catalog.columns.price_cents_of("COFFEE-001") == 9999
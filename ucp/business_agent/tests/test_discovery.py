@@ -0,0 +1,168 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from business_agent import discovery
+from business_agent.discovery import (
+    REQUIRED_CHECKOUT_CAPABILITY,
+    StoreRegistry,
+    StoreSpec,
+    federated_search,
+)
+from business_agent.models.product_types import Product, ProductResults
+
+
+class FakeStore:
+    """Store answering with fixed results, optionally after an event."""
+
+    def __init__(self, prices, checkout=False, release=None):
+        self.results = [
+            Product.model_validate(
+                {
+                    "productID": f"P{i}",
+                    "name": f"Product {i}",
+                    "sku": f"SKU-{i}",
+                    "offers": {"price": price, "priceCurrency": "USD"},
+                }
+            )
+            for i, price in enumerate(prices)
+        ]
+        self.checkout = checkout
+        self.release = release
+        self.calls = 0
+
+    def supports(self, capability: str) -> bool:
+        return self.checkout and capability == REQUIRED_CHECKOUT_CAPABILITY
+
+    def search_products(self, query: str) -> ProductResults:
+        self.calls += 1
+        if self.release is not None:
+            self.release.wait(5)
+        return ProductResults(results=self.results)
+
+
+def hits(results):
+    return [(hit.store_id, hit.product.product_id) for hit in results.hits]
+
+
+def test_hits_keep_each_store_ranking():
+    stores = {
+        # ranked by relevance, not by price
+        "north": FakeStore(["9.00", "1.00"], checkout=True),
+        "south": FakeStore(["5.00", "2.00", "3.00"]),
+    }
+    results = asyncio.run(federated_search(stores, "product"))
+    assert hits(results) == [
+        ("south", "P0"),
+        ("north", "P0"),
+        ("north", "P1"),
+        ("south", "P1"),
+        ("south", "P2"),
+    ]
+    assert [hit.rank for hit in results.hits] == [0, 0, 1, 1, 2]
+
+
+def test_stalled_store_is_skipped_until_it_answers():
+    release = threading.Event()
+    slow = FakeStore(["1.00"], release=release)
+    stores = {"fast": FakeStore(["2.00"]), "slow": slow}
+
+    results = asyncio.run(federated_search(stores, "product", timeout=0.05))
+    assert results.timed_out == ["slow"]
+    assert hits(results) == [("fast", "P0")]
+
+    # the timed-out search still runs: no second search is queued
+    results = asyncio.run(federated_search(stores, "product", timeout=0.05))
+    assert results.timed_out == ["slow"]
+    assert slow.calls == 1
+
+    release.set()
+    for _ in range(100):
+        results = asyncio.run(federated_search(stores, "product", timeout=1))
+        if not results.timed_out:
+            break
+    assert hits(results) == [("slow", "P0"), ("fast", "P0")]
+    assert slow.calls == 2
+
+
+@pytest.fixture
+def builds(monkeypatch) -> list[str]:
+    """Products files of the stores built by registries, in build order."""
+    builds = []
+    store_class = discovery.RetailStore
+
+    def build(**kwargs):
+        builds.append(kwargs["products_filename"])
+        time.sleep(0.05)  # long enough for concurrent callers to pile up
+        return store_class(watch_interval=0, **kwargs)
+
+    monkeypatch.setattr(discovery, "RetailStore", build)
+    return builds
+
+
+@pytest.fixture
+def registry(records, write_feed, builds) -> StoreRegistry:
+    """Registry of two stores over sample feeds."""
+    return StoreRegistry(
+        {
+            "north": StoreSpec(
+                str(write_feed(records, "north.json")),
+                frozenset({REQUIRED_CHECKOUT_CAPABILITY}),
+            ),
+            "south": StoreSpec(str(write_feed(records[:4], "south.json"))),
+        }
+    )
+
+
+def test_registry_builds_stores_on_first_use(registry, builds):
+    assert list(registry) == ["north", "south"]
+    assert registry.supports("north", REQUIRED_CHECKOUT_CAPABILITY)
+    assert not registry.supports("south", REQUIRED_CHECKOUT_CAPABILITY)
+    assert not registry.is_built("north")
+    assert builds == []
+
+    with ThreadPoolExecutor(4) as pool:
+        stores = list(pool.map(lambda _: registry["north"], range(4)))
+    assert all(store is stores[0] for store in stores)
+    assert len(builds) == 1
+    assert registry.is_built("north")
+    assert not registry.is_built("south")
+
+
+def test_failed_build_is_retried(registry, monkeypatch):
+    build = discovery.RetailStore
+    monkeypatch.setattr(discovery, "RetailStore", lambda **kwargs: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        registry["south"]
+    assert not registry.is_built("south")
+
+    monkeypatch.setattr(discovery, "RetailStore", build)
+    assert len(registry["south"].catalog) == 4
+
+
+def test_warm_builds_every_store_and_the_offer_index(registry, builds):
+    registry.warm()
+    assert registry.is_built("north") and registry.is_built("south")
+    assert len(builds) == 2
+    index = registry.offer_index()
+    assert index.store_ids == ["north", "south"]
+
+    # reused until a catalog is reloaded
+    assert registry.offer_index() is index
+    registry["south"].reload_catalog()
+    assert registry.offer_index() is not index
@@ -0,0 +1,98 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from google.adk.models.llm_request import LlmRequest
+from google.genai import types
+from business_agent.history import (
+    SUMMARY_REQUESTS,
+    HistoryCompactor,
+    compact_history,
+)
+
+
+def turn(number: int) -> list[types.Content]:
+    """A user request, a tool call and its result, and the answer."""
+    return [
+        types.Content(role="user", parts=[types.Part(text=f"request {number}")]),
+        types.Content(
+            role="model",
+            parts=[
+                types.Part(
+                    function_call=types.FunctionCall(name="get_checkout", args={})
+                )
+            ],
+        ),
+        types.Content(
+            role="user",
+            parts=[
+                types.Part(
+                    function_response=types.FunctionResponse(
+                        name="get_checkout", response={"n": number}
+                    )
+                )
+            ],
+        ),
+        types.Content(role="model", parts=[types.Part(text=f"answer {number}")]),
+    ]
+
+
+def conversation(turns: int) -> list[types.Content]:
+    return [content for number in range(turns) for content in turn(number)]
+
+
+def test_short_history_is_kept():
+    contents = conversation(3)
+    assert compact_history(contents, keep_turns=3) is contents
+    assert compact_history(contents, keep_turns=0) is contents
+
+
+def test_old_turns_are_summarized():
+    contents = conversation(5)
+    compacted = compact_history(contents, keep_turns=2, state_summary="Cart: 1")
+
+    summary, *kept = compacted
+    assert kept == contents[-8:]
+    text = summary.parts[0].text
+    assert summary.role == "user"
+    assert "3 earlier turns" in text
+    assert "User: request 0" in text and "User: request 2" in text
+    assert "request 3" not in text
+    assert text.endswith("Cart: 1")
+
+
+def test_summary_lists_the_latest_requests():
+    text = compact_history(conversation(SUMMARY_REQUESTS + 5), 1)[0].parts[0].text
+    assert "4 older requests omitted." in text
+    assert "User: request 3\n" not in text
+    assert f"User: request {SUMMARY_REQUESTS + 3}" in text
+
+
+def test_compactor_rewrites_the_request():
+    summaries = []
+
+    def summarize(callback_context):
+        summaries.append(callback_context)
+        return "Selected store: cafe_con_alma."
+
+    compactor = HistoryCompactor(keep_turns=2, summarize=summarize)
+    request = LlmRequest(contents=conversation(2))
+    compactor("ctx", request)
+    assert len(request.contents) == 8
+    assert summaries == []
+
+    request = LlmRequest(contents=conversation(4))
+    compactor("ctx", request)
+    assert len(request.contents) == 9
+    assert summaries == ["ctx"]
+    assert "cafe_con_alma" in request.contents[0].parts[0].text
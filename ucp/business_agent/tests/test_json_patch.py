@@ -0,0 +1,114 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import json
+from types import SimpleNamespace
+import pytest
+from business_agent import agent
+from business_agent.constants import (
+    ADK_CHECKOUT_ACK_STATE,
+    ADK_SELECTED_STORE_ID,
+    ADK_UCP_METADATA_STATE,
+    UCP_CHECKOUT_KEY,
+    UCP_CHECKOUT_PATCH_KEY,
+    UCP_CHECKOUT_VERSION_KEY,
+)
+from business_agent.json_patch import make_patch
+from business_agent.ucp_contracts_demo import load_ucp_metadata_from_repo
+
+
+def apply_patch(document, operations):
+    """Apply add/remove/replace operations, as an RFC 6902 client would."""
+    document = copy.deepcopy(document)
+    for op in operations:
+        if op["path"] == "":
+            document = copy.deepcopy(op["value"])
+            continue
+        *parents, last = op["path"][1:].split("/")
+        last = last.replace("~1", "/").replace("~0", "~")
+        node = document
+        for token in parents:
+            token = token.replace("~1", "/").replace("~0", "~")
+            node = node[int(token)] if isinstance(node, list) else node[token]
+        if isinstance(node, list):
+            if op["op"] == "remove":
+                del node[int(last)]
+            elif last == "-":
+                node.append(op["value"])
+            else:
+                node[int(last)] = op["value"]
+        elif op["op"] == "remove":
+            del node[last]
+        else:
+            node[last] = op["value"]
+    return document
+
+
+@pytest.mark.parametrize(
+    ("source", "target"),
+    [
+        ({"a": 1}, {"a": 1}),
+        ({"a": 1, "b": 2}, {"a": 3, "c": 4}),
+        ({"a/b": 1, "c~d": {"e": 1}}, {"a/b": 2, "c~d": {"e": 2}}),
+        ({"items": [1, 2, 3]}, {"items": [1, 5]}),
+        ({"items": [{"q": 1}]}, {"items": [{"q": 2}, {"q": 3}, {"q": 4}]}),
+        ({"total": 1}, {"total": 1.0}),
+        ({"x": True}, {"x": 1}),
+        ({"x": {"y": 1}}, {"x": [1]}),
+        ([1, 2], {"a": 1}),
+    ],
+)
+def test_patch_turns_source_into_target(source, target):
+    patch = make_patch(source, target)
+    result = apply_patch(source, patch)
+    assert result == target
+    assert [type(v) for v in _leaves(result)] == [
+        type(v) for v in _leaves(target)
+    ]
+    assert (patch == []) == (json.dumps(source) == json.dumps(target))
+
+
+def _leaves(value):
+    if isinstance(value, dict):
+        return [leaf for v in value.values() for leaf in _leaves(v)]
+    if isinstance(value, list):
+        return [leaf for v in value for leaf in _leaves(v)]
+    return [value]
+
+
+def test_checkout_patch_applies_to_acknowledged_version():
+    ctx = SimpleNamespace(
+        state={
+            ADK_SELECTED_STORE_ID: "cafe_con_alma",
+            ADK_UCP_METADATA_STATE: load_ucp_metadata_from_repo()[0],
+        }
+    )
+    first = agent.add_to_checkout(ctx, "COF-GR-001")
+    second = agent.add_to_checkout(ctx, "COF-GR-001", quantity=2)
+    base = first[UCP_CHECKOUT_KEY]
+    ctx.state[ADK_CHECKOUT_ACK_STATE] = {
+        "id": base["id"],
+        "version": first[UCP_CHECKOUT_VERSION_KEY],
+    }
+
+    patched = agent._as_checkout_patch(ctx, second)
+    assert UCP_CHECKOUT_KEY not in patched
+    patch = patched[UCP_CHECKOUT_PATCH_KEY]
+    assert patch["base_version"] == first[UCP_CHECKOUT_VERSION_KEY]
+    assert apply_patch(base, patch["operations"]) == second[UCP_CHECKOUT_KEY]
+
+    # no patch against another checkout
+    ctx.state[ADK_CHECKOUT_ACK_STATE] = {"id": "other", "version": 1}
+    assert agent._as_checkout_patch(ctx, second) is second
@@ -0,0 +1,91 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from business_agent.offer_index import OfferIndex
+
+
+def product(product_id: str, price: str, **identifiers) -> dict:
+    return {
+        "@type": "Product",
+        "productID": product_id,
+        "name": f"Product {product_id}",
+        "sku": f"SKU-{product_id}",
+        "offers": {
+            "@type": "Offer",
+            "price": price,
+            "priceCurrency": "USD",
+            "availability": "https://schema.org/InStock",
+        },
+        **identifiers,
+    }
+
+
+@pytest.fixture
+def index(write_feed, make_store) -> OfferIndex:
+    north = [
+        product("BEANS", "10.00", gtin="0001", mpn="MPN-1", sku="SKU-1"),
+        product("DECAF", "12.00", gtin="0002", mpn="MPN-2"),
+        product("LOOSE", "5.00", mpn="MPN-3"),
+    ]
+    south = [
+        product("BEANS-S", "9.00", gtin="0001", mpn="MPN-1"),
+        # same MPN, another GTIN: another item
+        product("DECAF-S", "11.00", gtin="0009", mpn="MPN-2"),
+        # no GTIN: linked by MPN
+        product("LOOSE-S", "4.00", mpn="MPN-3"),
+        # the product ID and SKU of another item at the north store
+        product("BEANS", "20.00", gtin="0003", sku="SKU-1"),
+    ]
+    stores = {
+        "north": make_store(write_feed(north, "north.json")),
+        "south": make_store(write_feed(south, "south.json")),
+    }
+    return OfferIndex(stores, supports_checkout=lambda sid: sid == "north")
+
+
+def offer_ids(offers) -> list[tuple[str, str]]:
+    return [(offer.store_id, offer.product_id) for offer in offers]
+
+
+def test_links_by_gtin(index):
+    assert offer_ids(index.offers("0001")) == [
+        ("south", "BEANS-S"),
+        ("north", "BEANS"),
+    ]
+    assert index.best_offer("0001").store_id == "south"
+    assert index.best_offer("0001", require_checkout=True).store_id == "north"
+
+
+def test_mpn_links_only_records_without_gtin(index):
+    assert offer_ids(index.offers("0002")) == [("north", "DECAF")]
+    assert offer_ids(index.offers("0009")) == [("south", "DECAF-S")]
+    # the MPN of two items is ambiguous
+    assert index.offers("MPN-2") == []
+    assert offer_ids(index.offers("MPN-3")) == [
+        ("south", "LOOSE-S"),
+        ("north", "LOOSE"),
+    ]
+
+
+def test_product_ids_are_per_store(index):
+    assert offer_ids(index.offers("BEANS", "north")) == [
+        ("south", "BEANS-S"),
+        ("north", "BEANS"),
+    ]
+    assert offer_ids(index.offers("BEANS", "south")) == [("south", "BEANS")]
+    assert offer_ids(index.offers("SKU-1", "south")) == [("south", "BEANS")]
+    # used by two stores for different items
+    assert index.offers("BEANS") == []
+    assert len(index.offers("DECAF-S")) == 1
@@ -0,0 +1,83 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from business_agent.catalog import CatalogEntry
+from business_agent.product_resolver import ProductResolver
+
+
+def record(product_id: str, name: str, **identifiers) -> tuple:
+    entry = CatalogEntry(product_id, name.lower(), "")
+    return entry, {"productID": product_id, "name": name, **identifiers}
+
+
+@pytest.fixture
+def resolver() -> ProductResolver:
+    return ProductResolver(
+        [
+            record(
+                "COF-ESP-001",
+                "Espresso Blend Whole Bean Coffee",
+                gtin="4444444444441",
+                sku="ESP-COF-001",
+                mpn="UG-ESP-001",
+            ),
+            record(
+                "COF-GR-001",
+                "Colombian Ground Coffee",
+                gtin="1111111111111",
+                sku="GR-COF-001",
+                mpn="AB-GR-001",
+            ),
+            record("COF-GR-002", "Colombian Ground Decaf", mpn="AB-GR-001"),
+        ]
+    )
+
+
+@pytest.mark.parametrize(
+    "reference, product_id",
+    [
+        ("COF-ESP-001", "COF-ESP-001"),
+        ("cof esp 001", "COF-ESP-001"),
+        ("4444444444441", "COF-ESP-001"),
+        ("ESP-COF-001", "COF-ESP-001"),
+        ("UG-ESP-001", "COF-ESP-001"),
+        ("Espresso Blend Whole Bean Coffee", "COF-ESP-001"),
+        # typos in names
+        ("Espreso Blend Whole Bean Cofee", "COF-ESP-001"),
+    ],
+)
+def test_resolves_references(resolver, reference, product_id):
+    assert resolver.resolve(reference) == product_id
+
+
+@pytest.mark.parametrize(
+    "reference",
+    [
+        # identifier codes one character off are other products
+        "4444444444442",
+        "ESP-COF-002",
+        "UG-ESP-002",
+        # product IDs too: a near miss is a sibling or an unknown product
+        "COF-ESP-01",
+        "COF-GR-003",
+        "COF-ESP-009",
+        # shared by two products
+        "AB-GR-001",
+        "unknown product",
+        "",
+    ],
+)
+def test_does_not_resolve(resolver, reference):
+    assert resolver.resolve(reference) is None
@@ -0,0 +1,83 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from business_agent.query_cache import QueryCache, normalize_query
+
+
+def test_concurrent_misses_compute_once():
+    cache = QueryCache("test-single-flight")
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "payload"
+
+    with ThreadPoolExecutor(4) as pool:
+        first = pool.submit(cache.get_or_compute, "key", compute)
+        started.wait(5)
+        others = [
+            pool.submit(cache.get_or_compute, "key", compute) for _ in range(3)
+        ]
+        release.set()
+        values = [first.result()] + [f.result() for f in others]
+
+    assert values == ["payload"] * 4
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] + stats["coalesced"] == 3
+
+
+def test_failures_are_not_cached():
+    cache = QueryCache("test-failures")
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        cache.get_or_compute("key", fail)
+    assert cache.get_or_compute("key", lambda: "ok") == "ok"
+
+
+def test_least_recently_used_is_evicted():
+    cache = QueryCache("test-lru", max_size=2)
+    cache.get_or_compute("a", lambda: 1)
+    cache.get_or_compute("b", lambda: 2)
+    cache.get_or_compute("a", lambda: 0)
+    cache.get_or_compute("c", lambda: 3)
+    assert cache.get_or_compute("a", lambda: 0) == 1
+    assert cache.get_or_compute("b", lambda: 0) == 0
+
+
+def test_normalize_query():
+    assert normalize_query("  Dark   ROAST ") == "dark roast"
+
+
+def test_store_payloads_are_shared_until_reload(records, write_feed, make_store):
+    store = make_store(write_feed(records))
+
+    payload = store.search_products_payload("Cookies")
+    assert store.search_products_payload(" cookies ") is payload
+    assert payload == json.loads(store.search_products_json("cookies"))
+
+    store.reload_catalog()
+    assert store.search_products_payload("cookies") is not payload
+    assert store.search_products_payload("cookies") == payload
@@ -0,0 +1,75 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+
+def result_ids(results) -> list[str]:
+    return [item.product_id for item in results.results]
+
+
+@pytest.fixture
+def store(records, write_feed, make_store):
+    records[7]["name"] = "Smooth Dark Roast Coffee"
+    records.append(
+        dict(
+            records[6],
+            productID="GOLD-001",
+            sku="GOLD-001",
+            name="Gold Instant Coffee",
+        )
+    )
+    return make_store(write_feed(records))
+
+
+@pytest.mark.parametrize(
+    "query, product_ids, corrected",
+    [
+        ("cookeis", ["BISC-001", "O-COOKIES-001"], "'cookeis' -> 'cookies'"),
+        ("strawberies", ["STRAW-001"], "'strawberies' -> 'strawberries'"),
+        ("cheap arabca", ["COFFEE-001"], "'arabca' -> 'arabica'"),
+    ],
+)
+def test_misspelled_keywords_are_corrected(store, query, product_ids, corrected):
+    results = store.search_products(query)
+    assert sorted(result_ids(results)) == product_ids
+    assert results.content == f"Showing results for {corrected}."
+
+
+def test_keyword_next_to_matching_ones_is_not_corrected(store):
+    results = store.search_products(
+        "something smooth and chocolatey for cold brew"
+    )
+    assert result_ids(results) == ["COFFEE-002"]
+    assert results.content is None
+
+
+def test_common_word_is_not_corrected(store):
+    results = store.search_products("cold")
+    assert results.results == []
+
+
+@pytest.mark.parametrize(
+    "query, product_id",
+    [("juicy", "STRAW-001"), ("rich and bold", "COFFEE-002")],
+)
+def test_semantic_search_matches_by_meaning(
+    records, write_feed, make_store, query, product_id
+):
+    # only the descriptions carry these words
+    path = write_feed(records)
+    assert make_store(path).search_products(query).results == []
+
+    results = make_store(path, semantic_search=True).search_products(query)
+    assert result_ids(results)[0] == product_id
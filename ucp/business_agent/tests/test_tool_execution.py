@@ -0,0 +1,62 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import inspect
+import threading
+from types import SimpleNamespace
+from business_agent.tool_execution import CheckoutLocks, off_loop, serialized
+
+
+def lookup(tool_context, query: str) -> dict:
+    """Look something up."""
+    return {"query": query, "thread": threading.current_thread().name}
+
+
+def test_off_loop_runs_on_the_tool_pool_and_keeps_the_signature():
+    tool = off_loop(lookup)
+    assert tool.__name__ == "lookup"
+    assert tool.__doc__ == lookup.__doc__
+    assert list(inspect.signature(tool).parameters) == ["tool_context", "query"]
+
+    result = asyncio.run(tool(None, query="beans"))
+    assert result["query"] == "beans"
+    assert result["thread"].startswith("tool")
+
+
+def test_serialized_calls_of_one_checkout_do_not_overlap():
+    running = {"a": 0, "b": 0}
+    peaks = {"a": 0, "b": 0, "all": 0}
+    locks = CheckoutLocks()
+
+    @serialized(lambda ctx: ctx.state["checkout"], locks)
+    async def update(tool_context):
+        key = tool_context.state["checkout"]
+        running[key] += 1
+        peaks[key] = max(peaks[key], running[key])
+        peaks["all"] = max(peaks["all"], sum(running.values()))
+        await asyncio.sleep(0.01)
+        running[key] -= 1
+
+    async def main():
+        await asyncio.gather(
+            *(
+                update(tool_context=SimpleNamespace(state={"checkout": key}))
+                for key in "abab"
+            )
+        )
+
+    asyncio.run(main())
+    # the two checkouts still ran concurrently
+    assert peaks == {"a": 1, "b": 1, "all": 2}
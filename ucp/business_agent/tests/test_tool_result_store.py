@@ -0,0 +1,62 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from business_agent import tool_result_store
+from business_agent.tool_result_store import ToolResultStore
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable monotonic clock of the store module."""
+    now = [0.0]
+    monkeypatch.setattr(tool_result_store.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_result_is_taken_once(clock):
+    results = ToolResultStore(ttl=10)
+    results.put("s1", "turn-1", {"a": 1})
+    results.put("s1", "turn-1", {"a": 2})
+    results.put("s2", "turn-1", {"b": 1})
+
+    assert results.take("s1", "turn-1") == {"a": 2}
+    assert results.take("s1", "turn-1") is None
+    assert results.take("s2", "turn-1") == {"b": 1}
+    assert len(results) == 0
+
+
+def test_results_expire(clock):
+    results = ToolResultStore(ttl=10)
+    results.put("s1", "turn-1", "old")
+    clock[0] = 5
+    results.put("s1", "turn-2", "new")
+
+    clock[0] = 11
+    assert results.take("s1", "turn-1") is None
+    assert results.take("s1", "turn-2") == "new"
+
+
+def test_oldest_results_are_dropped_beyond_the_bound(clock):
+    results = ToolResultStore(ttl=10, max_results=3)
+    for turn in range(5):
+        results.put("s1", f"turn-{turn}", turn)
+
+    assert len(results) == 3
+    assert results.take("s1", "turn-1") is None
+    assert [results.take("s1", f"turn-{turn}") for turn in (2, 3, 4)] == [
+        2,
+        3,
+        4,
+    ]
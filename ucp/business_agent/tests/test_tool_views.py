@@ -0,0 +1,115 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+from business_agent.constants import (
+    FEDERATED_RESULTS_KEY,
+    UCP_CHECKOUT_KEY,
+    UCP_CHECKOUT_VERSION_KEY,
+)
+from business_agent.tool_views import (
+    PRODUCT_RESULTS_KEY,
+    estimate_tokens,
+    model_view,
+)
+
+
+def search_result(records: list[dict]) -> dict:
+    return {
+        PRODUCT_RESULTS_KEY: {
+            "content": None,
+            "hints": ["brand: RoastMaster (2)"],
+            "results": records,
+            "next_page_token": "1",
+        }
+    }
+
+
+def test_products_are_projected(records):
+    result = search_result(records[6:7])
+    original = copy.deepcopy(result)
+
+    view = model_view(result)
+    assert result == original
+    assert view[PRODUCT_RESULTS_KEY]["results"] == [
+        {
+            "productID": "COFFEE-001",
+            "name": "Premium Arabica Coffee Beans",
+            "brand": "RoastMaster",
+            "price": "12.99 USD",
+            "availability": "InStock",
+        }
+    ]
+    assert view[PRODUCT_RESULTS_KEY]["next_page_token"] == "1"
+    assert "content" not in view[PRODUCT_RESULTS_KEY]
+
+
+def test_views_fit_the_token_budget(records):
+    many = [
+        dict(records[i % len(records)], productID=f"P-{i}") for i in range(60)
+    ]
+    view = model_view(search_result(many), budget=400)
+    products = view[PRODUCT_RESULTS_KEY]
+    assert estimate_tokens(view) <= 400
+    assert 1 <= len(products["results"]) < 60
+    assert products["omitted"].startswith(f"{60 - len(products['results'])} more")
+    # best matches are kept
+    assert products["results"][0]["productID"] == "P-0"
+
+    hits = [
+        {"store_id": "s", "supports_ucp_checkout": True, "product": p}
+        for p in many
+    ]
+    view = model_view({FEDERATED_RESULTS_KEY: hits}, budget=400)
+    assert estimate_tokens(view) <= 400
+    assert view[FEDERATED_RESULTS_KEY][0]["store_id"] == "s"
+
+
+def test_checkout_view_keeps_totals_and_drops_version():
+    checkout = {
+        "id": "chk-1",
+        "status": "ready_for_complete",
+        "currency": "USD",
+        "line_items": [
+            {
+                "item": {"id": "COF-GR-001", "title": "Ground", "image": "x"},
+                "quantity": 2,
+                "totals": [
+                    {"type": "subtotal", "amount": 1800},
+                    {"type": "total", "amount": 1900},
+                ],
+            }
+        ],
+        "totals": [{"type": "total", "amount": 1900}],
+        "payment": {"handlers": [{"config": "large"}]},
+    }
+    view = model_view(
+        {UCP_CHECKOUT_KEY: checkout, UCP_CHECKOUT_VERSION_KEY: 3, "status": "ok"}
+    )
+    assert UCP_CHECKOUT_VERSION_KEY not in view
+    assert view["status"] == "ok"
+    assert view[UCP_CHECKOUT_KEY] == {
+        "id": "chk-1",
+        "status": "ready_for_complete",
+        "currency": "USD",
+        "line_items": [
+            {
+                "product_id": "COF-GR-001",
+                "title": "Ground",
+                "quantity": 2,
+                "total": 1900,
+            }
+        ],
+        "totals": {"total": 1900},
+    }
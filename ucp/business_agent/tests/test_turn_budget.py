@@ -0,0 +1,91 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from types import SimpleNamespace
+from google.adk.tools.base_tool import BaseTool
+from business_agent.agent import root_agent
+from business_agent.agent_executor import ADKAgentExecutor
+from business_agent.turn_budget import STOP_MESSAGE, TurnBudget
+
+GET_CHECKOUT = BaseTool(name="get_checkout", description="Get the checkout")
+
+
+def context(
+    version: int = 0, invocation_id: str = "invocation-1"
+) -> SimpleNamespace:
+    return SimpleNamespace(
+        invocation_id=invocation_id,
+        session=SimpleNamespace(id="session-1"),
+        state={"version": version},
+    )
+
+
+def test_identical_calls_trip_at_the_same_state():
+    budget = TurnBudget(max_repeats=2, state_marker=lambda ctx: ctx.state)
+
+    assert budget.before_tool(GET_CHECKOUT, {}, context()) is None
+    assert budget.before_tool(GET_CHECKOUT, {}, context()) is None
+    refused = budget.before_tool(GET_CHECKOUT, {}, context())
+    assert refused["status"] == "error"
+    assert "repeated_call" in refused["message"]
+
+    # one more model call to answer, then the turn ends
+    ctx = context()
+    assert budget.before_model(ctx, None) is None
+    stop = budget.before_model(ctx, None)
+    assert stop.content.parts[0].text == STOP_MESSAGE
+
+
+def test_calls_after_a_state_change_are_not_repeats():
+    budget = TurnBudget(max_repeats=2, state_marker=lambda ctx: ctx.state)
+
+    for version in range(5):
+        assert budget.before_tool(GET_CHECKOUT, {}, context(version)) is None
+        assert budget.before_tool(GET_CHECKOUT, {}, context(version)) is None
+
+
+def test_overlapping_invocations_of_a_session_have_their_own_budget():
+    budget = TurnBudget(max_tool_calls=2)
+    first, second = context(), context(invocation_id="invocation-2")
+
+    for _ in range(2):
+        assert budget.before_tool(GET_CHECKOUT, {}, first) is None
+        assert budget.before_tool(GET_CHECKOUT, {"n": 1}, second) is None
+    assert budget.before_tool(GET_CHECKOUT, {"n": 2}, first) is not None
+
+    # finishing one turn leaves the other running, and a new one fresh
+    budget.finish("invocation-2")
+    assert budget.before_tool(GET_CHECKOUT, {"n": 3}, first) is not None
+    assert budget.before_tool(GET_CHECKOUT, {}, second) is None
+
+
+def test_executors_do_not_modify_the_shared_agent():
+    tool_callbacks = root_agent.canonical_before_tool_callbacks
+    model_callbacks = root_agent.canonical_before_model_callbacks
+
+    for _ in range(2):
+        executor = ADKAgentExecutor(root_agent, [], history_turns=4)
+        assert executor.agent is not root_agent
+        assert executor.agent.canonical_before_tool_callbacks == [
+            *tool_callbacks,
+            executor.turn_budget.before_tool,
+        ]
+        added = executor.agent.canonical_before_model_callbacks[
+            len(model_callbacks) :
+        ]
+        assert added[0] == executor.turn_budget.before_model
+        assert len(added) == 2  # and the history compactor
+
+    assert root_agent.canonical_before_tool_callbacks == tool_callbacks
+    assert root_agent.canonical_before_model_callbacks == model_callbacks
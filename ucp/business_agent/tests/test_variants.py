@@ -0,0 +1,105 @@
+# Copyright 2026 UCP Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import pytest
+from business_agent.variant_index import VariantSelectionError
+
+
+def variant(base: dict, product_id: str, size: str, grind: str, price: str):
+    record = dict(base, productID=product_id, sku=product_id)
+    record["name"] = f"House Blend {size} {grind}"
+    record["offers"] = dict(base["offers"], price=price)
+    record["size"] = size
+    record["additionalProperty"] = [{"name": "grind", "value": grind}]
+    for key in ("gtin", "mpn", "brand", "description", "category"):
+        record.pop(key, None)
+    return record
+
+
+@pytest.fixture
+def grouped_store(records, write_feed, make_store):
+    """Sample catalog plus a ProductGroup of four sizes and grinds."""
+    base = records[6]
+    group = {
+        "@type": "ProductGroup",
+        "productGroupID": "HOUSE",
+        "name": "House Blend",
+        "variesBy": ["https://schema.org/size", "grind"],
+        "brand": base["brand"],
+        "category": base["category"],
+        "hasVariant": [
+            variant(base, "HOUSE-12-WB", "12 oz", "Whole Bean", "10.00"),
+            variant(base, "HOUSE-12-GR", "12 oz", "Ground", "10.50"),
+            variant(base, "HOUSE-2-WB", "2 lb", "Whole Bean", "24.00"),
+            variant(base, "HOUSE-2-GR", "2 lb", "Ground", "24.50"),
+        ],
+    }
+    return make_store(write_feed([*records, group]))
+
+
+def test_product_group_is_flattened_into_variants(grouped_store):
+    catalog = grouped_store.catalog
+    assert len(catalog.variants) == 1
+    group = catalog.variants.groups[0]
+    assert (group.group_id, group.name) == ("HOUSE", "House Blend")
+    assert group.varies_by == ["size", "grind"]
+    assert group.options[1] == {"size": "12 oz", "grind": "Ground"}
+    # shared fields are inherited from the group
+    product = grouped_store.get_product("HOUSE-2-GR")
+    assert product.brand.name == "RoastMaster"
+
+
+def test_search_returns_one_group_with_its_matrix(grouped_store):
+    payload = json.loads(grouped_store.search_products_json("house blend"))
+    results = payload["results"]
+    assert len(results) == 1
+    group = results[0]
+    assert group["@type"] == "ProductGroup"
+    assert group["productGroupID"] == "HOUSE"
+    assert [cell["productID"] for cell in group["variantMatrix"]] == [
+        "HOUSE-12-WB",
+        "HOUSE-12-GR",
+        "HOUSE-2-WB",
+        "HOUSE-2-GR",
+    ]
+    assert group["variantMatrix"][2]["price"] == "24.00"
+
+
+@pytest.mark.parametrize(
+    ("reference", "selection", "expected"),
+    [
+        ("HOUSE", "2 lb, Ground", "HOUSE-2-GR"),
+        ("house blend", "ground / 12 OZ", "HOUSE-12-GR"),
+        ("HOUSE", "2 lb whole bean", None),
+        ("HOUSE-12-WB", "2 lb; Whole Bean", "HOUSE-2-WB"),
+        ("HOUSE", "House Blend 2 lb Whole Bean", "HOUSE-2-WB"),
+    ],
+)
+def test_variant_selection(grouped_store, reference, selection, expected):
+    if expected is None:
+        with pytest.raises(VariantSelectionError):
+            grouped_store.resolve_product_id(reference, selection)
+    else:
+        assert grouped_store.resolve_product_id(reference, selection) == expected
+
+
+def test_group_without_variant_lists_the_options(grouped_store):
+    # a variant ID alone is a product; the group needs a selection
+    assert grouped_store.resolve_product_id("HOUSE-2-WB") == "HOUSE-2-WB"
+    with pytest.raises(VariantSelectionError, match="2 lb, Ground"):
+        grouped_store.resolve_product_id("HOUSE")
+    # values shared by several variants select none of them
+    with pytest.raises(VariantSelectionError):
+        grouped_store.resolve_product_id("HOUSE", "Ground")